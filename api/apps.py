@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.conf import settings
+
+        from api.routers import reset_read_database
+
+        request_started.connect(reset_read_database, dispatch_uid='api.reset_read_database')
+
+        if settings.SWAPI_DATASET_DIR:
+            from api.utils.datasets import follow_active_dataset
+
+            follow_active_dataset()
+            request_started.connect(follow_active_dataset, dispatch_uid='api.follow_active_dataset')
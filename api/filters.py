@@ -1,6 +1,41 @@
+from django import forms
+from django.db.models import Exists, OuterRef
 from django_filters import FilterSet, filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 
-from api.models import People, Starships, Planets, Species, Vehicles, Films
+from api.models import (
+    People, Starships, Planets, Species, Vehicles, Films,
+    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, SpeciesEyeColors,
+    SpeciesHairColors, SpeciesSkinColors, VehicleFilms, VehicleManufacturerRelations,
+    StarshipFilms, StarshipManufacturerRelations, PeopleEyeColors, PeopleHairColors, PeopleSkinColors
+)
+from api.utils.keyset import order_by
+
+
+class IdFilter(filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class IdInFilter(filters.BaseInFilter, IdFilter):
+    pass
+
+
+class NameInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+def semi_join(model, field, lookup):
+    """
+    Filter method keeping the rows that have a `model` row matching the value.
+
+    Written as EXISTS instead of a join so the junction index answers it
+    and a row matching several values is not repeated.
+    """
+    def method(queryset, name, value):
+        values = value if isinstance(value, list) else [value]
+        return queryset.filter(Exists(model.objects.filter(**{field: OuterRef('pk'), f'{lookup}__in': values})))
+    return method
 
 
 class FilterByNameMixin(FilterSet):
@@ -22,30 +57,75 @@ class FilterByTitleMixin(FilterSet):
 
 
 class PersonFilter(FilterByNameMixin):
+    film = IdFilter(method=semi_join(PeopleFilms, 'person', 'film_id'))
+    film__in = IdInFilter(method=semi_join(PeopleFilms, 'person', 'film_id'))
+    homeworld = IdFilter(field_name='homeworld_id')
+    homeworld__in = IdInFilter(field_name='homeworld_id', lookup_expr='in')
+    species = IdFilter(method=semi_join(PeopleSpecies, 'person', 'species_id'))
+    species__in = IdInFilter(method=semi_join(PeopleSpecies, 'person', 'species_id'))
+    eye_color = filters.CharFilter(method=semi_join(PeopleEyeColors, 'person', 'eye_color__color'))
+    eye_color__in = NameInFilter(method=semi_join(PeopleEyeColors, 'person', 'eye_color__color'))
+    hair_color = filters.CharFilter(method=semi_join(PeopleHairColors, 'person', 'hair_color__color'))
+    hair_color__in = NameInFilter(method=semi_join(PeopleHairColors, 'person', 'hair_color__color'))
+    skin_color = filters.CharFilter(method=semi_join(PeopleSkinColors, 'person', 'skin_color__color'))
+    skin_color__in = NameInFilter(method=semi_join(PeopleSkinColors, 'person', 'skin_color__color'))
+
     class Meta:
         model = People
         fields = ['name']
 
 
 class StarshipsFilter(FilterByNameMixin):
+    film = IdFilter(method=semi_join(StarshipFilms, 'starship', 'film_id'))
+    film__in = IdInFilter(method=semi_join(StarshipFilms, 'starship', 'film_id'))
+    starship_class = filters.CharFilter(field_name='starship_class__name')
+    starship_class__in = NameInFilter(field_name='starship_class__name', lookup_expr='in')
+    manufacturer = filters.CharFilter(method=semi_join(StarshipManufacturerRelations, 'starship', 'manufacturer__name'))
+    manufacturer__in = NameInFilter(method=semi_join(StarshipManufacturerRelations, 'starship', 'manufacturer__name'))
+
     class Meta:
         model = Starships
         fields = ['name']
 
 
 class PlanetsFilter(FilterByNameMixin):
+    film = IdFilter(method=semi_join(PlanetFilms, 'planet', 'film_id'))
+    film__in = IdInFilter(method=semi_join(PlanetFilms, 'planet', 'film_id'))
+    climate = filters.CharFilter(field_name='climate__description')
+    climate__in = NameInFilter(field_name='climate__description', lookup_expr='in')
+    terrain = filters.CharFilter(field_name='terrain__description')
+    terrain__in = NameInFilter(field_name='terrain__description', lookup_expr='in')
+
     class Meta:
         model = Planets
         fields = ['name']
 
 
 class SpeciesFilter(FilterByNameMixin):
+    film = IdFilter(method=semi_join(SpeciesFilms, 'species', 'film_id'))
+    film__in = IdInFilter(method=semi_join(SpeciesFilms, 'species', 'film_id'))
+    homeworld = IdFilter(field_name='homeworld_id')
+    homeworld__in = IdInFilter(field_name='homeworld_id', lookup_expr='in')
+    eye_color = filters.CharFilter(method=semi_join(SpeciesEyeColors, 'species', 'eye_color__color'))
+    eye_color__in = NameInFilter(method=semi_join(SpeciesEyeColors, 'species', 'eye_color__color'))
+    hair_color = filters.CharFilter(method=semi_join(SpeciesHairColors, 'species', 'hair_color__color'))
+    hair_color__in = NameInFilter(method=semi_join(SpeciesHairColors, 'species', 'hair_color__color'))
+    skin_color = filters.CharFilter(method=semi_join(SpeciesSkinColors, 'species', 'skin_color__color'))
+    skin_color__in = NameInFilter(method=semi_join(SpeciesSkinColors, 'species', 'skin_color__color'))
+
     class Meta:
         model = Species
         fields = ['name']
 
 
 class VehiclesFilter(FilterByNameMixin):
+    film = IdFilter(method=semi_join(VehicleFilms, 'vehicle', 'film_id'))
+    film__in = IdInFilter(method=semi_join(VehicleFilms, 'vehicle', 'film_id'))
+    vehicle_class = filters.CharFilter(field_name='vehicle_class__name')
+    vehicle_class__in = NameInFilter(field_name='vehicle_class__name', lookup_expr='in')
+    manufacturer = filters.CharFilter(method=semi_join(VehicleManufacturerRelations, 'vehicle', 'manufacturer__name'))
+    manufacturer__in = NameInFilter(method=semi_join(VehicleManufacturerRelations, 'vehicle', 'manufacturer__name'))
+
     class Meta:
         model = Vehicles
         fields = ['name']
@@ -55,3 +135,37 @@ class FilmsFilter(FilterByTitleMixin):
     class Meta:
         model = Films
         fields = ['title']
+
+
+class OrderingFilter(BaseFilterBackend):
+    """
+    ?ordering=-mass,name over the view's `ordering_fields` and relation counts.
+
+    The keys always end with the primary key so equal values keep a stable
+    order, which keyset pagination relies on.
+    """
+    ordering_param = 'ordering'
+
+    def get_ordering(self, request, view):
+        """[(field, descending), ...] for this request"""
+        fields = view.get_ordering_fields()
+        keys = []
+        for term in request.query_params.get(self.ordering_param, '').split(','):
+            term = term.strip()
+            if not term:
+                continue
+            name = term.lstrip('-')
+            if name not in fields:
+                raise ValidationError({
+                    self.ordering_param: f"Cannot order by '{name}'. Choices are: {', '.join(fields)}"
+                })
+            keys.append((fields[name], term.startswith('-')))
+
+        if not keys:
+            keys = [(field.lstrip('-'), field.startswith('-')) for field in view.queryset.model._meta.ordering]
+        if all(field != 'id' for field, _ in keys):
+            keys.append(('id', keys[0][1]))
+        return keys
+
+    def filter_queryset(self, request, queryset, view):
+        return queryset.order_by(*order_by(self.get_ordering(request, view)))
@@ -0,0 +1,84 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from api.utils.cache import get_local_cache
+from api.views import RESOURCE_VIEWS
+
+
+class Command(BaseCommand):
+    help = 'Measure read throughput and latency of the API endpoints with the active settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='Paths to request (defaults to the first page of every resource)',
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Requests per path')
+        parser.add_argument('--threads', type=int, default=1, help='Concurrent client threads')
+        parser.add_argument('--host', default='localhost', help='Host header sent with each request')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or [
+            reverse(f'api:{view.resource_name}') for view in RESOURCE_VIEWS
+        ]
+        self.stdout.write(
+            f"Settings: {settings.SETTINGS_MODULE}, "
+            f"{options['requests']} requests per path, {options['threads']} thread(s)"
+        )
+
+        for path in paths:
+            # Warm up connections and any per-process state first.
+            self.request(path, 1, options['host'])
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+                batches = [
+                    pool.submit(self.request, path, count, options['host'])
+                    for count in self.split(options['requests'], options['threads'])
+                ]
+                latencies = [latency for batch in batches for latency in batch.result()]
+            elapsed = time.perf_counter() - started
+
+            latencies.sort()
+            self.stdout.write(
+                f"{path:<32} {len(latencies) / elapsed:>9.1f} req/s  "
+                f"mean {statistics.mean(latencies) * 1000:7.2f} ms  "
+                f"p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms  "
+                f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.2f} ms"
+            )
+
+        local = get_local_cache()
+        if local is not None:
+            stats = local.stats()
+            self.stdout.write(
+                f"Local cache: {stats['entries']} entries, {stats['size'] / 1024:.0f} of "
+                f"{stats['max_size'] / 1024:.0f} KiB, {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%}), {stats['evictions']} evictions"
+            )
+
+    @staticmethod
+    def split(total, parts):
+        return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+    @staticmethod
+    def request(path, count, host):
+        client = Client(HTTP_HOST=host, HTTP_ACCEPT='application/json')
+        latencies = []
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path} returned {response.status_code}")
+        finally:
+            connections.close_all()
+        return latencies
@@ -0,0 +1,90 @@
+import gzip
+import time
+
+from django.core.management import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from api.utils import compression
+from api.utils.compression import brotli, zstandard
+from api.views import RESOURCE_VIEWS
+
+# Encoding -> {level: (compress, decompress)}
+CODECS = {
+    'gzip': {
+        level: (lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0), gzip.decompress)
+        for level in (1, 6, 9)
+    },
+}
+if brotli is not None:
+    CODECS['br'] = {
+        quality: (lambda body, quality=quality: brotli.compress(body, quality=quality), brotli.decompress)
+        for quality in (4, 9, 11)
+    }
+if zstandard is not None:
+    CODECS['zstd'] = {
+        level: (
+            lambda body, level=level: zstandard.ZstdCompressor(level=level).compress(body),
+            lambda body: zstandard.ZstdDecompressor().decompress(body),
+        )
+        for level in (3, 9, 19)
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare the CPU cost and the bytes saved of each response encoding on the list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per page and codec')
+        parser.add_argument('--with-counts', action='store_true', help='Render the pages with ?with_counts=1')
+
+    def handle(self, *args, **options):
+        bodies = self.render_pages(options['with_counts'])
+        total = sum(len(body) for body in bodies.values())
+        self.stdout.write(f"{len(bodies)} pages, {total / 1024:.1f} KiB of JSON")
+        self.stdout.write(f"{'codec':<10} {'KiB':>8} {'ratio':>7} {'compress':>12} {'decompress':>12}")
+
+        for encoding, levels in CODECS.items():
+            for level, (compress, decompress) in levels.items():
+                size = compress_time = decompress_time = 0
+                for body in bodies.values():
+                    compressed = compress(body)
+                    size += len(compressed)
+                    compress_time += self.measure(compress, body, options['repeat'])
+                    decompress_time += self.measure(decompress, compressed, options['repeat'])
+                self.stdout.write(
+                    f"{encoding + ' ' + str(level):<10} {size / 1024:8.1f} {total / size:6.1f}x "
+                    f"{compress_time * 1000:9.2f} ms {decompress_time * 1000:9.2f} ms"
+                )
+
+        # What a request pays: compressing on the fly vs picking a cached variant
+        cached = {resource: compression.compress(body) for resource, body in bodies.items()}
+        header = 'gzip, deflate, br, zstd'
+        on_the_fly = sum(self.measure(CODECS['gzip'][6][0], body, options['repeat']) for body in bodies.values())
+        negotiated = sum(
+            self.measure(lambda variants: compression.negotiate(header, variants), variants, options['repeat'])
+            for variants in cached.values()
+        )
+        self.stdout.write(
+            f"Per request for all pages: on the fly (gzip 6) {on_the_fly * 1000:.2f} ms, "
+            f"precompressed {negotiated * 1000:.3f} ms "
+            f"(encodings cached: {', '.join(compression.COMPRESSORS)})"
+        )
+
+    @staticmethod
+    def render_pages(with_counts):
+        """Identity JSON body of the first full page of every resource"""
+        client = Client(HTTP_ACCEPT='application/json')
+        query = {'page_size': 15, **({'with_counts': '1'} if with_counts else {})}
+        with override_settings(SWAPI_RESPONSE_CACHE=False):
+            return {
+                view.resource_name: client.get(reverse(f'api:{view.resource_name}'), query).content
+                for view in RESOURCE_VIEWS
+            }
+
+    @staticmethod
+    def measure(function, argument, repeat):
+        started = time.process_time()
+        for _ in range(repeat):
+            function(argument)
+        return (time.process_time() - started) / repeat
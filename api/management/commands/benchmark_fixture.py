@@ -0,0 +1,75 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from api.utils.fixture import FIXTURE_PATH, fixture_models, load_fixture
+
+# Path -> median milliseconds of a page rendered from the database. A few
+# times the measured latencies, to catch regressions rather than noise.
+LATENCY_BUDGETS = {
+    '/api/v1/films/': 2000,
+    '/api/v1/people/': 800,
+    '/api/v1/planets/': 400,
+    '/api/v1/species/': 400,
+    '/api/v1/vehicles/': 400,
+    '/api/v1/starships/': 400,
+    '/api/v1/people/?with_counts=1': 800,
+    '/api/v1/people/?ordering=-films_count': 600,
+    '/api/v1/stats/': 50,
+    '/api/v1/graph/neighbours/?node=people:1': 50,
+    '/api/v1/graph/path/?from=people:1&to=planets:2': 50,
+}
+
+# Seconds the fixture may take to load
+LOAD_BUDGET = 1.0
+
+
+class Command(BaseCommand):
+    help = 'Time loading the test fixture and the endpoints on it against their budgets, in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fixture', default=FIXTURE_PATH, help='Fixture file to load')
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per endpoint')
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            over = self.measure(options['fixture'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        if over:
+            raise CommandError(f"Over budget: {', '.join(over)}")
+
+    def measure(self, fixture, repeat):
+        """Print the timings; returns what exceeded its budget"""
+        over = []
+        started = time.perf_counter()
+        rows = load_fixture(fixture)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{'fixture':<50} {elapsed * 1000:8.1f} ms ({rows} rows, {len(fixture_models())} tables)")
+        if elapsed > LOAD_BUDGET:
+            over.append('fixture')
+
+        client = Client(HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+        cache.clear()
+        with override_settings(SWAPI_RESPONSE_CACHE=False, SWAPI_THROTTLE_RATE=None, SWAPI_ADMISSION_CAPACITY=None):
+            for url, budget in LATENCY_BUDGETS.items():
+                # The first request builds the per-process caches.
+                client.get(url)
+                latencies = []
+                for _ in range(repeat):
+                    request_started = time.perf_counter()
+                    response = client.get(url)
+                    latencies.append((time.perf_counter() - request_started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}")
+                median = statistics.median(latencies)
+                self.stdout.write(f"{url:<50} {median:8.1f} ms (budget {budget} ms)")
+                if median > budget:
+                    over.append(url)
+        return over
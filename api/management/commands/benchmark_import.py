@@ -0,0 +1,54 @@
+import contextlib
+import io
+import os
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection
+
+from api.models import People
+from api.utils.bulk_import import BulkImporter
+from api.utils.parser import StarWarsParser
+from api.utils.synthetic import generate_swapi_data
+
+
+class Command(BaseCommand):
+    help = 'Compare the wall-clock time of the import modes on a synthetic dataset, in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=20, help='Multiple of the real dataset size')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            nargs='+',
+            default=[1, os.cpu_count() or 1],
+            help='Worker counts to run the bulk importer with',
+        )
+        parser.add_argument('--skip-sequential', action='store_true', help='Do not run the sequential parser')
+
+    def handle(self, *args, **options):
+        data = generate_swapi_data(options['scale'])
+        self.stdout.write(
+            f"Dataset at scale {options['scale']}: "
+            + ', '.join(f"{len(items)} {resource}" for resource, items in data.items())
+        )
+
+        modes = [] if options['skip_sequential'] else [('sequential parser', StarWarsParser().parse_json_data)]
+        modes += [(f"bulk, {workers} worker(s)", BulkImporter(workers).import_data) for workers in options['workers']]
+
+        for name, run in modes:
+            elapsed, people = self.timed_import(run, data)
+            self.stdout.write(f"{name:<24} {elapsed:8.2f} s  ({people} people imported)")
+
+    @staticmethod
+    def timed_import(run, data):
+        """Import into a fresh test database and return the elapsed time"""
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run(data)
+            return time.perf_counter() - started, People.objects.count()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
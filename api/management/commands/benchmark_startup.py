@@ -0,0 +1,67 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+# Run in a fresh interpreter per settings module. Startup is loading the
+# WSGI application plus the first request, which imports the URLconf and
+# the views; then requests are timed through the full middleware stack.
+SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from core.wsgi import application
+from django.db import connections
+from django.test import Client
+client = Client(HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+path, count = sys.argv[1], int(sys.argv[2])
+if client.get(path).status_code != 200:
+    raise SystemExit(f'{path} failed')
+startup = time.perf_counter() - started
+modules = len(sys.modules)
+
+started = time.perf_counter()
+for _ in range(count):
+    client.get(path)
+request = (time.perf_counter() - started) / count
+connections.close_all()
+print(json.dumps({'startup': startup, 'modules': modules, 'request': request}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Compare the worker startup time and per-request overhead of settings modules'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'modules',
+            nargs='*',
+            default=['core.settings.production', 'core.settings.api'],
+            help='Settings modules to compare',
+        )
+        parser.add_argument('--path', default='/api/v1/films/', help='Path requested after startup')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per run')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes per settings module')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'settings':<28} {'startup':>10} {'modules':>8} {'request':>10}")
+        for module in options['modules']:
+            runs = [self.run(module, options['path'], options['requests']) for _ in range(options['runs'])]
+            self.stdout.write(
+                f"{module:<28} "
+                f"{statistics.median(run['startup'] for run in runs) * 1000:7.1f} ms "
+                f"{runs[0]['modules']:8} "
+                f"{statistics.median(run['request'] for run in runs) * 1e6:7.0f} us"
+            )
+
+    @staticmethod
+    def run(module, path, count):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=module)
+        output = subprocess.run(
+            [sys.executable, '-c', SCRIPT, path, str(count)],
+            env=env, cwd=settings.BASE_DIR.parent, capture_output=True, text=True, check=True,
+        )
+        return json.loads(output.stdout.splitlines()[-1])
@@ -0,0 +1,32 @@
+import contextlib
+import io
+
+from django.core.management import BaseCommand
+from django.db import connection
+
+from api.utils.bulk_import import BulkImporter
+from api.utils.fixture import FIXTURE_PATH, dump_fixture
+from api.utils.synthetic import generate_swapi_data
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the table fixture the tests load, from the synthetic payload, in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Multiple of the real dataset size')
+        parser.add_argument('--seed', type=int, default=1, help='Seed of the synthetic payload')
+        parser.add_argument('--output', default=FIXTURE_PATH, help='Fixture file to write')
+
+    def handle(self, *args, **options):
+        data = generate_swapi_data(options['scale'], options['seed'])
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                BulkImporter().import_data(data)
+            rows = dump_fixture(options['output'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(f"Wrote {rows} rows to {options['output']}")
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from api.utils.snapshot import build_snapshot
+from api.views import RESOURCE_VIEWS
+
+
+class Command(BaseCommand):
+    help = 'Build a read-only, memory-mappable snapshot of the API list documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=settings.SWAPI_SNAPSHOT_PATH or settings.BASE_DIR / 'swapi.snapshot',
+            help='Path of the snapshot file (defaults to SWAPI_SNAPSHOT_PATH)',
+        )
+
+    def handle(self, *args, **options):
+        resources = {
+            view.resource_name: (view.queryset.all(), view.serializer_class, view.search_field)
+            for view in RESOURCE_VIEWS
+        }
+        index = build_snapshot(options['output'], resources)
+
+        for name, meta in index['resources'].items():
+            self.stdout.write(f"{name}: {meta['count']} documents")
+        self.stdout.write(self.style.SUCCESS(f"Snapshot written to {options['output']}"))
@@ -1,13 +1,83 @@
-from django.core.management import BaseCommand
+import time
 
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
+
+from api.utils.bulk_import import BulkImporter
+from api.utils.cache import bump_data_version
+from api.utils.datasets import DatasetError, activate_dataset, staged_dataset, validate_dataset
 from api.utils.download_data import fetch_swapi_data
 from api.utils.parser import StarWarsParser
+from api.utils.replicas import sync_replicas
+from api.utils.stats import refresh_stats
+from api.utils.validation import validate_payload, write_dead_letters
 
 
 class Command(BaseCommand):
     help = 'Download and import Star Wars data'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Prepare the resources in this many processes and write them in bulk (0: sequential parser)',
+        )
+
     def handle(self, *args, **options):
-        data = fetch_swapi_data()
-        parser = StarWarsParser()
-        parser.parse_json_data(data)
\ No newline at end of file
+        data, report = validate_payload(fetch_swapi_data())
+        self.stdout.write(report.summary())
+        for resource in sorted(report.rejected.keys() | report.dangling.keys()):
+            self.stdout.write(
+                f"  {resource}: {report.rejected.get(resource, 0)} rejected, "
+                f"{report.dangling.get(resource, 0)} dangling relation(s)"
+            )
+        # Written on clean runs too, so the previous run's letters do not linger.
+        write_dead_letters(settings.SWAPI_DEAD_LETTER_PATH, report.dead_letters)
+        if report.dead_letters:
+            self.stdout.write(f"Dead letters written to {settings.SWAPI_DEAD_LETTER_PATH}")
+        if report.error_rate > settings.SWAPI_MAX_REJECTED_RATE:
+            raise CommandError(
+                f"{report.error_rate:.1%} of the records were rejected, "
+                f"more than SWAPI_MAX_REJECTED_RATE ({settings.SWAPI_MAX_REJECTED_RATE:.1%})"
+            )
+
+        started = time.perf_counter()
+        if settings.SWAPI_DATASET_DIR:
+            self.import_blue_green(data, options['workers'])
+        else:
+            self.import_data(data, options['workers'])
+        elapsed = time.perf_counter() - started
+        records = sum(len(items) for items in data.values())
+        self.stdout.write(f"Imported {records} records in {elapsed:.2f} s ({records / elapsed:,.0f} records/s)")
+
+        for alias in sync_replicas():
+            self.stdout.write(f"Synced read replica '{alias}'")
+
+        # Before the new version is announced, so warm_cache does not cache the old documents.
+        if settings.SWAPI_SNAPSHOT_PATH:
+            call_command('build_snapshot', stdout=self.stdout)
+        bump_data_version()
+        refresh_stats()
+        call_command('warm_cache', stdout=self.stdout)
+
+    @staticmethod
+    def import_data(data, workers):
+        if workers:
+            BulkImporter(workers).import_data(data)
+        else:
+            parser = StarWarsParser()
+            parser.parse_json_data(data)
+
+    def import_blue_green(self, data, workers):
+        """Import into a new dataset file and switch the API to it once validated"""
+        try:
+            with staged_dataset() as path:
+                self.import_data(data, workers)
+                validate_dataset(data)
+        except DatasetError as e:
+            raise CommandError(f"The new dataset was discarded: {e}")
+
+        started = time.perf_counter()
+        activate_dataset(path)
+        self.stdout.write(f"Activated dataset {path} in {(time.perf_counter() - started) * 1000:.1f} ms")
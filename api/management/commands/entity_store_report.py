@@ -0,0 +1,52 @@
+import time
+import tracemalloc
+
+from django.core.management import BaseCommand
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from api.utils.store import EntityStore
+from api.views import RESOURCE_VIEWS
+
+
+class Command(BaseCommand):
+    help = 'Report the memory footprint of the entity store and its per-page saving against the ORM path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Serializations per page and path')
+        parser.add_argument('--page-size', type=int, default=10, help='Entities per page')
+
+    def handle(self, *args, **options):
+        tracemalloc.start()
+        started = time.perf_counter()
+        store = EntityStore.build()
+        elapsed = time.perf_counter() - started
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        records = sum(len(records) for records in store.resources.values())
+        self.stdout.write(
+            f"Entity store: {records} records, {size / 1024:.1f} KiB per worker, built in {elapsed * 1000:.1f} ms"
+        )
+
+        for view in RESOURCE_VIEWS:
+            page = list(view.queryset.all()[:options['page_size']])
+            orm = self.measure(view, page, None, options['repeat'])
+            stored = self.measure(view, page, store, options['repeat'])
+            self.stdout.write(
+                f"{view.resource_name:<10} ORM {orm[0] * 1000:7.2f} ms, {orm[1]:4} queries   "
+                f"store {stored[0] * 1000:7.2f} ms, {stored[1]:4} queries   "
+                f"saving {(1 - stored[0] / orm[0]) * 100:5.1f}%"
+            )
+
+    @staticmethod
+    def measure(view, page, store, repeat):
+        """CPU time and query count of serializing one page"""
+        context = {'entity_store': store}
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            view.serializer_class(page, many=True, context=context).data
+        started = time.process_time()
+        for _ in range(repeat):
+            view.serializer_class(page, many=True, context=context).data
+        return (time.process_time() - started) / repeat, len(queries)
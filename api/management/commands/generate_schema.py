@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from api.swagger.schema import write_schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema once, for the docs endpoints to serve as is'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=settings.SWAPI_SCHEMA_DIR,
+            help='Directory to write swagger.json and swagger.yaml to (default: SWAPI_SCHEMA_DIR)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError('Set SWAPI_SCHEMA_DIR or pass --output')
+
+        started = time.perf_counter()
+        paths = write_schema(options['output'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Wrote {', '.join(paths)} in {elapsed * 1000:.0f} ms")
@@ -0,0 +1,80 @@
+import math
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.core.management import BaseCommand
+from django.db import connections, reset_queries
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.views import RESOURCE_VIEWS
+
+# Query shape -> parameters added to a default-size first page. Count
+# ordering sorts by the first relation count of the view.
+SHAPES = {
+    'page': lambda view: {},
+    'counts': lambda view: {'with_counts': '1'},
+    'count_ordering': lambda view: {'ordering': f'-{next(iter(view.relation_counts))}_count'},
+}
+
+# Cheap endpoints that keep the default cost of 1, shown for scale: url name -> parameters
+REFERENCE_REQUESTS = {
+    'stats': {},
+    'graph-neighbours': {'node': 'people:1'},
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure the queries and latency of each view and query shape, and the token cost they translate to'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Requests per view and shape')
+        parser.add_argument('--unit', type=float, default=10.0, help='Milliseconds of rendering one token stands for')
+        parser.add_argument('--host', default='localhost', help='Host header sent with each request')
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=options['host'], HTTP_ACCEPT='application/json')
+        self.stdout.write(f"{'request':<40} {'queries':>8} {'latency':>11} {'cost':>5}")
+
+        with override_settings(SWAPI_RESPONSE_CACHE=False, SWAPI_THROTTLE_RATE=None, SWAPI_ADMISSION_CAPACITY=None):
+            for name, params in REFERENCE_REQUESTS.items():
+                queries, latency = self.measure(client, reverse(f'api:{name}'), params, options['repeat'])
+                self.stdout.write(f"{name:<40} {queries:8} {latency * 1000:8.2f} ms {1:5}")
+
+            costs = {}
+            for view in RESOURCE_VIEWS:
+                path = reverse(f'api:{view.resource_name}')
+                costs[view.__name__] = {}
+                for shape, params in SHAPES.items():
+                    queries, latency = self.measure(client, path, params(view), options['repeat'])
+                    cost = max(1, math.ceil(latency * 1000 / options['unit']))
+                    costs[view.__name__][shape] = cost
+                    self.stdout.write(f"{view.resource_name + ' ' + shape:<40} {queries:8} {latency * 1000:8.2f} ms {cost:5}")
+
+        self.stdout.write('\nrequest_costs per view:')
+        for name, shape_costs in costs.items():
+            self.stdout.write(f"{name}.request_costs = {shape_costs}")
+
+    @staticmethod
+    def measure(client, path, params, repeat):
+        """Queries of one request and its median latency"""
+        client.get(path, params)
+        # Each request clears the query logs when it starts, so empty them now
+        # for the captures below to start at zero.
+        reset_queries()
+        with ExitStack() as stack:
+            contexts = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            response = client.get(path, params)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+        # Counted now: the next request resets the query logs.
+        queries = sum(len(context) for context in contexts)
+
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get(path, params)
+            latencies.append(time.perf_counter() - started)
+        return queries, statistics.median(latencies)
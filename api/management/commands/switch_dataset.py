@@ -0,0 +1,43 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
+
+from api.utils.cache import bump_data_version
+from api.utils.datasets import activate_dataset, get_active_dataset, list_datasets
+from api.utils.stats import refresh_stats
+
+
+class Command(BaseCommand):
+    help = 'List the blue/green dataset files, or switch the API to one of them (e.g. to roll back an import)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', nargs='?', help='File name of the dataset to activate')
+
+    def handle(self, *args, **options):
+        if not settings.SWAPI_DATASET_DIR:
+            raise CommandError('SWAPI_DATASET_DIR is not set')
+
+        datasets = {os.path.basename(path): path for path in list_datasets()}
+        if not options['dataset']:
+            active = get_active_dataset()
+            for name, path in datasets.items():
+                marker = '*' if path == active else ' '
+                self.stdout.write(f"{marker} {name}  {os.path.getsize(path) / 1024 / 1024:8.1f} MiB")
+            return
+
+        path = datasets.get(options['dataset'])
+        if path is None:
+            raise CommandError(f"No dataset named {options['dataset']} in {settings.SWAPI_DATASET_DIR}")
+
+        started = time.perf_counter()
+        activate_dataset(path)
+        self.stdout.write(f"Activated dataset {path} in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        # Before the new version is announced, so warm_cache does not cache the old documents.
+        if settings.SWAPI_SNAPSHOT_PATH:
+            call_command('build_snapshot', stdout=self.stdout)
+        bump_data_version()
+        refresh_stats()
+        call_command('warm_cache', stdout=self.stdout)
@@ -0,0 +1,61 @@
+from urllib.parse import parse_qsl, urlsplit
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from api.views import RESOURCE_VIEWS
+
+
+class Command(BaseCommand):
+    help = 'Fill the response cache with every list page of every resource'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--origin',
+            default=settings.SWAPI_PUBLIC_ORIGIN,
+            help='Scheme and host the API is served on; the pagination links are cached with it',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            default=[],
+            help='Query string to warm on top of SWAPI_WARM_QUERIES, e.g. "ordering=-mass"; repeatable',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.SWAPI_RESPONSE_CACHE:
+            self.stdout.write('SWAPI_RESPONSE_CACHE is disabled, nothing to warm')
+            return
+
+        origin = urlsplit(options['origin'])
+        client = Client(HTTP_HOST=origin.netloc, HTTP_ACCEPT='application/json')
+        secure = origin.scheme == 'https'
+        queries = list(dict.fromkeys([*settings.SWAPI_WARM_QUERIES, *options['query']]))
+
+        # The warm-up neither spends the clients' token bucket nor is shed as expensive work.
+        try:
+            with override_settings(SWAPI_THROTTLE_RATE=None, SWAPI_ADMISSION_CAPACITY=None):
+                for view in RESOURCE_VIEWS:
+                    path = reverse(f'api:{view.resource_name}')
+                    pages = 0
+                    for query in queries:
+                        pages += self.warm(client, path, dict(parse_qsl(query)), secure)
+                    self.stdout.write(f"Warmed {pages} pages of {view.resource_name}")
+        finally:
+            connections.close_all()
+
+    def warm(self, client, path, query, secure):
+        """Request the pages of `path` with `query` up to the last one; returns their number"""
+        pages = 0
+        while query is not None:
+            response = client.get(path, query, secure=secure)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} {query} returned {response.status_code}")
+            pages += 1
+            # The filters decide the number of pages, so follow the links instead of counting rows.
+            next_link = response.json()['next']
+            query = dict(parse_qsl(urlsplit(next_link).query)) if next_link else None
+        return pages
@@ -0,0 +1,302 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='peopleeyecolors',
+            options={'verbose_name': 'People Eye Color', 'verbose_name_plural': 'People Eye Colors'},
+        ),
+        migrations.AlterModelOptions(
+            name='peoplefilms',
+            options={'verbose_name': 'People Film', 'verbose_name_plural': 'People Films'},
+        ),
+        migrations.AlterModelOptions(
+            name='peoplehaircolors',
+            options={'verbose_name': 'People Hair Color', 'verbose_name_plural': 'People Hair Colors'},
+        ),
+        migrations.AlterModelOptions(
+            name='peopleskincolors',
+            options={'verbose_name': 'People Skin Color', 'verbose_name_plural': 'People Skin Colors'},
+        ),
+        migrations.AlterModelOptions(
+            name='peoplespecies',
+            options={'verbose_name': 'People Species', 'verbose_name_plural': 'People Species'},
+        ),
+        migrations.AlterModelOptions(
+            name='planetfilms',
+            options={'verbose_name': 'Planet Film', 'verbose_name_plural': 'Planet Films'},
+        ),
+        migrations.AlterModelOptions(
+            name='specieseyecolors',
+            options={'verbose_name': 'Species Eye Color', 'verbose_name_plural': 'Species Eye Colors'},
+        ),
+        migrations.AlterModelOptions(
+            name='speciesfilms',
+            options={'verbose_name': 'Species Film', 'verbose_name_plural': 'Species Films'},
+        ),
+        migrations.AlterModelOptions(
+            name='specieshaircolors',
+            options={'verbose_name': 'Species Hair Color', 'verbose_name_plural': 'Species Hair Colors'},
+        ),
+        migrations.AlterModelOptions(
+            name='speciesskincolors',
+            options={'verbose_name': 'Species Skin Color', 'verbose_name_plural': 'Species Skin Colors'},
+        ),
+        migrations.AlterModelOptions(
+            name='starshipfilms',
+            options={'verbose_name': 'Starship Film', 'verbose_name_plural': 'Starship Films'},
+        ),
+        migrations.AlterModelOptions(
+            name='starshipmanufacturerrelations',
+            options={'verbose_name': 'Starship Manufacturer', 'verbose_name_plural': 'Starship Manufacturers'},
+        ),
+        migrations.AlterModelOptions(
+            name='starshippilots',
+            options={'verbose_name': 'Starship Pilot', 'verbose_name_plural': 'Starship Pilots'},
+        ),
+        migrations.AlterModelOptions(
+            name='vehiclefilms',
+            options={'verbose_name': 'Vehicle Film', 'verbose_name_plural': 'Vehicle Films'},
+        ),
+        migrations.AlterModelOptions(
+            name='vehiclemanufacturerrelations',
+            options={'verbose_name': 'Vehicle Manufacturer', 'verbose_name_plural': 'Vehicle Manufacturers'},
+        ),
+        migrations.AlterModelOptions(
+            name='vehiclepilots',
+            options={'verbose_name': 'Vehicle Pilot', 'verbose_name_plural': 'Vehicle Pilots'},
+        ),
+        migrations.AlterField(
+            model_name='peopleeyecolors',
+            name='eye_color',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='eye_color_people', to='api.eyecolors'),
+        ),
+        migrations.AlterField(
+            model_name='peopleeyecolors',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='people_eye_colors', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='peoplefilms',
+            name='film',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='film_people', to='api.films'),
+        ),
+        migrations.AlterField(
+            model_name='peoplefilms',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='people_films', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='peoplehaircolors',
+            name='hair_color',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='hair_color_people', to='api.haircolors'),
+        ),
+        migrations.AlterField(
+            model_name='peoplehaircolors',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='people_hair_colors', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='peopleskincolors',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='people_skin_colors', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='peopleskincolors',
+            name='skin_color',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='skin_color_people', to='api.skincolors'),
+        ),
+        migrations.AlterField(
+            model_name='peoplespecies',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='people_species', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='peoplespecies',
+            name='species',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='species_people', to='api.species'),
+        ),
+        migrations.AlterField(
+            model_name='planetfilms',
+            name='film',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='film_planets', to='api.films'),
+        ),
+        migrations.AlterField(
+            model_name='planetfilms',
+            name='planet',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='planet_films', to='api.planets'),
+        ),
+        migrations.AlterField(
+            model_name='specieseyecolors',
+            name='eye_color',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='eye_color_species', to='api.eyecolors'),
+        ),
+        migrations.AlterField(
+            model_name='specieseyecolors',
+            name='species',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='species_eye_colors', to='api.species'),
+        ),
+        migrations.AlterField(
+            model_name='speciesfilms',
+            name='film',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='film_species', to='api.films'),
+        ),
+        migrations.AlterField(
+            model_name='speciesfilms',
+            name='species',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='species_films', to='api.species'),
+        ),
+        migrations.AlterField(
+            model_name='specieshaircolors',
+            name='hair_color',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='hair_color_species', to='api.haircolors'),
+        ),
+        migrations.AlterField(
+            model_name='specieshaircolors',
+            name='species',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='species_hair_colors', to='api.species'),
+        ),
+        migrations.AlterField(
+            model_name='speciesskincolors',
+            name='skin_color',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='skin_color_species', to='api.skincolors'),
+        ),
+        migrations.AlterField(
+            model_name='speciesskincolors',
+            name='species',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='species_skin_colors', to='api.species'),
+        ),
+        migrations.AlterField(
+            model_name='starshipfilms',
+            name='film',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='film_starships', to='api.films'),
+        ),
+        migrations.AlterField(
+            model_name='starshipfilms',
+            name='starship',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='starship_films', to='api.starships'),
+        ),
+        migrations.AlterField(
+            model_name='starshipmanufacturerrelations',
+            name='manufacturer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='manufacturer_starships', to='api.starshipmanufacturers'),
+        ),
+        migrations.AlterField(
+            model_name='starshipmanufacturerrelations',
+            name='starship',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='starship_manufacturers', to='api.starships'),
+        ),
+        migrations.AlterField(
+            model_name='starshippilots',
+            name='pilot',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='piloted_starships', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='starshippilots',
+            name='starship',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='starship_pilots', to='api.starships'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclefilms',
+            name='film',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='film_vehicles', to='api.films'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclefilms',
+            name='vehicle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='vehicle_films', to='api.vehicles'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclemanufacturerrelations',
+            name='manufacturer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='manufacturer_vehicles', to='api.vehiclemanufacturers'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclemanufacturerrelations',
+            name='vehicle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='vehicle_manufacturers', to='api.vehicles'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclepilots',
+            name='pilot',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='piloted_vehicles', to='api.people'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclepilots',
+            name='vehicle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='vehicle_pilots', to='api.vehicles'),
+        ),
+        migrations.AddIndex(
+            model_name='peopleeyecolors',
+            index=models.Index(fields=['eye_color', 'person'], name='people_eye_colors_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peoplefilms',
+            index=models.Index(fields=['film', 'person'], name='people_films_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peoplehaircolors',
+            index=models.Index(fields=['hair_color', 'person'], name='people_hair_colors_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peopleskincolors',
+            index=models.Index(fields=['skin_color', 'person'], name='people_skin_colors_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peoplespecies',
+            index=models.Index(fields=['species', 'person'], name='people_species_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planetfilms',
+            index=models.Index(fields=['film', 'planet'], name='planet_films_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='specieseyecolors',
+            index=models.Index(fields=['eye_color', 'species'], name='species_eye_colors_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speciesfilms',
+            index=models.Index(fields=['film', 'species'], name='species_films_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='specieshaircolors',
+            index=models.Index(fields=['hair_color', 'species'], name='species_hair_colors_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speciesskincolors',
+            index=models.Index(fields=['skin_color', 'species'], name='species_skin_colors_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starshipfilms',
+            index=models.Index(fields=['film', 'starship'], name='starship_films_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starshipmanufacturerrelations',
+            index=models.Index(fields=['manufacturer', 'starship'], name='starship_manufacturers_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starshippilots',
+            index=models.Index(fields=['pilot', 'starship'], name='starship_pilots_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiclefilms',
+            index=models.Index(fields=['film', 'vehicle'], name='vehicle_films_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiclemanufacturerrelations',
+            index=models.Index(fields=['manufacturer', 'vehicle'], name='vehicle_manufacturers_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiclepilots',
+            index=models.Index(fields=['pilot', 'vehicle'], name='vehicle_pilots_rev_idx'),
+        ),
+    ]
@@ -0,0 +1,267 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:47
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of the parsers and fields of api.utils.normalize as of this
+# migration, so later changes to those do not change what it backfills.
+
+NUMBER = re.compile(r'^([-+]?\d+(?:\.\d+)?)\s*[a-z]*$')
+RANGE = re.compile(r'^(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)$')
+BIRTH_YEAR = re.compile(r'^(\d+(?:\.\d+)?)\s*(bby|aby)$')
+
+
+def _clean(value):
+    return value.strip().lower().replace(',', '') if isinstance(value, str) else ''
+
+
+def _integral(number):
+    return int(number) if number is not None and float(number).is_integer() else None
+
+
+def parse_float(value):
+    match = NUMBER.match(_clean(value))
+    return float(match.group(1)) if match else None
+
+
+def parse_int(value):
+    match = NUMBER.match(_clean(value))
+    if not match:
+        return None
+    number = match.group(1)
+    return int(number) if number.lstrip('+-').isdigit() else _integral(float(number))
+
+
+def parse_range(value):
+    value = _clean(value)
+    match = RANGE.match(value)
+    if match:
+        return _integral(float(match.group(1))), _integral(float(match.group(2)))
+    number = parse_int(value)
+    return None if number is None else (number, number)
+
+
+def parse_range_min(value):
+    bounds = parse_range(value)
+    return bounds[0] if bounds else None
+
+
+def parse_range_max(value):
+    bounds = parse_range(value)
+    return bounds[1] if bounds else None
+
+
+def parse_birth_year(value):
+    match = BIRTH_YEAR.match(_clean(value))
+    if not match:
+        return None
+    years = float(match.group(1))
+    return years if match.group(2) == 'bby' else -years
+
+
+PARSERS = {
+    'float': parse_float,
+    'int': parse_int,
+    'range_min': parse_range_min,
+    'range_max': parse_range_max,
+    'birth_year': parse_birth_year,
+}
+
+# Model -> {typed field: (source field, kind)}
+TYPED_FIELDS = {
+    'Planets': {
+        'rotation_period_num': ('rotation_period', 'float'),
+        'orbital_period_num': ('orbital_period', 'float'),
+        'diameter_num': ('diameter', 'float'),
+        'surface_water_num': ('surface_water', 'float'),
+        'population_num': ('population', 'int'),
+    },
+    'Species': {
+        'average_height_num': ('average_height', 'float'),
+        'average_lifespan_num': ('average_lifespan', 'float'),
+    },
+    'People': {
+        'height_num': ('height', 'float'),
+        'mass_num': ('mass', 'float'),
+        'birth_year_num': ('birth_year', 'birth_year'),
+    },
+    'Vehicles': {
+        'cost_in_credits_num': ('cost_in_credits', 'int'),
+        'length_num': ('length', 'float'),
+        'crew_min': ('crew', 'range_min'),
+        'crew_max': ('crew', 'range_max'),
+        'passengers_num': ('passengers', 'int'),
+        'max_atmosphering_speed_num': ('max_atmosphering_speed', 'float'),
+        'cargo_capacity_num': ('cargo_capacity', 'int'),
+    },
+    'Starships': {
+        'cost_in_credits_num': ('cost_in_credits', 'int'),
+        'length_num': ('length', 'float'),
+        'crew_min': ('crew', 'range_min'),
+        'crew_max': ('crew', 'range_max'),
+        'passengers_num': ('passengers', 'int'),
+        'max_atmosphering_speed_num': ('max_atmosphering_speed', 'float'),
+        'cargo_capacity_num': ('cargo_capacity', 'int'),
+        'hyperdrive_rating_num': ('hyperdrive_rating', 'float'),
+        'MGLT_num': ('MGLT', 'float'),
+    },
+}
+
+
+def backfill_typed_fields(apps, schema_editor):
+    """Parse the typed columns of the rows imported before they existed"""
+    alias = schema_editor.connection.alias
+    for model_name, fields in TYPED_FIELDS.items():
+        model = apps.get_model('api', model_name)
+        sources = sorted({source for source, _ in fields.values()})
+        objects = list(model.objects.using(alias).only('pk', *sources))
+        for field, (source, kind) in fields.items():
+            # The columns repeat a handful of values: parse each once.
+            parsed = {}
+            for obj in objects:
+                value = getattr(obj, source)
+                if value not in parsed:
+                    parsed[value] = PARSERS[kind](value)
+                setattr(obj, field, parsed[value])
+        model.objects.using(alias).bulk_update(objects, list(fields), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_junction_reverse_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='people',
+            name='birth_year_num',
+            field=models.FloatField(blank=True, db_comment='Birth year in years before the Battle of Yavin (ABY years are negative). Null when unknown.', help_text='Birth year in years before the Battle of Yavin (ABY years are negative). Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='people',
+            name='height_num',
+            field=models.FloatField(blank=True, db_comment='Height in centimeters, parsed from height. Null when unknown.', help_text='Height in centimeters, parsed from height. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='people',
+            name='mass_num',
+            field=models.FloatField(blank=True, db_comment='Mass in kilograms, parsed from mass. Null when unknown.', help_text='Mass in kilograms, parsed from mass. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='planets',
+            name='diameter_num',
+            field=models.FloatField(blank=True, db_comment='Diameter in kilometers, parsed from diameter. Null when unknown.', help_text='Diameter in kilometers, parsed from diameter. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='planets',
+            name='orbital_period_num',
+            field=models.FloatField(blank=True, db_comment='Orbital period in standard days, parsed from orbital_period. Null when unknown.', help_text='Orbital period in standard days, parsed from orbital_period. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='planets',
+            name='population_num',
+            field=models.BigIntegerField(blank=True, db_comment='Population, parsed from population. Null when unknown.', help_text='Population, parsed from population. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='planets',
+            name='rotation_period_num',
+            field=models.FloatField(blank=True, db_comment='Rotation period in standard hours, parsed from rotation_period. Null when unknown.', help_text='Rotation period in standard hours, parsed from rotation_period. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='planets',
+            name='surface_water_num',
+            field=models.FloatField(blank=True, db_comment='Surface water percentage, parsed from surface_water. Null when unknown.', help_text='Surface water percentage, parsed from surface_water. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='species',
+            name='average_height_num',
+            field=models.FloatField(blank=True, db_comment='Average height in centimeters, parsed from average_height. Null when unknown.', help_text='Average height in centimeters, parsed from average_height. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='species',
+            name='average_lifespan_num',
+            field=models.FloatField(blank=True, db_comment='Average lifespan in years, parsed from average_lifespan. Null when unknown or indefinite.', help_text='Average lifespan in years, parsed from average_lifespan. Null when unknown or indefinite.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='MGLT_num',
+            field=models.FloatField(blank=True, db_comment='Megalights per standard hour, parsed from MGLT. Null when unknown.', help_text='Megalights per standard hour, parsed from MGLT. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='cargo_capacity_num',
+            field=models.BigIntegerField(blank=True, db_comment='Cargo capacity in kilograms, parsed from cargo_capacity. Null when unknown.', help_text='Cargo capacity in kilograms, parsed from cargo_capacity. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='cost_in_credits_num',
+            field=models.BigIntegerField(blank=True, db_comment='Cost in galactic credits, parsed from cost_in_credits. Null when unknown.', help_text='Cost in galactic credits, parsed from cost_in_credits. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='crew_max',
+            field=models.IntegerField(blank=True, db_comment='Largest crew, parsed from crew. Null when unknown.', help_text='Largest crew, parsed from crew. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='crew_min',
+            field=models.IntegerField(blank=True, db_comment='Smallest crew, parsed from crew (a range such as 30-165 or a single number). Null when unknown.', help_text='Smallest crew, parsed from crew (a range such as 30-165 or a single number). Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='hyperdrive_rating_num',
+            field=models.FloatField(blank=True, db_comment='Hyperdrive class, parsed from hyperdrive_rating. Null when unknown.', help_text='Hyperdrive class, parsed from hyperdrive_rating. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='length_num',
+            field=models.FloatField(blank=True, db_comment='Length in meters, parsed from length. Null when unknown.', help_text='Length in meters, parsed from length. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='max_atmosphering_speed_num',
+            field=models.FloatField(blank=True, db_comment='Maximum atmospheric speed, parsed from max_atmosphering_speed. Null when unknown.', help_text='Maximum atmospheric speed, parsed from max_atmosphering_speed. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='starships',
+            name='passengers_num',
+            field=models.BigIntegerField(blank=True, db_comment='Passengers, parsed from passengers. Null when unknown.', help_text='Passengers, parsed from passengers. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='cargo_capacity_num',
+            field=models.BigIntegerField(blank=True, db_comment='Cargo capacity in kilograms, parsed from cargo_capacity. Null when unknown.', help_text='Cargo capacity in kilograms, parsed from cargo_capacity. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='cost_in_credits_num',
+            field=models.BigIntegerField(blank=True, db_comment='Cost in galactic credits, parsed from cost_in_credits. Null when unknown.', help_text='Cost in galactic credits, parsed from cost_in_credits. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='crew_max',
+            field=models.IntegerField(blank=True, db_comment='Largest crew, parsed from crew. Null when unknown.', help_text='Largest crew, parsed from crew. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='crew_min',
+            field=models.IntegerField(blank=True, db_comment='Smallest crew, parsed from crew (a range such as 30-165 or a single number). Null when unknown.', help_text='Smallest crew, parsed from crew (a range such as 30-165 or a single number). Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='length_num',
+            field=models.FloatField(blank=True, db_comment='Length in meters, parsed from length. Null when unknown.', help_text='Length in meters, parsed from length. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='max_atmosphering_speed_num',
+            field=models.FloatField(blank=True, db_comment='Maximum atmospheric speed, parsed from max_atmosphering_speed. Null when unknown.', help_text='Maximum atmospheric speed, parsed from max_atmosphering_speed. Null when unknown.', null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicles',
+            name='passengers_num',
+            field=models.BigIntegerField(blank=True, db_comment='Passengers, parsed from passengers. Null when unknown.', help_text='Passengers, parsed from passengers. Null when unknown.', null=True),
+        ),
+        migrations.RunPython(backfill_typed_fields, migrations.RunPython.noop),
+    ]
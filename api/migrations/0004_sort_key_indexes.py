@@ -0,0 +1,141 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_typed_numeric_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='films',
+            index=models.Index(fields=['title', 'id'], name='films_title_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='films',
+            index=models.Index(fields=['episode_id', 'id'], name='films_episode_id_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='films',
+            index=models.Index(fields=['release_date', 'id'], name='films_release_date_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(fields=['name', 'id'], name='people_name_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(fields=['height_num', 'id'], name='people_height_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(fields=['mass_num', 'id'], name='people_mass_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(fields=['birth_year_num', 'id'], name='people_birth_year_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planets',
+            index=models.Index(fields=['name', 'id'], name='planets_name_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planets',
+            index=models.Index(fields=['rotation_period_num', 'id'], name='planets_rotation_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planets',
+            index=models.Index(fields=['orbital_period_num', 'id'], name='planets_orbit_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planets',
+            index=models.Index(fields=['diameter_num', 'id'], name='planets_diameter_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planets',
+            index=models.Index(fields=['surface_water_num', 'id'], name='planets_water_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planets',
+            index=models.Index(fields=['population_num', 'id'], name='planets_population_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='species',
+            index=models.Index(fields=['name', 'id'], name='species_name_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='species',
+            index=models.Index(fields=['average_height_num', 'id'], name='species_height_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='species',
+            index=models.Index(fields=['average_lifespan_num', 'id'], name='species_lifespan_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['name', 'id'], name='starships_name_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['cost_in_credits_num', 'id'], name='starships_cost_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['length_num', 'id'], name='starships_length_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['crew_max', 'id'], name='starships_crew_max_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['passengers_num', 'id'], name='starships_passengers_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['max_atmosphering_speed_num', 'id'], name='starships_speed_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['cargo_capacity_num', 'id'], name='starships_cargo_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['hyperdrive_rating_num', 'id'], name='starships_hyperdrive_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='starships',
+            index=models.Index(fields=['MGLT_num', 'id'], name='starships_mglt_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['name', 'id'], name='vehicles_name_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['cost_in_credits_num', 'id'], name='vehicles_cost_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['length_num', 'id'], name='vehicles_length_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['crew_max', 'id'], name='vehicles_crew_max_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['passengers_num', 'id'], name='vehicles_passengers_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['max_atmosphering_speed_num', 'id'], name='vehicles_speed_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicles',
+            index=models.Index(fields=['cargo_capacity_num', 'id'], name='vehicles_cargo_sort_idx'),
+        ),
+    ]
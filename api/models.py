@@ -205,6 +205,12 @@ class Films(BaseModel):
         verbose_name = "Film"
         verbose_name_plural = "Films"
         ordering = ['episode_id', 'title']
+        # Sort keys of ?ordering=, with the primary key as tie-breaker for keyset pages
+        indexes = [
+            models.Index(fields=['title', 'id'], name='films_title_sort_idx'),
+            models.Index(fields=['episode_id', 'id'], name='films_episode_id_sort_idx'),
+            models.Index(fields=['release_date', 'id'], name='films_release_date_sort_idx'),
+        ]
         db_table = 'api_films'
 
     def __str__(self):
@@ -281,10 +287,50 @@ class Planets(NamedModel):
         **help_text("The terrain of this planet")
     )
 
+    # Typed values for filtering and sorting, filled on import
+    rotation_period_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Rotation period in standard hours, parsed from rotation_period. Null when unknown.")
+    )
+
+    orbital_period_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Orbital period in standard days, parsed from orbital_period. Null when unknown.")
+    )
+
+    diameter_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Diameter in kilometers, parsed from diameter. Null when unknown.")
+    )
+
+    surface_water_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Surface water percentage, parsed from surface_water. Null when unknown.")
+    )
+
+    population_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Population, parsed from population. Null when unknown.")
+    )
+
     class Meta:
         verbose_name = "Planet"
         verbose_name_plural = "Planets"
         ordering = ['name']
+        # Sort keys of ?ordering=, with the primary key as tie-breaker for keyset pages
+        indexes = [
+            models.Index(fields=['name', 'id'], name='planets_name_sort_idx'),
+            models.Index(fields=['rotation_period_num', 'id'], name='planets_rotation_sort_idx'),
+            models.Index(fields=['orbital_period_num', 'id'], name='planets_orbit_sort_idx'),
+            models.Index(fields=['diameter_num', 'id'], name='planets_diameter_sort_idx'),
+            models.Index(fields=['surface_water_num', 'id'], name='planets_water_sort_idx'),
+            models.Index(fields=['population_num', 'id'], name='planets_population_sort_idx'),
+        ]
         db_table = 'api_planets'
 
     @property
@@ -335,10 +381,29 @@ class Species(NamedModel):
         **help_text("The planet that this species originates from.")
     )
 
+    # Typed values for filtering and sorting, filled on import
+    average_height_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Average height in centimeters, parsed from average_height. Null when unknown.")
+    )
+
+    average_lifespan_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Average lifespan in years, parsed from average_lifespan. Null when unknown or indefinite.")
+    )
+
     class Meta:
         verbose_name = "Species"
         verbose_name_plural = "Species"
         ordering = ['name']
+        # Sort keys of ?ordering=, with the primary key as tie-breaker for keyset pages
+        indexes = [
+            models.Index(fields=['name', 'id'], name='species_name_sort_idx'),
+            models.Index(fields=['average_height_num', 'id'], name='species_height_sort_idx'),
+            models.Index(fields=['average_lifespan_num', 'id'], name='species_lifespan_sort_idx'),
+        ]
         db_table = 'api_species'
 
     @property
@@ -384,10 +449,36 @@ class People(NamedModel):
         **help_text("The planet that this person was born on or inhabits.")
     )
 
+    # Typed values for filtering and sorting, filled on import
+    height_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Height in centimeters, parsed from height. Null when unknown.")
+    )
+
+    mass_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Mass in kilograms, parsed from mass. Null when unknown.")
+    )
+
+    birth_year_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Birth year in years before the Battle of Yavin (ABY years are negative). Null when unknown.")
+    )
+
     class Meta:
         verbose_name = "Person"
         verbose_name_plural = "People"
         ordering = ['name']
+        # Sort keys of ?ordering=, with the primary key as tie-breaker for keyset pages
+        indexes = [
+            models.Index(fields=['name', 'id'], name='people_name_sort_idx'),
+            models.Index(fields=['height_num', 'id'], name='people_height_sort_idx'),
+            models.Index(fields=['mass_num', 'id'], name='people_mass_sort_idx'),
+            models.Index(fields=['birth_year_num', 'id'], name='people_birth_year_sort_idx'),
+        ]
         db_table = 'api_people'
 
     @property
@@ -463,10 +554,77 @@ class Starships(NamedModel):
             "The maximum length of time that this starship can provide consumables for its entire crew without having to resupply.")
     )
 
+    # Typed values for filtering and sorting, filled on import
+    cost_in_credits_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Cost in galactic credits, parsed from cost_in_credits. Null when unknown.")
+    )
+
+    length_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Length in meters, parsed from length. Null when unknown.")
+    )
+
+    crew_min = models.IntegerField(
+        null=True,
+        blank=True,
+        **help_text("Smallest crew, parsed from crew (a range such as 30-165 or a single number). Null when unknown.")
+    )
+
+    crew_max = models.IntegerField(
+        null=True,
+        blank=True,
+        **help_text("Largest crew, parsed from crew. Null when unknown.")
+    )
+
+    passengers_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Passengers, parsed from passengers. Null when unknown.")
+    )
+
+    max_atmosphering_speed_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Maximum atmospheric speed, parsed from max_atmosphering_speed. Null when unknown.")
+    )
+
+    cargo_capacity_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Cargo capacity in kilograms, parsed from cargo_capacity. Null when unknown.")
+    )
+
+    hyperdrive_rating_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Hyperdrive class, parsed from hyperdrive_rating. Null when unknown.")
+    )
+
+    MGLT_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Megalights per standard hour, parsed from MGLT. Null when unknown.")
+    )
+
     class Meta:
         verbose_name = "Starship"
         verbose_name_plural = "Starships"
         ordering = ['name']
+        # Sort keys of ?ordering=, with the primary key as tie-breaker for keyset pages
+        indexes = [
+            models.Index(fields=['name', 'id'], name='starships_name_sort_idx'),
+            models.Index(fields=['cost_in_credits_num', 'id'], name='starships_cost_sort_idx'),
+            models.Index(fields=['length_num', 'id'], name='starships_length_sort_idx'),
+            models.Index(fields=['crew_max', 'id'], name='starships_crew_max_sort_idx'),
+            models.Index(fields=['passengers_num', 'id'], name='starships_passengers_sort_idx'),
+            models.Index(fields=['max_atmosphering_speed_num', 'id'], name='starships_speed_sort_idx'),
+            models.Index(fields=['cargo_capacity_num', 'id'], name='starships_cargo_sort_idx'),
+            models.Index(fields=['hyperdrive_rating_num', 'id'], name='starships_hyperdrive_sort_idx'),
+            models.Index(fields=['MGLT_num', 'id'], name='starships_mglt_sort_idx'),
+        ]
         db_table = 'api_starships'
 
     @property
@@ -531,10 +689,63 @@ class Vehicles(NamedModel):
             "The maximum length of time that this vehicle can provide consumables for its entire crew without having to resupply.")
     )
 
+    # Typed values for filtering and sorting, filled on import
+    cost_in_credits_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Cost in galactic credits, parsed from cost_in_credits. Null when unknown.")
+    )
+
+    length_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Length in meters, parsed from length. Null when unknown.")
+    )
+
+    crew_min = models.IntegerField(
+        null=True,
+        blank=True,
+        **help_text("Smallest crew, parsed from crew (a range such as 30-165 or a single number). Null when unknown.")
+    )
+
+    crew_max = models.IntegerField(
+        null=True,
+        blank=True,
+        **help_text("Largest crew, parsed from crew. Null when unknown.")
+    )
+
+    passengers_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Passengers, parsed from passengers. Null when unknown.")
+    )
+
+    max_atmosphering_speed_num = models.FloatField(
+        null=True,
+        blank=True,
+        **help_text("Maximum atmospheric speed, parsed from max_atmosphering_speed. Null when unknown.")
+    )
+
+    cargo_capacity_num = models.BigIntegerField(
+        null=True,
+        blank=True,
+        **help_text("Cargo capacity in kilograms, parsed from cargo_capacity. Null when unknown.")
+    )
+
     class Meta:
         verbose_name = "Vehicle"
         verbose_name_plural = "Vehicles"
         ordering = ['name']
+        # Sort keys of ?ordering=, with the primary key as tie-breaker for keyset pages
+        indexes = [
+            models.Index(fields=['name', 'id'], name='vehicles_name_sort_idx'),
+            models.Index(fields=['cost_in_credits_num', 'id'], name='vehicles_cost_sort_idx'),
+            models.Index(fields=['length_num', 'id'], name='vehicles_length_sort_idx'),
+            models.Index(fields=['crew_max', 'id'], name='vehicles_crew_max_sort_idx'),
+            models.Index(fields=['passengers_num', 'id'], name='vehicles_passengers_sort_idx'),
+            models.Index(fields=['max_atmosphering_speed_num', 'id'], name='vehicles_speed_sort_idx'),
+            models.Index(fields=['cargo_capacity_num', 'id'], name='vehicles_cargo_sort_idx'),
+        ]
         db_table = 'api_vehicles'
 
     @property
@@ -549,19 +760,23 @@ class StarshipManufacturerRelations(BaseModel):
     starship = models.ForeignKey(
         Starships,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="starship_manufacturers"
     )
     manufacturer = models.ForeignKey(
         StarshipManufacturers,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="manufacturer_starships"
     )
 
     class Meta:
         unique_together = ('starship', 'manufacturer')
+        indexes = [
+            models.Index(fields=['manufacturer', 'starship'], name='starship_manufacturers_rev_idx'),
+        ]
         verbose_name = "Starship Manufacturer"
         verbose_name_plural = "Starship Manufacturers"
-        ordering = ['starship__name', 'manufacturer__name']
         db_table = 'relation_starship_manufacturers'
 
 
@@ -569,19 +784,23 @@ class StarshipFilms(BaseModel):
     starship = models.ForeignKey(
         Starships,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="starship_films"
     )
     film = models.ForeignKey(
         Films,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="film_starships"
     )
 
     class Meta:
         unique_together = ('starship', 'film')
+        indexes = [
+            models.Index(fields=['film', 'starship'], name='starship_films_rev_idx'),
+        ]
         verbose_name = "Starship Film"
         verbose_name_plural = "Starship Films"
-        ordering = ['film__episode_id', 'starship__name']
         db_table = 'relation_starship_films'
 
 
@@ -589,19 +808,23 @@ class StarshipPilots(BaseModel):
     starship = models.ForeignKey(
         Starships,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="starship_pilots"
     )
     pilot = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="piloted_starships"
     )
 
     class Meta:
         unique_together = ('starship', 'pilot')
+        indexes = [
+            models.Index(fields=['pilot', 'starship'], name='starship_pilots_rev_idx'),
+        ]
         verbose_name = "Starship Pilot"
         verbose_name_plural = "Starship Pilots"
-        ordering = ['starship__name', 'pilot__name']
         db_table = 'relation_starship_pilots'
 
 
@@ -609,19 +832,23 @@ class VehicleManufacturerRelations(BaseModel):
     vehicle = models.ForeignKey(
         Vehicles,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="vehicle_manufacturers"
     )
     manufacturer = models.ForeignKey(
         VehicleManufacturers,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="manufacturer_vehicles"
     )
 
     class Meta:
         unique_together = ('vehicle', 'manufacturer')
+        indexes = [
+            models.Index(fields=['manufacturer', 'vehicle'], name='vehicle_manufacturers_rev_idx'),
+        ]
         verbose_name = "Vehicle Manufacturer"
         verbose_name_plural = "Vehicle Manufacturers"
-        ordering = ['vehicle__name', 'manufacturer__name']
         db_table = 'relation_vehicle_manufacturers'
 
 
@@ -629,19 +856,23 @@ class VehicleFilms(BaseModel):
     vehicle = models.ForeignKey(
         Vehicles,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="vehicle_films"
     )
     film = models.ForeignKey(
         Films,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="film_vehicles"
     )
 
     class Meta:
         unique_together = ('vehicle', 'film')
+        indexes = [
+            models.Index(fields=['film', 'vehicle'], name='vehicle_films_rev_idx'),
+        ]
         verbose_name = "Vehicle Film"
         verbose_name_plural = "Vehicle Films"
-        ordering = ['film__episode_id', 'vehicle__name']
         db_table = 'relation_vehicle_films'
 
 
@@ -649,19 +880,23 @@ class VehiclePilots(BaseModel):
     vehicle = models.ForeignKey(
         Vehicles,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="vehicle_pilots"
     )
     pilot = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="piloted_vehicles"
     )
 
     class Meta:
         unique_together = ('vehicle', 'pilot')
+        indexes = [
+            models.Index(fields=['pilot', 'vehicle'], name='vehicle_pilots_rev_idx'),
+        ]
         verbose_name = "Vehicle Pilot"
         verbose_name_plural = "Vehicle Pilots"
-        ordering = ['vehicle__name', 'pilot__name']
         db_table = 'relation_vehicle_pilots'
 
 
@@ -669,19 +904,23 @@ class PlanetFilms(BaseModel):
     planet = models.ForeignKey(
         Planets,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="planet_films"
     )
     film = models.ForeignKey(
         Films,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="film_planets"
     )
 
     class Meta:
         unique_together = ('planet', 'film')
+        indexes = [
+            models.Index(fields=['film', 'planet'], name='planet_films_rev_idx'),
+        ]
         verbose_name = "Planet Film"
         verbose_name_plural = "Planet Films"
-        ordering = ['film__episode_id', 'planet__name']
         db_table = 'relation_planet_films'
 
 
@@ -689,19 +928,23 @@ class SpeciesEyeColors(BaseModel):
     species = models.ForeignKey(
         Species,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="species_eye_colors"
     )
     eye_color = models.ForeignKey(
         EyeColors,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="eye_color_species"
     )
 
     class Meta:
         unique_together = ('species', 'eye_color')
+        indexes = [
+            models.Index(fields=['eye_color', 'species'], name='species_eye_colors_rev_idx'),
+        ]
         verbose_name = "Species Eye Color"
         verbose_name_plural = "Species Eye Colors"
-        ordering = ['species__name', 'eye_color__color']
         db_table = 'relation_species_eye_colors'
 
 
@@ -709,19 +952,23 @@ class SpeciesHairColors(BaseModel):
     species = models.ForeignKey(
         Species,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="species_hair_colors"
     )
     hair_color = models.ForeignKey(
         HairColors,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="hair_color_species"
     )
 
     class Meta:
         unique_together = ('species', 'hair_color')
+        indexes = [
+            models.Index(fields=['hair_color', 'species'], name='species_hair_colors_rev_idx'),
+        ]
         verbose_name = "Species Hair Color"
         verbose_name_plural = "Species Hair Colors"
-        ordering = ['species__name', 'hair_color__color']
         db_table = 'relation_species_hair_colors'
 
 
@@ -729,19 +976,23 @@ class SpeciesSkinColors(BaseModel):
     species = models.ForeignKey(
         Species,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="species_skin_colors"
     )
     skin_color = models.ForeignKey(
         SkinColors,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="skin_color_species"
     )
 
     class Meta:
         unique_together = ('species', 'skin_color')
+        indexes = [
+            models.Index(fields=['skin_color', 'species'], name='species_skin_colors_rev_idx'),
+        ]
         verbose_name = "Species Skin Color"
         verbose_name_plural = "Species Skin Colors"
-        ordering = ['species__name', 'skin_color__color']
         db_table = 'relation_species_skin_colors'
 
 
@@ -749,19 +1000,23 @@ class SpeciesFilms(BaseModel):
     species = models.ForeignKey(
         Species,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="species_films"
     )
     film = models.ForeignKey(
         Films,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="film_species"
     )
 
     class Meta:
         unique_together = ('species', 'film')
+        indexes = [
+            models.Index(fields=['film', 'species'], name='species_films_rev_idx'),
+        ]
         verbose_name = "Species Film"
         verbose_name_plural = "Species Films"
-        ordering = ['film__episode_id', 'species__name']
         db_table = 'relation_species_films'
 
 
@@ -769,19 +1024,23 @@ class PeopleFilms(BaseModel):
     person = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="people_films"
     )
     film = models.ForeignKey(
         Films,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="film_people"
     )
 
     class Meta:
         unique_together = ('person', 'film')
+        indexes = [
+            models.Index(fields=['film', 'person'], name='people_films_rev_idx'),
+        ]
         verbose_name = "People Film"
         verbose_name_plural = "People Films"
-        ordering = ['film__episode_id', 'person__name']
         db_table = 'relation_people_films'
 
 
@@ -789,19 +1048,23 @@ class PeopleSpecies(BaseModel):
     person = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="people_species"
     )
     species = models.ForeignKey(
         Species,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="species_people"
     )
 
     class Meta:
         unique_together = ('person', 'species')
+        indexes = [
+            models.Index(fields=['species', 'person'], name='people_species_rev_idx'),
+        ]
         verbose_name = "People Species"
         verbose_name_plural = "People Species"
-        ordering = ['person__name', 'species__name']
         db_table = 'relation_people_species'
 
 
@@ -813,19 +1076,23 @@ class PeopleEyeColors(BaseModel):
     person = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="people_eye_colors"
     )
     eye_color = models.ForeignKey(
         EyeColors,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="eye_color_people"
     )
 
     class Meta:
         unique_together = ('person', 'eye_color')
+        indexes = [
+            models.Index(fields=['eye_color', 'person'], name='people_eye_colors_rev_idx'),
+        ]
         verbose_name = "People Eye Color"
         verbose_name_plural = "People Eye Colors"
-        ordering = ['person__name', 'eye_color__color']
         db_table = 'relation_people_eye_colors'
 
 
@@ -833,19 +1100,23 @@ class PeopleHairColors(BaseModel):
     person = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="people_hair_colors"
     )
     hair_color = models.ForeignKey(
         HairColors,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="hair_color_people"
     )
 
     class Meta:
         unique_together = ('person', 'hair_color')
+        indexes = [
+            models.Index(fields=['hair_color', 'person'], name='people_hair_colors_rev_idx'),
+        ]
         verbose_name = "People Hair Color"
         verbose_name_plural = "People Hair Colors"
-        ordering = ['person__name', 'hair_color__color']
         db_table = 'relation_people_hair_colors'
 
 
@@ -853,17 +1124,21 @@ class PeopleSkinColors(BaseModel):
     person = models.ForeignKey(
         People,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="people_skin_colors"
     )
     skin_color = models.ForeignKey(
         SkinColors,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="skin_color_people"
     )
 
     class Meta:
         unique_together = ('person', 'skin_color')
+        indexes = [
+            models.Index(fields=['skin_color', 'person'], name='people_skin_colors_rev_idx'),
+        ]
         verbose_name = "People Skin Color"
         verbose_name_plural = "People Skin Colors"
-        ordering = ['person__name', 'skin_color__color']
         db_table = 'relation_people_skin_colors'
\ No newline at end of file
@@ -1,7 +1,69 @@
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from api.filters import OrderingFilter
+from api.utils.keyset import after, decode_cursor, encode_cursor, row_values
 
 
 class GenericPagination(PageNumberPagination):
+    """
+    Page numbers by default; keyset pages when the request has ?cursor.
+
+    A keyset page seeks past the last row of the previous page on the
+    ordering keys instead of counting an offset, so every page costs the
+    same. `?cursor=` (empty) starts at the first page.
+    """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 15
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keys = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.keys = OrderingFilter().get_ordering(request, view)
+        self.ordering = ','.join(f"{'-' if descending else ''}{field}" for field, descending in self.keys)
+
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            try:
+                ordering, values = decode_cursor(cursor)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+            if ordering != self.ordering or len(values) != len(self.keys):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                # Values of the wrong type for their field fail here, not in the query.
+                queryset = queryset.filter(after(self.keys, values))
+            except (ValueError, TypeError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        page_size = self.get_page_size(request)
+        rows = list(queryset[:page_size + 1])
+        self.next_values = row_values(self.keys, rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.keys is None:
+            return super().get_next_link()
+        if self.next_values is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(self.ordering, self.next_values))
+
+    def get_paginated_response(self, data):
+        if self.keys is None:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
@@ -0,0 +1,68 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_state = threading.local()
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads of the api models to the read pool and every write to the
+    primary database.
+
+    A thread sticks to one read database until the next request starts, so
+    all queries of a response see the same copy of the data.
+    """
+    app_label = 'api'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def _next_read_database(self):
+        pool = settings.SWAPI_READ_DATABASES
+        with self._lock:
+            self._counter += 1
+            return pool[self._counter % len(pool)]
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != self.app_label or not settings.SWAPI_READ_DATABASES:
+            return None
+
+        alias = getattr(_state, 'alias', None)
+        if alias is None:
+            alias = _state.alias = self._next_read_database()
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != self.app_label:
+            return None
+        return settings.SWAPI_PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._meta.app_label == obj2._meta.app_label == self.app_label:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive their schema together with the data.
+        if db != settings.SWAPI_PRIMARY_DATABASE and db in settings.SWAPI_READ_DATABASES:
+            return False
+        return None
+
+
+def reset_read_database(**kwargs):
+    """Let the next request pick a read database again"""
+    _state.alias = None
+
+
+@contextmanager
+def use_primary():
+    """Pin reads of the current thread to the primary, e.g. during an import"""
+    previous = getattr(_state, 'alias', None)
+    _state.alias = settings.SWAPI_PRIMARY_DATABASE
+    try:
+        yield
+    finally:
+        _state.alias = previous
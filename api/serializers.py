@@ -1,4 +1,6 @@
 # serializers.py
+from functools import wraps
+
 from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import (
@@ -7,6 +9,7 @@ from .models import (
     StarshipClasses, StarshipManufacturers, VehicleClasses, VehicleManufacturers, PeopleEyeColors, PeopleHairColors,
     PeopleSkinColors
 )
+from .utils.fragments import serialize_many
 
 
 # =============================================================================
@@ -192,7 +195,41 @@ class StarshipListSerializer(serializers.ModelSerializer):
 # DETAILED RETRIEVE SERIALIZERS - WITH NESTED OBJECTS
 # =============================================================================
 
-class FilmDetailSerializer(serializers.ModelSerializer):
+def from_entity_store(relation):
+    """Answer a nested relation from the entity store when the view passed one in the context"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, obj):
+            store = self.context.get('entity_store')
+            if store is None:
+                return method(self, obj)
+            return store.related(relation, obj.pk)
+        return wrapper
+    return decorator
+
+
+def nested_list(serializer_class):
+    """Serialize the queryset returned by the method with `serializer_class`, reusing cached fragments"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, obj):
+            return serialize_many(serializer_class, method(self, obj))
+        return wrapper
+    return decorator
+
+
+class RelationCountsMixin:
+    """Adds the relation counts annotated by the view when ?with_counts is set"""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        relation_counts = self.context.get('relation_counts')
+        if relation_counts:
+            data['counts'] = {name: getattr(instance, f'{name}_count') for name in relation_counts}
+        return data
+
+
+class FilmDetailSerializer(RelationCountsMixin, serializers.ModelSerializer):
     """Detailed Film serializer with nested objects"""
     characters = serializers.SerializerMethodField()
     planets = serializers.SerializerMethodField()
@@ -208,53 +245,63 @@ class FilmDetailSerializer(serializers.ModelSerializer):
             'starships', 'vehicles', 'species', 'created', 'edited'
         ]
 
+    @from_entity_store('film_characters')
+    @nested_list(PersonListSerializer)
     def get_characters(self, obj):
         people = People.objects.filter(people_films__film=obj).select_related(
             'homeworld'
         ).prefetch_related(
             Prefetch(
                 'people_eye_colors',
-                queryset=PeopleEyeColors.objects.all()
+                queryset=PeopleEyeColors.objects.select_related('eye_color').order_by('eye_color__color')
             ),
             Prefetch(
                 'people_hair_colors',
-                queryset=PeopleHairColors.objects.all()
+                queryset=PeopleHairColors.objects.select_related('hair_color').order_by('hair_color__color')
             ),
             Prefetch(
                 'people_skin_colors',
-                queryset=PeopleSkinColors.objects.all()
+                queryset=PeopleSkinColors.objects.select_related('skin_color').order_by('skin_color__color')
             )
         )
-        return PersonListSerializer(people, many=True).data
+        return people
 
+    @from_entity_store('film_planets')
+    @nested_list(PlanetListSerializer)
     def get_planets(self, obj):
         planets = Planets.objects.filter(planet_films__film=obj).select_related(
             'climate', 'terrain'
         )
-        return PlanetListSerializer(planets, many=True).data
+        return planets
 
+    @from_entity_store('film_starships')
+    @nested_list(StarshipListSerializer)
     def get_starships(self, obj):
         starships = Starships.objects.filter(starship_films__film=obj).select_related(
             'starship_class'
         ).prefetch_related('starship_manufacturers__manufacturer')
-        return StarshipListSerializer(starships, many=True).data
+        return starships
 
+    @from_entity_store('film_vehicles')
+    @nested_list(VehicleListSerializer)
     def get_vehicles(self, obj):
         vehicles = Vehicles.objects.filter(vehicle_films__film=obj).select_related(
             'vehicle_class'
         ).prefetch_related('vehicle_manufacturers__manufacturer')
-        return VehicleListSerializer(vehicles, many=True).data
+        return vehicles
 
+    @from_entity_store('film_species')
+    @nested_list(SpeciesListSerializer)
     def get_species(self, obj):
         species = Species.objects.filter(species_films__film=obj).prefetch_related(
             'species_eye_colors__eye_color',
             'species_hair_colors__hair_color',
             'species_skin_colors__skin_color'
         )
-        return SpeciesListSerializer(species, many=True).data
+        return species
 
 
-class PlanetDetailSerializer(serializers.ModelSerializer):
+class PlanetDetailSerializer(RelationCountsMixin, serializers.ModelSerializer):
     """Detailed Planet serializer with nested objects"""
     climate = ClimateSerializer(read_only=True)
     terrain = TerrainSerializer(read_only=True)
@@ -269,31 +316,35 @@ class PlanetDetailSerializer(serializers.ModelSerializer):
             'residents', 'films', 'created', 'edited'
         ]
 
+    @from_entity_store('planet_residents')
+    @nested_list(PersonListSerializer)
     def get_residents(self, obj):
         residents = People.objects.filter(homeworld=obj).select_related(
             'homeworld'
         ).prefetch_related(
             Prefetch(
                 'people_eye_colors',
-                queryset=PeopleEyeColors.objects.all()
+                queryset=PeopleEyeColors.objects.select_related('eye_color').order_by('eye_color__color')
             ),
             Prefetch(
                 'people_hair_colors',
-                queryset=PeopleHairColors.objects.all()
+                queryset=PeopleHairColors.objects.select_related('hair_color').order_by('hair_color__color')
             ),
             Prefetch(
                 'people_skin_colors',
-                queryset=PeopleSkinColors.objects.all()
+                queryset=PeopleSkinColors.objects.select_related('skin_color').order_by('skin_color__color')
             )
         )
-        return PersonListSerializer(residents, many=True).data
+        return residents
 
+    @from_entity_store('planet_films')
+    @nested_list(FilmListSerializer)
     def get_films(self, obj):
         films = Films.objects.filter(film_planets__planet=obj)
-        return FilmListSerializer(films, many=True).data
+        return films
 
 
-class PersonDetailSerializer(serializers.ModelSerializer):
+class PersonDetailSerializer(RelationCountsMixin, serializers.ModelSerializer):
     """Detailed Person serializer with nested objects"""
     homeworld = PlanetListSerializer(read_only=True)
     films = serializers.SerializerMethodField()
@@ -324,32 +375,40 @@ class PersonDetailSerializer(serializers.ModelSerializer):
         colors = SkinColors.objects.filter(skin_color_people__person=obj)
         return [color.color for color in colors] if colors.exists() else []
 
+    @from_entity_store('person_films')
+    @nested_list(FilmListSerializer)
     def get_films(self, obj):
         films = Films.objects.filter(film_people__person=obj)
-        return FilmListSerializer(films, many=True).data
+        return films
 
+    @from_entity_store('person_species')
+    @nested_list(SpeciesListSerializer)
     def get_species(self, obj):
         species = Species.objects.filter(species_people__person=obj).prefetch_related(
             'species_eye_colors__eye_color',
             'species_hair_colors__hair_color',
             'species_skin_colors__skin_color'
         )
-        return SpeciesListSerializer(species, many=True).data
+        return species
 
+    @from_entity_store('person_vehicles')
+    @nested_list(VehicleListSerializer)
     def get_vehicles(self, obj):
         vehicles = Vehicles.objects.filter(vehicle_pilots__pilot=obj).select_related(
             'vehicle_class'
         ).prefetch_related('vehicle_manufacturers__manufacturer')
-        return VehicleListSerializer(vehicles, many=True).data
+        return vehicles
 
+    @from_entity_store('person_starships')
+    @nested_list(StarshipListSerializer)
     def get_starships(self, obj):
         starships = Starships.objects.filter(starship_pilots__pilot=obj).select_related(
             'starship_class'
         ).prefetch_related('starship_manufacturers__manufacturer')
-        return StarshipListSerializer(starships, many=True).data
+        return starships
 
 
-class SpeciesDetailSerializer(serializers.ModelSerializer):
+class SpeciesDetailSerializer(RelationCountsMixin, serializers.ModelSerializer):
     """Detailed Species serializer with nested objects"""
     homeworld = PlanetListSerializer(read_only=True)
     people = serializers.SerializerMethodField()
@@ -366,28 +425,32 @@ class SpeciesDetailSerializer(serializers.ModelSerializer):
             'homeworld', 'language', 'people', 'films', 'created', 'edited'
         ]
 
+    @from_entity_store('species_people')
+    @nested_list(PersonListSerializer)
     def get_people(self, obj):
         people = People.objects.filter(people_species__species=obj).select_related(
             'homeworld',
         ).prefetch_related(
             Prefetch(
                 'people_eye_colors',
-                queryset=PeopleEyeColors.objects.all()
+                queryset=PeopleEyeColors.objects.select_related('eye_color').order_by('eye_color__color')
             ),
             Prefetch(
                 'people_hair_colors',
-                queryset=PeopleHairColors.objects.all()
+                queryset=PeopleHairColors.objects.select_related('hair_color').order_by('hair_color__color')
             ),
             Prefetch(
                 'people_skin_colors',
-                queryset=PeopleSkinColors.objects.all()
+                queryset=PeopleSkinColors.objects.select_related('skin_color').order_by('skin_color__color')
             )
         )
-        return PersonListSerializer(people, many=True).data
+        return people
 
+    @from_entity_store('species_films')
+    @nested_list(FilmListSerializer)
     def get_films(self, obj):
         films = Films.objects.filter(film_species__species=obj)
-        return FilmListSerializer(films, many=True).data
+        return films
 
     def get_skin_colors(self, obj):
         colors = SkinColors.objects.filter(skin_color_species__species=obj)
@@ -402,7 +465,7 @@ class SpeciesDetailSerializer(serializers.ModelSerializer):
         return [{"id": color.id, "name": color.name, "color": color.color} for color in colors]
 
 
-class VehicleDetailSerializer(serializers.ModelSerializer):
+class VehicleDetailSerializer(RelationCountsMixin, serializers.ModelSerializer):
     """Detailed Vehicle serializer with nested objects"""
     vehicle_class = VehicleClassSerializer(read_only=True)
     manufacturers = serializers.SerializerMethodField()
@@ -423,31 +486,35 @@ class VehicleDetailSerializer(serializers.ModelSerializer):
         )
         return VehicleManufacturerSerializer(manufacturers, many=True).data
 
+    @from_entity_store('vehicle_pilots')
+    @nested_list(PersonListSerializer)
     def get_pilots(self, obj):
         pilots = People.objects.filter(piloted_vehicles__vehicle=obj).select_related(
             'homeworld'
         ).prefetch_related(
             Prefetch(
                 'people_eye_colors',
-                queryset=PeopleEyeColors.objects.all()
+                queryset=PeopleEyeColors.objects.select_related('eye_color').order_by('eye_color__color')
             ),
             Prefetch(
                 'people_hair_colors',
-                queryset=PeopleHairColors.objects.all()
+                queryset=PeopleHairColors.objects.select_related('hair_color').order_by('hair_color__color')
             ),
             Prefetch(
                 'people_skin_colors',
-                queryset=PeopleSkinColors.objects.all()
+                queryset=PeopleSkinColors.objects.select_related('skin_color').order_by('skin_color__color')
             )
         )
-        return PersonListSerializer(pilots, many=True).data
+        return pilots
 
+    @from_entity_store('vehicle_films')
+    @nested_list(FilmListSerializer)
     def get_films(self, obj):
         films = Films.objects.filter(film_vehicles__vehicle=obj)
-        return FilmListSerializer(films, many=True).data
+        return films
 
 
-class StarshipDetailSerializer(serializers.ModelSerializer):
+class StarshipDetailSerializer(RelationCountsMixin, serializers.ModelSerializer):
     """Detailed Starship serializer with nested objects"""
     starship_class = StarshipClassSerializer(read_only=True)
     manufacturers = serializers.SerializerMethodField()
@@ -469,28 +536,32 @@ class StarshipDetailSerializer(serializers.ModelSerializer):
         )
         return StarshipManufacturerSerializer(manufacturers, many=True).data
 
+    @from_entity_store('starship_pilots')
+    @nested_list(PersonListSerializer)
     def get_pilots(self, obj):
         pilots = People.objects.filter(piloted_starships__starship=obj).select_related(
             'homeworld'
         ).prefetch_related(
             Prefetch(
                 'people_eye_colors',
-                queryset=PeopleEyeColors.objects.all()
+                queryset=PeopleEyeColors.objects.select_related('eye_color').order_by('eye_color__color')
             ),
             Prefetch(
                 'people_hair_colors',
-                queryset=PeopleHairColors.objects.all()
+                queryset=PeopleHairColors.objects.select_related('hair_color').order_by('hair_color__color')
             ),
             Prefetch(
                 'people_skin_colors',
-                queryset=PeopleSkinColors.objects.all()
+                queryset=PeopleSkinColors.objects.select_related('skin_color').order_by('skin_color__color')
             )
         )
-        return PersonListSerializer(pilots, many=True).data
+        return pilots
 
+    @from_entity_store('starship_films')
+    @nested_list(FilmListSerializer)
     def get_films(self, obj):
         films = Films.objects.filter(film_starships__starship=obj)
-        return FilmListSerializer(films, many=True).data
+        return films
 
 
 # =============================================================================
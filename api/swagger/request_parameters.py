@@ -15,3 +15,94 @@ TITLE_PARAMETER = openapi.Parameter(
     description="Search by title",
     type=openapi.TYPE_STRING
 )
+
+# For BaseStarWarsAPIView.relation_counts
+WITH_COUNTS_PARAMETER = openapi.Parameter(
+    'with_counts',
+    openapi.IN_QUERY,
+    description="Add the number of related films, pilots, residents, species etc. to each result",
+    type=openapi.TYPE_BOOLEAN
+)
+
+# For OrderingFilter and GenericPagination
+ORDERING_PARAMETER = openapi.Parameter(
+    'ordering',
+    openapi.IN_QUERY,
+    description="Comma-separated sort keys, '-' for descending, e.g. -mass,name. "
+                "Accepts the numeric fields and the relation counts (films_count, ...)",
+    type=openapi.TYPE_STRING
+)
+
+CURSOR_PARAMETER = openapi.Parameter(
+    'cursor',
+    openapi.IN_QUERY,
+    description="Keyset pagination: pass it empty for the first page, then follow `next`",
+    type=openapi.TYPE_STRING
+)
+
+# For the relation graph views
+NODE_PARAMETER = openapi.Parameter(
+    'node',
+    openapi.IN_QUERY,
+    description="Graph node as <type>:<id>, e.g. people:1",
+    type=openapi.TYPE_STRING,
+    required=True
+)
+
+NODE_TYPE_PARAMETER = openapi.Parameter(
+    'type',
+    openapi.IN_QUERY,
+    description="Only return nodes of this type (people, films, planets, species, starships, vehicles)",
+    type=openapi.TYPE_STRING
+)
+
+VIA_PARAMETER = openapi.Parameter(
+    'via',
+    openapi.IN_QUERY,
+    description="Node type the co-appearances are counted through (default: films)",
+    type=openapi.TYPE_STRING
+)
+
+FROM_NODE_PARAMETER = openapi.Parameter(
+    'from',
+    openapi.IN_QUERY,
+    description="Start node as <type>:<id>",
+    type=openapi.TYPE_STRING,
+    required=True
+)
+
+TO_NODE_PARAMETER = openapi.Parameter(
+    'to',
+    openapi.IN_QUERY,
+    description="End node as <type>:<id>",
+    type=openapi.TYPE_STRING,
+    required=True
+)
+
+
+# For the relational filters; every filter has a <name>__in variant taking a comma-separated list
+def _with_in_variant(name, description, type=openapi.TYPE_STRING):
+    return [
+        openapi.Parameter(name, openapi.IN_QUERY, description=description, type=type),
+        openapi.Parameter(
+            f'{name}__in',
+            openapi.IN_QUERY,
+            description=f"{description}, any of a comma-separated list",
+            type=openapi.TYPE_STRING
+        ),
+    ]
+
+
+FILM_PARAMETERS = _with_in_variant('film', "Appears in the film with this id", openapi.TYPE_INTEGER)
+HOMEWORLD_PARAMETERS = _with_in_variant('homeworld', "Homeworld is the planet with this id", openapi.TYPE_INTEGER)
+SPECIES_PARAMETERS = _with_in_variant('species', "Belongs to the species with this id", openapi.TYPE_INTEGER)
+COLOR_PARAMETERS = (
+    _with_in_variant('eye_color', "Has this eye color, e.g. blue")
+    + _with_in_variant('hair_color', "Has this hair color, e.g. blond")
+    + _with_in_variant('skin_color', "Has this skin color, e.g. fair")
+)
+STARSHIP_CLASS_PARAMETERS = _with_in_variant('starship_class', "Starship class, e.g. corvette")
+VEHICLE_CLASS_PARAMETERS = _with_in_variant('vehicle_class', "Vehicle class, e.g. wheeled")
+MANUFACTURER_PARAMETERS = _with_in_variant('manufacturer', "Built by this manufacturer, e.g. Kuat Drive Yards")
+CLIMATE_PARAMETERS = _with_in_variant('climate', "Has this climate, e.g. arid")
+TERRAIN_PARAMETERS = _with_in_variant('terrain', "Has this terrain, e.g. desert")
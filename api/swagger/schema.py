@@ -0,0 +1,179 @@
+"""
+Swagger documentation of the API views.
+
+Kept out of `api.views` and applied by `api.urls` only when ENABLE_SWAGGER
+is on, so workers that do not serve the docs never import drf_yasg.
+
+The schema itself is generated once, by `manage.py generate_schema` on
+deploy or on the first docs request of a process, and then served as is.
+"""
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.response import Response
+
+from api import views
+from api.swagger.request_parameters import NAME_PARAMETER, TITLE_PARAMETER, WITH_COUNTS_PARAMETER, \
+    ORDERING_PARAMETER, CURSOR_PARAMETER, NODE_PARAMETER, NODE_TYPE_PARAMETER, VIA_PARAMETER, \
+    FROM_NODE_PARAMETER, TO_NODE_PARAMETER, FILM_PARAMETERS, HOMEWORLD_PARAMETERS, SPECIES_PARAMETERS, \
+    COLOR_PARAMETERS, STARSHIP_CLASS_PARAMETERS, VEHICLE_CLASS_PARAMETERS, MANUFACTURER_PARAMETERS, \
+    CLIMATE_PARAMETERS, TERRAIN_PARAMETERS
+
+# Shared by every list view
+LIST_PARAMETERS = [WITH_COUNTS_PARAMETER, ORDERING_PARAMETER, CURSOR_PARAMETER]
+
+# View -> query parameters of its GET
+MANUAL_PARAMETERS = {
+    views.PeopleAPIView: [
+        NAME_PARAMETER, *LIST_PARAMETERS,
+        *FILM_PARAMETERS, *HOMEWORLD_PARAMETERS, *SPECIES_PARAMETERS, *COLOR_PARAMETERS,
+    ],
+    views.PlanetsAPIView: [
+        NAME_PARAMETER, *LIST_PARAMETERS,
+        *FILM_PARAMETERS, *CLIMATE_PARAMETERS, *TERRAIN_PARAMETERS,
+    ],
+    views.StarshipsAPIView: [
+        NAME_PARAMETER, *LIST_PARAMETERS,
+        *FILM_PARAMETERS, *STARSHIP_CLASS_PARAMETERS, *MANUFACTURER_PARAMETERS,
+    ],
+    views.SpeciesAPIView: [
+        NAME_PARAMETER, *LIST_PARAMETERS,
+        *FILM_PARAMETERS, *HOMEWORLD_PARAMETERS, *COLOR_PARAMETERS,
+    ],
+    views.VehiclesAPIView: [
+        NAME_PARAMETER, *LIST_PARAMETERS,
+        *FILM_PARAMETERS, *VEHICLE_CLASS_PARAMETERS, *MANUFACTURER_PARAMETERS,
+    ],
+    views.FilmsAPIView: [TITLE_PARAMETER, *LIST_PARAMETERS],
+    views.GraphNeighboursAPIView: [NODE_PARAMETER, NODE_TYPE_PARAMETER],
+    views.GraphCoAppearancesAPIView: [NODE_PARAMETER, VIA_PARAMETER, NODE_TYPE_PARAMETER],
+    views.GraphPathAPIView: [FROM_NODE_PARAMETER, TO_NODE_PARAMETER],
+}
+
+
+def document_views():
+    """Attach the manual parameters to the views, as @swagger_auto_schema on their get() would"""
+    for view, parameters in MANUAL_PARAMETERS.items():
+        if not hasattr(view.get, '_swagger_auto_schema'):
+            swagger_auto_schema(manual_parameters=parameters)(view.get)
+
+
+# =============================================================================
+# SCHEMA - Generated once, served from memory
+# =============================================================================
+
+API_VERSION = 'v1'
+
+API_INFO = openapi.Info(
+    title="Star Wars API",
+    default_version=API_VERSION,
+    description="A Star Wars API with all your favorite characters, planets, starships and more!",
+    contact=openapi.Contact(email="v.geroutskis@gmail.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+SchemaView = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=[permissions.AllowAny, ],
+)
+
+# Format -> (file name, codec)
+FORMATS = {
+    '.json': ('swagger.json', OpenAPICodecJson(validators=[])),
+    '.yaml': ('swagger.yaml', OpenAPICodecYaml(validators=[])),
+}
+
+SchemaDocument = namedtuple('SchemaDocument', ['content', 'content_type', 'etag', 'last_modified'])
+
+
+class DocsPageView(SchemaView):
+    """
+    Swagger UI and ReDoc pages without generating the schema.
+
+    The pages only show the title and version; the schema is fetched by
+    the browser from SPEC_URL, the cached swagger.json.
+    """
+
+    def get(self, request, version='', format=None):
+        return Response(openapi.Swagger(info=API_INFO, _prefix='/', _version=API_VERSION, paths=openapi.Paths({})))
+
+
+def build_schema():
+    """Introspect every view, serializer and filter; the expensive part"""
+    document_views()
+    generator = SchemaView.generator_class(API_INFO, API_VERSION)
+    return generator.get_schema(request=None, public=True)
+
+
+def encode_schema(schema):
+    """Format -> encoded schema"""
+    return {schema_format: codec.encode(schema) for schema_format, (_, codec) in FORMATS.items()}
+
+
+def write_schema(directory):
+    """Write every format to `directory`; returns the paths written"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for schema_format, content in encode_schema(build_schema()).items():
+        path = os.path.join(directory, FORMATS[schema_format][0])
+        with open(f'{path}.tmp', 'wb') as file:
+            file.write(content)
+        os.replace(f'{path}.tmp', path)
+        paths.append(path)
+    return paths
+
+
+def _document(schema_format, content, modified):
+    return SchemaDocument(
+        content=content,
+        content_type=FORMATS[schema_format][1].media_type,
+        etag=hashlib.sha1(content).hexdigest(),
+        last_modified=modified.replace(microsecond=0),
+    )
+
+
+def _load_documents():
+    """From SWAPI_SCHEMA_DIR when generate_schema wrote it there, generated otherwise"""
+    directory = settings.SWAPI_SCHEMA_DIR
+    paths = {
+        schema_format: os.path.join(directory, file_name) if directory else None
+        for schema_format, (file_name, _) in FORMATS.items()
+    }
+    if all(path and os.path.exists(path) for path in paths.values()):
+        documents = {}
+        for schema_format, path in paths.items():
+            with open(path, 'rb') as file:
+                modified = datetime.fromtimestamp(os.fstat(file.fileno()).st_mtime, timezone.utc)
+                documents[schema_format] = _document(schema_format, file.read(), modified)
+        return documents
+
+    generated = datetime.now(timezone.utc)
+    return {
+        schema_format: _document(schema_format, content, generated)
+        for schema_format, content in encode_schema(build_schema()).items()
+    }
+
+
+_lock = threading.Lock()
+_documents = None
+
+
+def get_schema_document(schema_format):
+    """Encoded schema of this process, loaded or generated on first use"""
+    global _documents
+
+    if _documents is None:
+        with _lock:
+            if _documents is None:
+                _documents = _load_documents()
+    return _documents[schema_format]
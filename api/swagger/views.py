@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from django.views.decorators.http import condition, require_safe
+
+from api.swagger.schema import get_schema_document
+
+
+@require_safe
+@condition(
+    etag_func=lambda request, format: get_schema_document(format).etag,
+    last_modified_func=lambda request, format: get_schema_document(format).last_modified,
+)
+def schema_document(request, format):
+    """The pregenerated swagger.json / swagger.yaml, answering conditional requests with 304"""
+    document = get_schema_document(format)
+    return HttpResponse(document.content, content_type=document.content_type)
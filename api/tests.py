@@ -1,3 +1,1248 @@
-from django.test import TestCase
+import base64
+import copy
+import gzip
+import importlib
+import io
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from unittest import mock, skipUnless
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.signals import request_started
+from django.db import DatabaseError, connection, connections
+from django.db.utils import ConnectionHandler, load_backend
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from api.filters import PersonFilter
+from api.models import (
+    Films, Planets, People, Species, Vehicles, Starships,
+    EyeColors, StarshipManufacturers, VehicleManufacturers,
+    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, SpeciesEyeColors,
+    SpeciesHairColors, SpeciesSkinColors, VehicleFilms, VehiclePilots,
+    VehicleManufacturerRelations, StarshipFilms, StarshipPilots,
+    StarshipManufacturerRelations, PeopleEyeColors, PeopleHairColors, PeopleSkinColors
+)
+from api.routers import PrimaryReplicaRouter, reset_read_database, use_primary
+from api.throttling import CostThrottle, admission
+from api.utils.bulk_import import ENTITIES, BulkImporter
+from api.utils.cache import bump_data_version, get_local_cache, single_flight
+from api.utils.compression import COMPRESSORS, IDENTITY, compress, negotiate
+from api.utils.datasets import (
+    DatasetError, activate_dataset, follow_active_dataset, get_active_dataset, list_datasets, staged_dataset,
+    validate_dataset,
+)
+from api.utils.fixture import fixture_models, load_fixture
+from api.utils.graph import EDGE_MODELS, NODE_MODELS, RelationGraph, get_graph
+from api.utils.keyset import decode_cursor
+from api.utils.lookups import LOOKUPS, LookupResolver
+from api.utils.lru import LRUCache
+from api.utils.normalize import normalize_column, typed_columns
+from api.utils.parser import StarWarsParser
+from api.utils.replicas import sync_replicas
+from api.utils.rows import ENTITY_RELATIONS, RELATIONS, UrlIndex, extract_id, lookup_names, prepare
+from api.utils.snapshot import build_snapshot, get_snapshot_reader
+from api.utils.store import EntityStore
+from api.utils.synthetic import generate_swapi_data
+from api.utils.validation import validate_payload, write_dead_letters
+from api.views import RESOURCE_VIEWS, FilmsAPIView
+
+
+@contextmanager
+def capture_sql(using='default'):
+    """
+    SQL of every statement run on `using` in the block.
+
+    Unlike CaptureQueriesContext it survives test client requests, which
+    clear the query log when they start.
+    """
+    statements = []
+
+    def record(execute, sql, params, many, context):
+        statements.append(sql)
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(record):
+        yield statements
+
+
+class FixtureTestCase(TestCase):
+    """Tests on the committed table fixture, each starting with an empty cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_fixture()
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url):
+        """JSON body of a successful request"""
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+JUNCTION_MODELS = [
+    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, SpeciesEyeColors,
+    SpeciesHairColors, SpeciesSkinColors, VehicleFilms, VehiclePilots,
+    VehicleManufacturerRelations, StarshipFilms, StarshipPilots,
+    StarshipManufacturerRelations, PeopleEyeColors, PeopleHairColors, PeopleSkinColors,
+]
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite')
+class JunctionIndexTests(TestCase):
+    """The serializer access paths are answered from the junction indexes alone"""
+
+    def assertCoveringIndex(self, queryset, table, index=None):
+        plan = queryset.explain()
+        steps = [step for step in plan.splitlines() if f' {table} ' in step]
+        self.assertTrue(steps, plan)
+        self.assertIn('USING COVERING INDEX', steps[0], plan)
+        if index:
+            self.assertIn(index, steps[0], plan)
+
+    def test_reverse_lookups_use_reverse_indexes(self):
+        cases = [
+            (People.objects.filter(people_films__film=1), 'relation_people_films', 'people_films_rev_idx'),
+            (Planets.objects.filter(planet_films__film=1), 'relation_planet_films', 'planet_films_rev_idx'),
+            (Starships.objects.filter(starship_films__film=1), 'relation_starship_films', 'starship_films_rev_idx'),
+            (Vehicles.objects.filter(vehicle_films__film=1), 'relation_vehicle_films', 'vehicle_films_rev_idx'),
+            (Species.objects.filter(species_films__film=1), 'relation_species_films', 'species_films_rev_idx'),
+            (People.objects.filter(people_species__species=1), 'relation_people_species', 'people_species_rev_idx'),
+            (Starships.objects.filter(starship_pilots__pilot=1), 'relation_starship_pilots', 'starship_pilots_rev_idx'),
+            (Vehicles.objects.filter(vehicle_pilots__pilot=1), 'relation_vehicle_pilots', 'vehicle_pilots_rev_idx'),
+        ]
+        for queryset, table, index in cases:
+            with self.subTest(table=table):
+                self.assertCoveringIndex(queryset, table, index)
+
+    def test_forward_lookups_use_unique_indexes(self):
+        cases = [
+            (Films.objects.filter(film_people__person=1), 'relation_people_films'),
+            (Films.objects.filter(film_planets__planet=1), 'relation_planet_films'),
+            (Films.objects.filter(film_starships__starship=1), 'relation_starship_films'),
+            (Films.objects.filter(film_vehicles__vehicle=1), 'relation_vehicle_films'),
+            (Films.objects.filter(film_species__species=1), 'relation_species_films'),
+            (People.objects.filter(piloted_starships__starship=1), 'relation_starship_pilots'),
+            (People.objects.filter(piloted_vehicles__vehicle=1), 'relation_vehicle_pilots'),
+            (EyeColors.objects.filter(eye_color_people__person=1), 'relation_people_eye_colors'),
+            (EyeColors.objects.filter(eye_color_species__species=1), 'relation_species_eye_colors'),
+            (StarshipManufacturers.objects.filter(manufacturer_starships__starship=1),
+             'relation_starship_manufacturers'),
+            (VehicleManufacturers.objects.filter(manufacturer_vehicles__vehicle=1),
+             'relation_vehicle_manufacturers'),
+        ]
+        for queryset, table in cases:
+            with self.subTest(table=table):
+                self.assertCoveringIndex(queryset, table)
+
+    def test_junction_models_have_no_default_ordering(self):
+        for model in JUNCTION_MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(model._meta.ordering, [])
+                self.assertNotIn('ORDER BY', str(model.objects.all().query))
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Concurrent misses on one cache entry are computed once"""
+    key = 'swapi:test:single-flight'
+    clients = 20
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def compute(self, value='fresh', delay=0.2):
+        with self.calls_lock:
+            self.calls += 1
+        time.sleep(delay)
+        return value
+
+    def run_concurrently(self, function):
+        """Call `function` from `clients` threads released at the same moment"""
+        barrier = threading.Barrier(self.clients)
+
+        def client():
+            barrier.wait()
+            return function()
+
+        with ThreadPoolExecutor(max_workers=self.clients) as pool:
+            futures = [pool.submit(client) for _ in range(self.clients)]
+            return [future.result() for future in futures]
+
+    def test_cold_entry_is_computed_once(self):
+        results = self.run_concurrently(lambda: single_flight(self.key, self.compute))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ['fresh'] * self.clients)
+
+    def test_stale_entry_is_served_while_revalidating(self):
+        single_flight(self.key, lambda: 'stale')
+        bump_data_version()
+
+        results = self.run_concurrently(lambda: single_flight(self.key, self.compute))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results.count('fresh'), 1)
+        self.assertEqual(results.count('stale'), self.clients - 1)
+        self.assertEqual(single_flight(self.key, self.compute), 'fresh')
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_entry_is_recomputed(self):
+        single_flight(self.key, lambda: 'stale', timeout=0)
+
+        self.assertEqual(single_flight(self.key, self.compute, timeout=60), 'fresh')
+        self.assertEqual(self.calls, 1)
+
+    def test_failed_computation_releases_the_lock(self):
+        def fail():
+            raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            single_flight(self.key, fail)
+
+        self.assertEqual(single_flight(self.key, lambda: self.compute(delay=0)), 'fresh')
+
+
+class LocalCacheTests(SimpleTestCase):
+    """A bounded per-process LRU in front of the shared cache, tied to the data version"""
+    key = 'swapi:test:local'
+
+    def setUp(self):
+        cache.clear()
+
+    def test_lru_evicts_by_size(self):
+        lru = LRUCache(max_size=1000)
+        for key in 'abc':
+            lru.set(key, b'x' * 300)
+        lru.get('a')
+        lru.set('d', b'x' * 300)
+
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), b'x' * 300)
+        self.assertLessEqual(lru.size, 1000)
+        lru.set('huge', b'x' * 2000)
+        self.assertIsNone(lru.get('huge'))
+        self.assertEqual(
+            {name: lru.stats()[name] for name in ('entries', 'hits', 'misses', 'evictions')},
+            {'entries': 3, 'hits': 2, 'misses': 2, 'evictions': 1},
+        )
+
+    @override_settings(SWAPI_LOCAL_CACHE_SIZE=1024 * 1024, SWAPI_DATA_VERSION_TTL=60)
+    def test_hits_skip_the_shared_cache_until_the_version_changes(self):
+        get_local_cache().clear()
+        self.assertEqual(single_flight(self.key, lambda: 'first'), 'first')
+        cache.delete(self.key)
+        self.assertEqual(single_flight(self.key, lambda: 'second'), 'first')
+
+        bump_data_version()
+        self.assertEqual(single_flight(self.key, lambda: 'second'), 'second')
+
+    @override_settings(SWAPI_LOCAL_CACHE_SIZE=1024 * 1024, SWAPI_DATA_VERSION_TTL=60)
+    def test_outdated_local_entries_defer_to_the_shared_cache(self):
+        get_local_cache().clear()
+        single_flight(self.key, lambda: 'first')
+        # Another process imports and recomputes the entry.
+        version = bump_data_version()
+        cache.set(self.key, (version, None, 'recomputed'))
+        self.assertEqual(single_flight(self.key, lambda: 'local'), 'recomputed')
+
+
+class NormalizeTests(SimpleTestCase):
+    """SWAPI display strings are parsed into typed columns"""
+
+    def test_numbers(self):
+        values = ['1,358', '80.5', '1000km', 'unknown', 'n/a', '', None, '30-165']
+        self.assertEqual(
+            normalize_column(values, 'float').tolist(),
+            [1358.0, 80.5, 1000.0, None, None, None, None, None],
+        )
+        self.assertEqual(
+            normalize_column(['1,000,000,000,000', '80.5', '80.0', 'unknown'], 'int').tolist(),
+            [1000000000000, None, 80, None],
+        )
+
+    def test_ranges(self):
+        values = ['30-165', '342,953', 'unknown']
+        self.assertEqual(normalize_column(values, 'range_min').tolist(), [30, 342953, None])
+        self.assertEqual(normalize_column(values, 'range_max').tolist(), [165, 342953, None])
+
+    def test_birth_years(self):
+        self.assertEqual(
+            normalize_column(['19BBY', '41.9BBY', '22ABY', 'unknown'], 'birth_year').tolist(),
+            [19.0, 41.9, -22.0, None],
+        )
+
+    def test_null_mask(self):
+        column = normalize_column(['172', 'unknown', '96'], 'float')
+        self.assertEqual([bool(null) for null in column.mask.tolist()], [False, True, False])
+
+    def test_typed_columns_follow_the_items(self):
+        items = [{'crew': '30-165', 'length': '1,600'}, {'crew': '1', 'length': 'unknown'}]
+        columns = typed_columns('starships', items)
+        self.assertEqual(columns['crew_min'], [30, 1])
+        self.assertEqual(columns['crew_max'], [165, 1])
+        self.assertEqual(columns['length_num'], [1600.0, None])
+
+
+class UrlIndexTests(SimpleTestCase):
+    """Relation URLs resolve to the ids imported for their resource"""
+
+    def test_resolves_imported_ids_only(self):
+        urls = UrlIndex()
+        self.assertEqual(urls.add('films', 'https://swapi.dev/api/films/1/'), 1)
+        urls.add('films', 'https://swapi.dev/api/films/2/')
+
+        self.assertEqual(urls.resolve('films', 'https://swapi.dev/api/films/2/'), 2)
+        self.assertIsNone(urls.resolve('planets', 'https://swapi.dev/api/planets/2/'))
+        self.assertIsNone(urls.resolve('films', None))
+        self.assertEqual(
+            urls.resolve_all('films', ['https://swapi.dev/api/films/2/', 'https://swapi.dev/api/films/3/', 'bad']),
+            [2],
+        )
+
+    def test_preparers_parse_each_url_once(self):
+        film = 'https://swapi.dev/api/films/1/'
+        people = [
+            {'url': f'https://swapi.dev/api/people/{pk}/', 'name': str(pk), 'films': [film]} for pk in (1, 2, 3)
+        ]
+        with mock.patch('api.utils.rows.extract_id', wraps=extract_id) as parse:
+            rows, relations = prepare('people', people)
+        self.assertEqual(relations['people_films'], [(1, 1), (2, 1), (3, 1)])
+        self.assertEqual([call.args[0] for call in parse.call_args_list].count(film), 1)
+
+    def test_relations_name_their_junction_models(self):
+        for relation, (model, source_field, source, target_field, target) in RELATIONS.items():
+            self.assertIs(
+                apps.get_model('api', model)._meta.get_field(target_field).related_model,
+                ENTITIES[target] if relation in ENTITY_RELATIONS else LOOKUPS[target][0],
+            )
+
+
+class RelationFilterTests(TestCase):
+    """Relational filters match the payload and never repeat a row"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = generate_swapi_data(scale=1, seed=7)
+        with redirect_stdout(io.StringIO()):
+            BulkImporter().import_data(cls.data)
+
+    def people(self, **params):
+        return list(PersonFilter(params, People.objects.all()).qs.values_list('id', flat=True))
+
+    def test_film_filters(self):
+        expected = {
+            extract_id(item['url']) for item in self.data['people']
+            if {1, 2} & {extract_id(url) for url in item['films']}
+        }
+        self.assertTrue(expected)
+        self.assertEqual(set(self.people(film__in='1,2')), expected)
+        self.assertEqual(len(self.people(film__in='1,2')), len(expected))
+
+    def test_filters_combine(self):
+        color = self.data['people'][0]['eye_color'].split(',')[0].strip()
+        both = set(self.people(film=1, eye_color=color))
+        self.assertEqual(both, set(self.people(film=1)) & set(self.people(eye_color=color)))
+
+    def test_foreign_key_filters(self):
+        homeworlds = {extract_id(item['homeworld']) for item in self.data['people'][:3]}
+        expected = {
+            extract_id(item['url']) for item in self.data['people'] if extract_id(item['homeworld']) in homeworlds
+        }
+        self.assertEqual(set(self.people(homeworld__in=','.join(map(str, homeworlds)))), expected)
+
+    def test_invalid_id_is_rejected(self):
+        self.assertFalse(PersonFilter({'film': 'x'}, People.objects.all()).is_valid())
+
+
+class ImportValidationTests(TestCase):
+    """Malformed records and dangling relations become dead letters instead of failing the import"""
+
+    def setUp(self):
+        self.data = generate_swapi_data(scale=1, seed=5)
+        self.films = len(self.data['films'])
+        self.data['films'][0].pop('title')
+        self.data['starships'][0]['starship_class'] = 'unknown'
+        self.data['people'][1] = 'not a record'
+        self.data['people'][0]['homeworld'] = 'https://swapi.dev/api/planets/9999/'
+
+    def test_rejected_records_are_reported(self):
+        data, report = validate_payload(self.data)
+
+        reasons = {(letter['resource'], letter['reason']) for letter in report.dead_letters if 'record' in letter}
+        self.assertEqual(reasons, {
+            ('films', 'title is missing'),
+            ('starships', 'starship_class is unknown'),
+            ('people', 'record is a str, not an object'),
+        })
+        self.assertEqual(len(data['films']), self.films - 1)
+        self.assertIsNone(data['people'][0]['homeworld'])
+        # The payload itself is left as it was.
+        self.assertEqual(self.data['people'][0]['homeworld'], 'https://swapi.dev/api/planets/9999/')
+        dangling = [letter for letter in report.dead_letters if 'target' in letter]
+        self.assertIn(('homeworld', 'https://swapi.dev/api/planets/9999/'),
+                      {(letter['field'], letter['target']) for letter in dangling})
+        # Links to the rejected film are dropped as well.
+        self.assertEqual(report.dangling_count, len(dangling))
+        self.assertGreater(report.dangling['people'], 1)
+
+    def test_null_columns_and_bad_dates_are_dead_lettered(self):
+        self.data['films'][1]['release_date'] = 'unknown'
+        self.data['people'][2]['gender'] = None
+        self.data['planets'][0]['rotation_period'] = None
+        self.data['species'][0]['classification'] = None
+        data, report = validate_payload(self.data)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'dead_letters.jsonl')
+            write_dead_letters(path, report.dead_letters)
+            with open(path) as file:
+                letters = [json.loads(line) for line in file]
+            # A clean run replaces them with an empty file.
+            write_dead_letters(path, [])
+            self.assertEqual(os.path.getsize(path), 0)
+        reasons = {(letter['url'], letter['reason']) for letter in letters if 'record' in letter}
+        self.assertTrue({
+            (self.data['films'][1]['url'], 'release_date is not a YYYY-MM-DD date'),
+            (self.data['people'][2]['url'], 'gender is a NoneType, expected str'),
+            (self.data['planets'][0]['url'], 'rotation_period is a NoneType, expected str'),
+            (self.data['species'][0]['url'], 'classification is a NoneType, expected str'),
+        } <= reasons)
+
+        for run in (BulkImporter().import_data, StarWarsParser().parse_json_data):
+            with self.subTest(importer=run.__self__.__class__.__name__):
+                People.objects.all().delete()
+                with redirect_stdout(io.StringIO()):
+                    run(data)
+                self.assertEqual(People.objects.count(), len(data['people']))
+                self.assertEqual(Films.objects.count(), self.films - 2)
+
+    def test_both_importers_load_the_valid_records(self):
+        data, report = validate_payload(self.data)
+        for run in (BulkImporter().import_data, StarWarsParser().parse_json_data):
+            with self.subTest(importer=run.__self__.__class__.__name__):
+                Films.objects.all().delete()
+                People.objects.all().delete()
+                with redirect_stdout(io.StringIO()):
+                    run(data)
+                self.assertEqual(Films.objects.count(), self.films - 1)
+                self.assertEqual(People.objects.count(), len(data['people']))
+
+
+class RelationSyncTests(TestCase):
+    """Imports sync the junction tables with the payload instead of only adding to them"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = generate_swapi_data(scale=1, seed=6)
+        with redirect_stdout(io.StringIO()):
+            BulkImporter().import_data(cls.data)
+
+    def test_unchanged_reimport_writes_no_relations(self):
+        for run in (BulkImporter().import_data, StarWarsParser().parse_json_data):
+            with self.subTest(importer=run.__self__.__class__.__name__):
+                with CaptureQueriesContext(connection) as queries, redirect_stdout(io.StringIO()):
+                    run(self.data)
+                writes = [query['sql'] for query in queries if query['sql'].startswith(('INSERT', 'DELETE'))]
+                self.assertEqual([sql for sql in writes if '"relation_' in sql], [])
+
+    def test_dropped_links_are_deleted(self):
+        person = self.data['people'][0]
+        person_id, film_id = extract_id(person['url']), extract_id(person['films'][0])
+        person['films'] = person['films'][1:]
+        person['starships'] = person['starships'] + [self.data['starships'][0]['url']]
+
+        for run in (BulkImporter().import_data, StarWarsParser().parse_json_data):
+            with self.subTest(importer=run.__self__.__class__.__name__):
+                with redirect_stdout(io.StringIO()):
+                    run(self.data)
+                self.assertFalse(PeopleFilms.objects.filter(person_id=person_id, film_id=film_id).exists())
+                self.assertEqual(
+                    set(StarshipPilots.objects.filter(pilot_id=person_id).values_list('starship_id', flat=True)),
+                    {extract_id(url) for url in person['starships']},
+                )
+                self.assertEqual(
+                    PeopleFilms.objects.count(), sum(len(item['films']) for item in self.data['people'])
+                )
+
+
+class LookupResolverTests(TestCase):
+    """Static values of a whole payload resolve with a constant number of queries"""
+
+    def test_batch_resolves_with_queries_per_table(self):
+        names = lookup_names(generate_swapi_data(scale=3, seed=4))
+        self.assertTrue(all(names.values()))
+        resolver = LookupResolver()
+        # Per table: load it, insert the missing names, read back their ids.
+        with self.assertNumQueries(3 * len(LOOKUPS)):
+            created = resolver.ensure(names)
+        self.assertEqual(created, {lookup: len(wanted) for lookup, wanted in names.items()})
+
+        with self.assertNumQueries(0):
+            for lookup, wanted in names.items():
+                ids = resolver.ids(lookup)
+                for name in wanted:
+                    self.assertEqual(resolver.get(lookup, name).pk, ids[name])
+
+        # A later import only loads the tables.
+        with self.assertNumQueries(len(LOOKUPS)):
+            self.assertFalse(any(LookupResolver().ensure(names).values()))
+
+
+class ImporterEquivalenceTests(TestCase):
+    """The parallel bulk import writes the same rows and relations as the sequential parser"""
+
+    def table_contents(self):
+        """Rows of every api table, static values by name, without surrogate keys and timestamps"""
+        names = {model: dict(model.objects.values_list('pk', field)) for model, field, _ in LOOKUPS.values()}
+        contents = {}
+        for model in fixture_models():
+            if model in names:
+                contents[model._meta.db_table] = sorted(names[model].values())
+                continue
+            fields = [
+                field for field in model._meta.concrete_fields
+                if not (field.primary_key and model not in ENTITIES.values())
+                and not getattr(field, 'auto_now', False) and not getattr(field, 'auto_now_add', False)
+            ]
+            rows = Counter()
+            for row in model.objects.values_list(*[field.attname for field in fields]):
+                rows[tuple(
+                    names[field.related_model].get(value) if field.related_model in names else value
+                    for field, value in zip(fields, row)
+                )] += 1
+            contents[model._meta.db_table] = rows
+        return contents
+
+    def test_process_pool_matches_the_parser(self):
+        data = generate_swapi_data(scale=1, seed=3)
+        with redirect_stdout(io.StringIO()):
+            StarWarsParser().parse_json_data(copy.deepcopy(data))
+        expected = self.table_contents()
+        self.assertTrue(expected['relation_people_films'])
+
+        for model in reversed(fixture_models()):
+            model.objects.all().delete()
+        with redirect_stdout(io.StringIO()):
+            BulkImporter(workers=2).import_data(data)
+        self.assertEqual(self.table_contents(), expected)
+
+
+class OrderingTests(FixtureTestCase):
+    """?ordering= sorts on the whitelist and keyset pages walk the same rows as page numbers"""
+
+    def names(self, url):
+        names = []
+        while url:
+            page = self.client.get(url, HTTP_ACCEPT='application/json').json()
+            names += [result['name'] for result in page['results']]
+            url = page['next']
+        return names
+
+    def test_numeric_ordering_puts_unknowns_last(self):
+        names = self.names('/api/v1/people/?ordering=-mass&page_size=15')
+        masses = dict(People.objects.values_list('name', 'mass_num'))
+        known = [masses[name] for name in names if masses[name] is not None]
+        self.assertEqual(known, sorted(known, reverse=True))
+        self.assertTrue(all(masses[name] is None for name in names[len(known):]))
+
+    def test_cursor_pages_match_page_numbers(self):
+        for ordering in ('name', '-mass', 'birth_year,-name', '-films_count'):
+            with self.subTest(ordering=ordering):
+                pages = self.names(f'/api/v1/people/?ordering={ordering}&page_size=15')
+                cursor = self.names(f'/api/v1/people/?ordering={ordering}&page_size=15&cursor=')
+                self.assertEqual(cursor, pages)
+                self.assertEqual(len(pages), People.objects.count())
+
+    def test_tampered_cursors_are_not_found(self):
+        url = '/api/v1/people/?ordering=name&cursor='
+        next_url = self.client.get(url, HTTP_ACCEPT='application/json').json()['next']
+        ordering, _ = decode_cursor(parse_qs(urlsplit(next_url).query)['cursor'][0])
+
+        def cursor(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        for value in ['garbage', cursor([]), cursor({'o': ordering, 'v': 5}), cursor({'o': ordering, 'v': 'ab'}),
+                      cursor({'o': 1, 'v': ['a', 1]}), cursor({'o': ordering, 'v': ['a']}),
+                      cursor({'o': ordering, 'v': [{'a': 1}, 1]}), cursor({'o': ordering, 'v': ['a', 'not an id']})]:
+            with self.subTest(cursor=value):
+                response = self.client.get(url + value, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 404)
+
+    def test_unknown_ordering_is_rejected(self):
+        response = self.client.get('/api/v1/people/?ordering=height_num', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class CountsTests(FixtureTestCase):
+    """?with_counts=1 and the stats endpoint agree with the relation tables"""
+
+    def test_with_counts_match_the_relations(self):
+        page = self.get('/api/v1/people/?with_counts=1&page_size=15')
+        self.assertEqual(len(page['results']), 15)
+        for person in page['results']:
+            pk = person['id']
+            self.assertEqual(person['counts'], {
+                'films': PeopleFilms.objects.filter(person=pk).count(),
+                'species': PeopleSpecies.objects.filter(person=pk).count(),
+                'starships': StarshipPilots.objects.filter(pilot=pk).count(),
+                'vehicles': VehiclePilots.objects.filter(pilot=pk).count(),
+            })
+        self.assertNotIn('counts', self.get('/api/v1/people/')['results'][0])
+
+    def test_stats_match_the_tables(self):
+        stats = self.get('/api/v1/stats/')
+        self.assertEqual(stats['people']['count'], People.objects.count())
+        self.assertEqual(sum(stats['people']['by_gender'].values()), People.objects.count())
+        self.assertEqual(
+            sum(stats['people']['by_homeworld'].values()) + stats['people']['without_homeworld'],
+            People.objects.count(),
+        )
+        self.assertEqual(sum(stats['starships']['by_class'].values()), Starships.objects.count())
+        self.assertEqual(
+            sum(stats['vehicles']['by_manufacturer'].values()), VehicleManufacturerRelations.objects.count()
+        )
+        self.assertEqual(
+            {film['title']: film['characters'] for film in stats['films']['by_film']},
+            {film.title: PeopleFilms.objects.filter(film=film).count() for film in Films.objects.all()},
+        )
+
+    def test_missing_homeworlds_do_not_collide_with_a_planet_named_unknown(self):
+        planet = Planets.objects.first()
+        Planets.objects.filter(pk=planet.pk).update(name='unknown')
+        ids = list(People.objects.order_by('id').values_list('id', flat=True)[:5])
+        People.objects.filter(pk__in=ids[:3]).update(homeworld=None)
+        People.objects.filter(pk__in=ids[3:]).update(homeworld=planet)
+
+        people = self.get('/api/v1/stats/')['people']
+        self.assertEqual(people['without_homeworld'], People.objects.filter(homeworld=None).count())
+        self.assertEqual(people['by_homeworld'].get('unknown'), People.objects.filter(homeworld=planet).count())
+
+
+class FragmentCacheTests(FixtureTestCase):
+    """Nested representations are assembled from per-entity fragments shared across pages"""
+
+    def test_fragments_match_the_serializers(self):
+        urls = ['/api/v1/films/', '/api/v1/planets/', '/api/v1/starships/?page=2']
+        expected = [self.get(url) for url in urls]
+        with override_settings(SWAPI_FRAGMENT_CACHE=True):
+            self.assertEqual([self.get(url) for url in urls], expected)
+            # The people fragments built for the films are reused by the planets.
+            with capture_sql() as statements:
+                self.assertEqual([self.get(url) for url in urls], expected)
+            self.assertTrue(statements)
+            self.assertFalse([sql for sql in statements if 'relation_people_eye_colors' in sql])
+
+    @override_settings(SWAPI_FRAGMENT_CACHE=True)
+    def test_fragments_follow_the_data_version(self):
+        def titles():
+            return {film['title'] for planet in self.get('/api/v1/planets/')['results'] for film in planet['films']}
+
+        before = titles()
+        Films.objects.update(title='Renamed')
+        self.assertEqual(titles(), before)
+        bump_data_version()
+        self.assertEqual(titles(), {'Renamed'})
+
+
+class SnapshotTests(FixtureTestCase):
+    """The snapshot holds the serializer output and follows rebuilds; without it the ORM serves"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'swapi.snapshot')
+
+    def build(self):
+        return build_snapshot(self.path, {
+            view.resource_name: (view.queryset.all(), view.serializer_class, view.search_field)
+            for view in RESOURCE_VIEWS
+        })
+
+    def test_documents_round_trip(self):
+        self.build()
+        reader = get_snapshot_reader(self.path)
+        for view in RESOURCE_VIEWS:
+            with self.subTest(resource=view.resource_name):
+                documents = reader.documents(view.resource_name)
+                expected = [
+                    json.loads(JSONRenderer().render(view.serializer_class(obj).data))
+                    for obj in view.queryset.all()
+                ]
+                self.assertEqual([json.loads(bytes(document)) for document in documents[:]], expected)
+
+    def test_pages_match_the_orm(self):
+        urls = ['/api/v1/people/', '/api/v1/starships/?page=2', '/api/v1/planets/?name=t&page_size=5']
+        expected = [self.get(url) for url in urls]
+        self.build()
+        with override_settings(SWAPI_SNAPSHOT_PATH=self.path), capture_sql() as statements:
+            self.assertEqual([self.get(url) for url in urls], expected)
+        self.assertFalse([sql for sql in statements if 'api_' in sql])
+
+    def test_ties_are_paged_like_the_orm(self):
+        People.objects.update(name='Clone')
+        urls = ['/api/v1/people/', '/api/v1/people/?page=3', '/api/v1/people/?page=5&page_size=15']
+        expected = [self.get(url) for url in urls]
+        self.build()
+        with override_settings(SWAPI_SNAPSHOT_PATH=self.path):
+            self.assertEqual([self.get(url) for url in urls], expected)
+
+    def test_rebuilt_file_is_reopened(self):
+        self.build()
+        before = get_snapshot_reader(self.path)
+        People.objects.filter(pk=People.objects.order_by('id').first().pk).update(name='Renamed')
+        self.build()
+        after = get_snapshot_reader(self.path)
+        self.assertIsNot(after, before)
+        self.assertIn('renamed', after.names('people'))
+        self.assertNotIn('renamed', before.names('people'))
+
+    def test_missing_or_corrupt_snapshot_falls_back_to_the_orm(self):
+        expected = self.get('/api/v1/people/')
+        self.build()
+        with open(self.path, 'rb') as file:
+            content = file.read()
+        for name, corrupt in [('missing', None), ('garbage', b'not a snapshot'), ('truncated', content[:200])]:
+            with self.subTest(name), override_settings(SWAPI_SNAPSHOT_PATH=self.path):
+                if corrupt is None:
+                    os.remove(self.path)
+                else:
+                    with open(self.path, 'wb') as file:
+                        file.write(corrupt)
+                with self.assertLogs('api.views', 'WARNING'):
+                    self.assertEqual(self.get('/api/v1/people/'), expected)
+
+
+class EntityStoreTests(FixtureTestCase):
+    """Nested relations answered from the entity store match the ORM ones"""
+
+    def serialize(self, view, context):
+        data = view.serializer_class(view.queryset.all(), many=True, context=context).data
+        return json.loads(JSONRenderer().render(data))
+
+    def test_every_resource_matches_the_orm(self):
+        store = EntityStore.build()
+        for view in RESOURCE_VIEWS:
+            with self.subTest(resource=view.resource_name):
+                expected = self.serialize(view, {})
+                self.assertEqual(len(expected), view.queryset.count())
+                self.assertEqual(self.serialize(view, {'entity_store': store}), expected)
+
+    def test_pages_match_the_orm(self):
+        urls = [f'/api/v1/{view.resource_name}/?page=2&page_size=5' for view in RESOURCE_VIEWS]
+        expected = [self.get(url) for url in urls]
+        with override_settings(SWAPI_ENTITY_STORE=True):
+            bump_data_version()
+            for url, page in zip(urls, expected):
+                with self.subTest(url=url):
+                    self.assertEqual(self.get(url), page)
+
+
+class RelationGraphTests(FixtureTestCase):
+    """The in-memory graph mirrors the junction tables; its views resolve `<type>:<id>` nodes"""
+
+    def setUp(self):
+        super().setUp()
+        # A new version, so get_graph() does not serve a graph of another test's rows.
+        bump_data_version()
+        self.graph = get_graph()
+
+    def node(self, node_type, pk):
+        return self.graph.node(node_type, pk)
+
+    def test_csr_arrays_hold_every_relation_both_ways(self):
+        graph = self.graph
+        self.assertEqual(len(graph), sum(model.objects.count() for model, _ in NODE_MODELS.values()))
+        self.assertEqual(len(graph.neighbours), 2 * sum(model.objects.count() for model, *_ in EDGE_MODELS))
+        self.assertEqual(list(graph.offsets), sorted(graph.offsets))
+        for node in range(len(graph)):
+            neighbours = list(graph.adjacent(node))
+            self.assertEqual(neighbours, sorted(neighbours))
+            for neighbour in neighbours:
+                self.assertIn(node, graph.adjacent(neighbour))
+
+        person = People.objects.order_by('id').first()
+        node = self.node('people', person.pk)
+        self.assertEqual(graph.describe(node), {'type': 'people', 'id': person.pk, 'name': person.name})
+        self.assertEqual(
+            [graph.ids[film] for film in graph.adjacent(node, 'films')],
+            sorted(PeopleFilms.objects.filter(person=person).values_list('film_id', flat=True)),
+        )
+        self.assertIsNone(self.node('people', 10 ** 9))
+
+    def test_co_appearances_count_the_shared_films(self):
+        person = People.objects.order_by('id').first()
+        films = PeopleFilms.objects.filter(person=person).values('film')
+        expected = {}
+        for other in PeopleFilms.objects.filter(film__in=films).exclude(person=person).values_list('person', flat=True):
+            expected[other] = expected.get(other, 0) + 1
+
+        co_appearances = self.graph.co_appearances(self.node('people', person.pk))
+        self.assertEqual({self.graph.ids[other]: shared for other, shared in co_appearances}, expected)
+        self.assertEqual([shared for _, shared in co_appearances], sorted(expected.values(), reverse=True))
+
+    def test_shortest_paths(self):
+        link = PeopleFilms.objects.order_by('id').first()
+        person, film = self.node('people', link.person_id), self.node('films', link.film_id)
+        self.assertEqual(self.graph.shortest_path(person, person), [person])
+        self.assertEqual(self.graph.shortest_path(person, film), [person, film])
+
+        other = PeopleFilms.objects.filter(film=link.film_id).exclude(person=link.person_id).first()
+        path = self.graph.shortest_path(person, self.node('people', other.person_id))
+        self.assertEqual(len(path), 3)
+        self.assertEqual(self.graph.node_type(path[1]), 'films')
+
+        # Two linked nodes and an isolated one: 0 - 1, 2.
+        graph = RelationGraph(
+            {'people': (0, 3)}, array('q', [1, 2, 3]), ['a', 'b', 'c'], array('I', [0, 1, 2, 2]), array('I', [1, 0]),
+        )
+        self.assertEqual(graph.shortest_path(1, 0), [1, 0])
+        self.assertIsNone(graph.shortest_path(0, 2))
+
+    def test_node_parameters(self):
+        person = People.objects.order_by('id').first()
+        cases = {
+            f'neighbours/?node=people:{person.pk}&type=films': 200,
+            f'co-appearances/?node=people:{person.pk}': 200,
+            f'path/?from=people:{person.pk}&to=people:{person.pk}': 200,
+            'neighbours/?node=people:abc': 404,
+            'neighbours/?node=people:%C2%B2': 404,
+            'neighbours/?node=people:-1': 404,
+            'neighbours/?node=people:': 404,
+            f'neighbours/?node=people:{10 ** 30}': 404,
+            'neighbours/?node=ships:1': 400,
+            'neighbours/': 400,
+            f'neighbours/?node=people:{person.pk}&type=ships': 400,
+        }
+        for url, status in cases.items():
+            with self.subTest(url=url):
+                response = self.client.get(f'/api/v1/graph/{url}', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, status)
+
+
+@override_settings(SWAPI_RESPONSE_CACHE=True)
+class WarmCacheTests(FixtureTestCase):
+    """warm_cache leaves every page of the warmed queries in the response cache"""
+
+    def test_warmed_pages_are_served_from_the_cache(self):
+        output = io.StringIO()
+        call_command('warm_cache', origin='http://testserver', query=['name=1'], stdout=output)
+        pages = math.ceil(People.objects.count() / 10)
+        filtered = math.ceil(People.objects.filter(name__icontains='1').count() / 10)
+        # The filtered query stops at its own last page.
+        self.assertIn(f"Warmed {2 * pages + filtered} pages of people", output.getvalue())
+
+        urls = [
+            '/api/v1/people/', f'/api/v1/people/?page={pages}', f'/api/v1/people/?with_counts=1&page={pages}',
+            f'/api/v1/people/?name=1&page={filtered}', '/api/v1/films/?with_counts=1',
+        ]
+        with capture_sql() as statements:
+            for url in urls:
+                self.get(url)
+        self.assertEqual(statements, [])
+
+        with capture_sql() as statements:
+            self.get('/api/v1/people/?ordering=-mass')
+        self.assertTrue(statements)
+
+    @override_settings(SWAPI_THROTTLE_RATE=1, SWAPI_THROTTLE_BURST=20, SWAPI_ADMISSION_CAPACITY=1)
+    def test_warm_up_is_not_throttled(self):
+        call_command('warm_cache', origin='http://testserver', stdout=io.StringIO())
+        # Nor did it spend the clients' tokens.
+        self.assertEqual(self.client.get('/api/v1/films/', HTTP_ACCEPT='application/json').status_code, 200)
+
+
+class CompressionTests(SimpleTestCase):
+    """Cached bodies are compressed once and negotiated per request"""
+
+    def setUp(self):
+        self.bodies = compress(b'{"results": [' + b'{"name": "Luke Skywalker"},' * 50 + b'{}]}')
+
+    def test_every_encoding_round_trips(self):
+        self.assertEqual(gzip.decompress(self.bodies['gzip']), self.bodies[IDENTITY])
+        self.assertLess(len(self.bodies['gzip']), len(self.bodies[IDENTITY]))
+
+    def test_negotiation_follows_q_values(self):
+        self.assertEqual(negotiate('gzip', self.bodies)[0], 'gzip')
+        self.assertEqual(negotiate('gzip;q=0, *;q=0', self.bodies)[0], IDENTITY)
+        self.assertEqual(negotiate('', self.bodies)[0], IDENTITY)
+        self.assertEqual(negotiate('identity', self.bodies)[0], IDENTITY)
+        self.assertEqual(negotiate('*', self.bodies)[0], next(iter(COMPRESSORS)))
+
+    def test_small_bodies_are_not_compressed(self):
+        self.assertEqual(compress(b'{}'), {IDENTITY: b'{}'})
+
+    def test_pages_with_a_csrf_token_are_not_compressed(self):
+        # BREACH: a secret in a compressed body leaks through its length.
+        response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'csrfmiddlewaretoken', response.content)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class SchemaDocumentTests(SimpleTestCase):
+    """The schema is generated once and revalidated with its ETag"""
+
+    def test_conditional_requests(self):
+        response = self.client.get('/api/v1/swagger.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/people/', response.json()['paths'])
+
+        cached = self.client.get('/api/v1/swagger.json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(self.client.get('/api/v1/swagger.yaml')['Content-Type'], 'application/yaml')
+
+    def test_schema_describes_the_serializers(self):
+        schema = self.client.get('/api/v1/swagger.json').json()
+        self.assertTrue({'FilmDetail', 'PersonDetail', 'PlanetDetail'} <= schema['definitions'].keys())
+        response = schema['paths']['/people/']['get']['responses']['200']
+        self.assertEqual(response['schema']['properties']['results']['items'], {'$ref': '#/definitions/PersonDetail'})
+        parameters = {parameter['name'] for parameter in schema['paths']['/people/']['get']['parameters']}
+        self.assertTrue({'with_counts', 'ordering', 'cursor', 'name'} <= parameters)
+
+
+class ThrottlingTests(TestCase):
+    """Clients spend tokens by request cost; overloaded workers shed expensive uncached work"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1000.0
+        patcher = mock.patch.object(CostThrottle, 'timer', lambda throttle: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, url):
+        return self.client.get(url, HTTP_ACCEPT='application/json')
+
+    @override_settings(SWAPI_THROTTLE_RATE=1, SWAPI_THROTTLE_BURST=60)
+    def test_expensive_requests_spend_more_tokens(self):
+        self.assertEqual(self.get('/api/v1/films/').status_code, 200)
+        response = self.get('/api/v1/films/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], str(FilmsAPIView.request_costs['page'] - 5))
+        # The five tokens left still pay for cheap requests.
+        for _ in range(5):
+            self.assertEqual(self.get('/api/v1/stats/').status_code, 200)
+        self.assertEqual(self.get('/api/v1/stats/').status_code, 429)
+
+        self.now += FilmsAPIView.request_costs['page']
+        self.assertEqual(self.get('/api/v1/films/').status_code, 200)
+
+    @override_settings(SWAPI_ADMISSION_CAPACITY=20, SWAPI_ADMISSION_CHEAP_COST=10, SWAPI_RESPONSE_CACHE=False)
+    def test_overload_sheds_expensive_requests_first(self):
+        with admission.admit(5):
+            response = self.get('/api/v1/films/')
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+            self.assertEqual(self.get('/api/v1/planets/').status_code, 200)
+        self.assertEqual(self.get('/api/v1/films/').status_code, 200)
+        self.assertEqual(admission.in_flight, 0)
+
+    @override_settings(SWAPI_ADMISSION_CAPACITY=20, SWAPI_RESPONSE_CACHE=True)
+    def test_overload_still_serves_cached_pages(self):
+        self.assertEqual(self.get('/api/v1/films/').status_code, 200)
+        with admission.admit(5):
+            self.assertEqual(self.get('/api/v1/films/').status_code, 200)
+            # Outdated by an import: the previous version is served instead.
+            bump_data_version()
+            self.assertEqual(self.get('/api/v1/films/').status_code, 200)
+            self.assertEqual(self.get('/api/v1/films/?page_size=5').status_code, 503)
+
+
+class ProductionSettingsTests(SimpleTestCase):
+    """core.settings.production, loaded under a given environment"""
+
+    def load(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            import core.settings.production as production
+            self.addCleanup(importlib.reload, production)
+            return importlib.reload(production)
+
+    def test_connections_run_the_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            production = self.load(SWAPI_DB_PATH=os.path.join(directory, 'db.sqlite3'), SWAPI_REPLICA_PATHS='')
+            databases = ConnectionHandler().configure_settings(copy.deepcopy(production.DATABASES))
+            # Aliases unknown to the test runner, so it lets them connect.
+            primary, replica = (
+                load_backend(databases[alias]['ENGINE']).DatabaseWrapper(databases[alias], f'production_{alias}')
+                for alias in ('default', 'replica_0')
+            )
+            try:
+                with primary.cursor() as cursor:
+                    self.assertEqual(cursor.execute('PRAGMA journal_mode').fetchone(), ('wal',))
+                    self.assertEqual(cursor.execute('PRAGMA synchronous').fetchone(), (1,))  # NORMAL
+                with replica.cursor() as cursor:
+                    self.assertEqual(cursor.execute('PRAGMA query_only').fetchone(), (1,))
+                    with self.assertRaises(DatabaseError):
+                        cursor.execute('CREATE TABLE written (id integer)')
+            finally:
+                primary.close()
+                replica.close()
+
+    def test_debug_is_off_and_hosts_follow_the_public_origin(self):
+        production = self.load(SWAPI_PUBLIC_ORIGIN='https://swapi.example.org', SWAPI_ALLOWED_HOSTS='')
+        self.assertFalse(production.DEBUG)
+        self.assertEqual(production.ALLOWED_HOSTS, ['swapi.example.org'])
+        production = self.load(SWAPI_ALLOWED_HOSTS='swapi.example.org, api.example.org')
+        self.assertEqual(production.ALLOWED_HOSTS, ['swapi.example.org', 'api.example.org'])
+
+
+@override_settings(SWAPI_PRIMARY_DATABASE='default', SWAPI_READ_DATABASES=['replica_a', 'replica_b'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """Reads go to one replica per request, writes to the primary"""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        reset_read_database()
+        self.addCleanup(reset_read_database)
+
+    def test_reads_go_to_the_replicas_and_writes_to_the_primary(self):
+        self.assertIn(People.objects.all().db, ['replica_a', 'replica_b'])
+        self.assertEqual(self.router.db_for_write(People), 'default')
+        # Only the api models are routed.
+        self.assertIsNone(self.router.db_for_read(ContentType))
+        self.assertFalse(self.router.allow_migrate('replica_a', 'api'))
+        self.assertIsNone(self.router.allow_migrate('default', 'api'))
+
+    def test_reads_stick_to_one_replica_until_the_next_request(self):
+        first = self.router.db_for_read(People)
+        self.assertEqual({self.router.db_for_read(model) for model in (People, Films, Planets)}, {first})
+        request_started.send(sender=self.__class__)
+        second = self.router.db_for_read(People)
+        self.assertEqual({first, second}, {'replica_a', 'replica_b'})
+
+    def test_use_primary_pins_reads_until_the_block_ends(self):
+        replica = self.router.db_for_read(People)
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(People), 'default')
+            with use_primary():
+                pass
+            self.assertEqual(self.router.db_for_read(People), 'default')
+        self.assertEqual(self.router.db_for_read(People), replica)
+
+
+class SyncReplicasTests(SimpleTestCase):
+    """sync_replicas() copies the primary file into each replica file with the backup API"""
+    aliases = ['sync_primary', 'sync_replica', 'sync_same_file']
+    # The aliases only exist from setUpClass on, after the runner checked the names.
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        files = ['primary.sqlite3', 'replica.sqlite3', 'primary.sqlite3']
+        for alias, name in zip(cls.aliases, files):
+            database = copy.deepcopy(connections.settings['default'])
+            database['NAME'] = os.path.join(cls.directory.name, name)
+            connections.settings[alias] = database
+        super().setUpClass()
+        cls.enterClassContext(override_settings(
+            SWAPI_PRIMARY_DATABASE='sync_primary',
+            SWAPI_READ_DATABASES=['sync_replica', 'sync_same_file'],
+        ))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in cls.aliases:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        cls.directory.cleanup()
+
+    def replica_rows(self):
+        replica = sqlite3.connect(connections['sync_replica'].settings_dict['NAME'])
+        try:
+            return replica.execute('SELECT name FROM planets ORDER BY name').fetchall()
+        finally:
+            replica.close()
+
+    def test_replicas_receive_the_primary_file(self):
+        with connections['sync_primary'].cursor() as cursor:
+            cursor.execute('CREATE TABLE planets (name TEXT)')
+            cursor.executemany('INSERT INTO planets VALUES (%s)', [('Tatooine',), ('Hoth',)])
+
+        # The alias on the primary's own file is left alone.
+        self.assertEqual(sync_replicas(), ['sync_replica'])
+        self.assertEqual(self.replica_rows(), [('Hoth',), ('Tatooine',)])
+
+        with connections['sync_primary'].cursor() as cursor:
+            cursor.execute('DELETE FROM planets WHERE name = %s', ['Hoth'])
+        sync_replicas()
+        self.assertEqual(self.replica_rows(), [('Tatooine',)])
+
+
+class DatasetSwapTests(SimpleTestCase):
+    """Imports build a new dataset file that only replaces the active one once it validates"""
+    alias = 'dataset_test'
+    # The alias only exists from setUpClass on, after the runner checked the names.
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        # A file database of its own: the swap closes and repoints its connections.
+        database = copy.deepcopy(connections.settings['default'])
+        database['NAME'] = os.path.join(cls.directory.name, 'initial.sqlite3')
+        connections.settings[cls.alias] = database
+        super().setUpClass()
+        cls.enterClassContext(override_settings(
+            SWAPI_DATASET_DIR=cls.directory.name,
+            SWAPI_PRIMARY_DATABASE=cls.alias,
+            SWAPI_READ_DATABASES=[cls.alias],
+        ))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[cls.alias].close()
+        del connections[cls.alias]
+        del connections.settings[cls.alias]
+        cls.directory.cleanup()
+
+    def import_dataset(self, data):
+        with staged_dataset() as path, redirect_stdout(io.StringIO()):
+            BulkImporter().import_data(data)
+            validate_dataset(data)
+        activate_dataset(path)
+        return path
+
+    def test_validated_import_becomes_active(self):
+        first = self.import_dataset(generate_swapi_data(scale=1, seed=1))
+        self.assertEqual(get_active_dataset(), first)
+        data = generate_swapi_data(scale=2, seed=2)
+        second = self.import_dataset(data)
+
+        self.assertEqual(get_active_dataset(), second)
+        self.assertEqual(connections[self.alias].settings_dict['NAME'], second)
+        self.assertEqual(People.objects.using(self.alias).count(), len(data['people']))
+        # The previous dataset is kept to switch back to.
+        self.assertEqual(list_datasets(), [first, second])
+
+    def test_switch_is_pinned_per_thread(self):
+        first = self.import_dataset(generate_swapi_data(scale=1, seed=1))
+        names, started, switched = [], threading.Event(), threading.Event()
+
+        def reader():
+            try:
+                follow_active_dataset()
+                names.append(connections[self.alias].settings_dict['NAME'])
+                started.set()
+                switched.wait(10)
+                # Until its next request, the thread stays on the dataset it started with.
+                names.append(connections[self.alias].settings_dict['NAME'])
+                follow_active_dataset()
+                names.append(connections[self.alias].settings_dict['NAME'])
+                names.append(People.objects.using(self.alias).count())
+            finally:
+                connections.close_all()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        started.wait(10)
+        data = generate_swapi_data(scale=2, seed=2)
+        second = self.import_dataset(data)
+        switched.set()
+        thread.join()
+
+        self.assertEqual(names, [first, first, second, len(data['people'])])
+        # The process-wide settings keep the configured file.
+        self.assertEqual(connections.settings[self.alias]['NAME'], os.path.join(self.directory.name, 'initial.sqlite3'))
+
+    def test_switch_rebuilds_the_snapshot(self):
+        first = self.import_dataset(generate_swapi_data(scale=1, seed=1))
+        self.import_dataset(generate_swapi_data(scale=2, seed=2))
+        path = os.path.join(self.directory.name, 'swapi.snapshot')
+        with override_settings(SWAPI_SNAPSHOT_PATH=path, SWAPI_RESPONSE_CACHE=False):
+            call_command('build_snapshot', stdout=io.StringIO())
+            call_command('switch_dataset', os.path.basename(first), stdout=io.StringIO())
+        self.assertEqual(get_snapshot_reader(path).resource('people')['count'], People.objects.using(self.alias).count())
+
+    def test_invalid_import_leaves_active_dataset(self):
+        active = self.import_dataset(generate_swapi_data(scale=1, seed=1))
+        count = People.objects.using(self.alias).count()
+        data = generate_swapi_data(scale=2, seed=2)
+
+        with self.assertRaises(DatasetError):
+            with staged_dataset(), redirect_stdout(io.StringIO()):
+                BulkImporter().import_data(data)
+                People.objects.using(self.alias).filter(pk__lte=5).delete()
+                validate_dataset(data)
+
+        self.assertEqual(get_active_dataset(), active)
+        self.assertEqual(list_datasets()[-1], active)
+        self.assertEqual(People.objects.using(self.alias).count(), count)
+
+
+class EndpointBudgetTests(FixtureTestCase):
+    """First pages of the endpoints on the committed fixture stay within their query budgets"""
+
+    # Path -> queries of a page rendered from the database. The latencies are
+    # checked by `manage.py benchmark_fixture`, outside the test run.
+    BUDGETS = {
+        '/api/v1/films/': 496,
+        '/api/v1/people/': 216,
+        '/api/v1/planets/': 69,
+        '/api/v1/species/': 94,
+        '/api/v1/vehicles/': 69,
+        '/api/v1/starships/': 69,
+        '/api/v1/people/?with_counts=1': 216,
+        '/api/v1/people/?ordering=-films_count': 195,
+        '/api/v1/stats/': 0,
+        '/api/v1/graph/neighbours/?node=people:1': 0,
+        '/api/v1/graph/path/?from=people:1&to=planets:2': 0,
+    }
+
+    # Path -> queries once the fragment cache holds the nested entities
+    FRAGMENT_QUERIES = {
+        '/api/v1/films/': 32,
+        '/api/v1/people/': 125,
+        '/api/v1/planets/': 42,
+        '/api/v1/species/': 70,
+        '/api/v1/vehicles/': 42,
+        '/api/v1/starships/': 42,
+    }
+
+    def queries(self, url):
+        """Statements of `url` once the per-process caches are warm"""
+        self.get(url)
+        with capture_sql() as statements:
+            self.get(url)
+        return len(statements)
+
+    def test_query_budgets(self):
+        for url, queries in self.BUDGETS.items():
+            with self.subTest(url=url):
+                self.assertLessEqual(self.queries(url), queries)
+
+    @override_settings(SWAPI_FRAGMENT_CACHE=True)
+    def test_fragment_cache_query_budgets(self):
+        for url, queries in self.FRAGMENT_QUERIES.items():
+            with self.subTest(url=url):
+                self.assertLessEqual(self.queries(url), queries)
+
+    def test_fixture_reloads(self):
+        for model in reversed(fixture_models()):
+            model.objects.all().delete()
+        rows = load_fixture()
+        self.assertEqual(People.objects.count(), 82)
+        self.assertGreater(rows, 1000)
@@ -0,0 +1,129 @@
+"""
+Throttling and admission control weighted by what a request costs.
+
+Every view states the cost of its requests in tokens, measured per query
+shape with `manage.py measure_request_costs`. Clients spend tokens from a
+bucket that refills at SWAPI_THROTTLE_RATE, so one film page with nested
+relations counts as much as fifty graph lookups. Independently, each
+process admits uncached work only while the cost in flight stays under
+SWAPI_ADMISSION_CAPACITY, shedding the expensive requests first.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+# Cost of a request to a view without `get_request_cost`
+DEFAULT_COST = 1
+
+
+def request_cost(request, view):
+    """Tokens `request` costs, as estimated by its view"""
+    get_request_cost = getattr(view, 'get_request_cost', None)
+    return get_request_cost(request) if get_request_cost is not None else DEFAULT_COST
+
+
+# =============================================================================
+# THROTTLING - Token bucket per client
+# =============================================================================
+
+class CostThrottle(BaseThrottle):
+    """
+    Token bucket per client IP, charged the cost of each request.
+
+    The bucket holds up to SWAPI_THROTTLE_BURST tokens and refills at
+    SWAPI_THROTTLE_RATE tokens a second. A request costing more than the
+    bucket holds is charged the full bucket, so it is slow but possible.
+    Disabled while the rate is None.
+    """
+    cache = default_cache
+    cache_format = 'swapi:throttle:{ident}'
+    # The clock, replaced by tests
+    timer = time.time
+
+    def __init__(self):
+        self.rate = settings.SWAPI_THROTTLE_RATE
+        self.burst = settings.SWAPI_THROTTLE_BURST
+        self.wait_time = None
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        key = self.cache_format.format(ident=self.get_ident(request))
+        cost = min(request_cost(request, view), self.burst)
+        now = self.timer()
+        tokens, updated = self.cache.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        else:
+            self.wait_time = (cost - tokens) / self.rate
+        # An untouched bucket refills completely in burst / rate seconds.
+        self.cache.set(key, (tokens, now), math.ceil(self.burst / self.rate))
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+# =============================================================================
+# ADMISSION CONTROL - Load shedding per process
+# =============================================================================
+
+class Overloaded(APIException):
+    status_code = 503
+    default_detail = 'The server is overloaded, retry shortly.'
+    default_code = 'overloaded'
+    # Seconds sent as Retry-After by the DRF exception handler
+    wait = 1
+
+
+class AdmissionControl:
+    """
+    Cost of the uncached requests in flight in this process.
+
+    A request is admitted while the cost in flight, its own included, stays
+    under SWAPI_ADMISSION_CAPACITY. Requests costing more than
+    SWAPI_ADMISSION_CHEAP_COST only get SWAPI_ADMISSION_EXPENSIVE_SHARE of
+    it, so under overload they are shed first and the rest of the capacity
+    stays free for cheap requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def limit(self, cost):
+        capacity = settings.SWAPI_ADMISSION_CAPACITY
+        if cost <= settings.SWAPI_ADMISSION_CHEAP_COST:
+            return capacity
+        return capacity * settings.SWAPI_ADMISSION_EXPENSIVE_SHARE
+
+    @contextmanager
+    def admit(self, cost):
+        """Run the block as `cost` in flight, or raise Overloaded"""
+        if settings.SWAPI_ADMISSION_CAPACITY is None:
+            yield
+            return
+
+        with self._lock:
+            # A request is always admitted into an idle process.
+            if self.in_flight and self.in_flight + cost > self.limit(cost):
+                raise Overloaded()
+            self.in_flight += cost
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= cost
+
+
+admission = AdmissionControl()
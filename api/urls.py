@@ -1,25 +1,10 @@
 from django.conf import settings
 from django.urls import path, re_path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
 
 from api import views
 
 app_name = "api"
 
-SchemaView = get_schema_view(
-    openapi.Info(
-        title="Star Wars API",
-        default_version='v1',
-        description="A Star Wars API with all your favorite characters, planets, starships and more!",
-        contact=openapi.Contact(email="v.geroutskis@gmail.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny, ],
-)
-
 urlpatterns = [
     path(
         'people/',
@@ -51,23 +36,50 @@ urlpatterns = [
         views.VehiclesAPIView.as_view(),
         name='vehicles',
     ),
+    path(
+        'stats/',
+        views.StatsAPIView.as_view(),
+        name='stats',
+    ),
+    path(
+        'graph/neighbours/',
+        views.GraphNeighboursAPIView.as_view(),
+        name='graph-neighbours',
+    ),
+    path(
+        'graph/co-appearances/',
+        views.GraphCoAppearancesAPIView.as_view(),
+        name='graph-co-appearances',
+    ),
+    path(
+        'graph/path/',
+        views.GraphPathAPIView.as_view(),
+        name='graph-path',
+    ),
 ]
 
 if settings.ENABLE_SWAGGER:
+    # Imported here: drf_yasg and the schema generator are a sizeable part
+    # of the startup time of workers that do not serve the docs.
+    from api.swagger.schema import DocsPageView, document_views
+    from api.swagger.views import schema_document
+
+    document_views()
+
     urlpatterns += [
         re_path(
             r"^swagger(?P<format>\.json|\.yaml)$",
-            SchemaView.without_ui(cache_timeout=0),
+            schema_document,
             name="schema-json",
         ),
         re_path(
             r"^swagger/$",
-            SchemaView.with_ui("swagger", cache_timeout=0),
+            DocsPageView.with_ui("swagger", cache_timeout=0),
             name="schema-swagger-ui",
         ),
         re_path(
             r"^redoc/$",
-            SchemaView.with_ui("redoc", cache_timeout=0),
+            DocsPageView.with_ui("redoc", cache_timeout=0),
             name="schema-redoc",
         ),
     ]
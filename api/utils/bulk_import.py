@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+from api.routers import use_primary
+from api.models import Films, Planets, People, Species, Vehicles, Starships
+from api.utils.lookups import LOOKUPS, LookupResolver
+from api.utils.relations import sync_relation
+from api.utils.rows import ENTITY_RELATIONS, RELATIONS, lookup_names, prepare
+
+BATCH_SIZE = 500
+
+# Resources in the order they are written, dependencies first
+ENTITIES = {
+    'films': Films,
+    'planets': Planets,
+    'species': Species,
+    'people': People,
+    'vehicles': Vehicles,
+    'starships': Starships,
+}
+
+# Foreign keys of the entity rows: resource -> {field: lookup or resource}
+FOREIGN_KEYS = {
+    'planets': {'climate': 'climates', 'terrain': 'terrains'},
+    'species': {'homeworld': 'planets'},
+    'people': {'homeworld': 'planets'},
+    'vehicles': {'vehicle_class': 'vehicle_classes'},
+    'starships': {'starship_class': 'starship_classes'},
+}
+
+class BulkImporter:
+    """
+    Import mode that prepares the resources in parallel and writes them in bulk.
+
+    The row preparation of every resource is independent, so `workers`
+    processes build the row batches (see `api.utils.rows`) while this
+    process is the single writer: it resolves the static lookups, then
+    inserts the entities in dependency order and finally the relations,
+    all in one transaction. Like the sequential parser, existing entities
+    are left untouched, their relations to other entities are synced with
+    the payload and their static values only get missing ones added.
+    """
+
+    def __init__(self, workers=1):
+        self.workers = workers
+
+    def import_data(self, data):
+        batches = self.prepare(data)
+        with use_primary(), transaction.atomic(using=settings.SWAPI_PRIMARY_DATABASE):
+            lookups = self.write_lookups(data)
+            created = self.write_entities(batches, lookups)
+            self.write_relations(batches, lookups, created)
+
+    def prepare(self, data):
+        """Rows and relations per resource, prepared in parallel"""
+        resources = list(ENTITIES)
+        items = [data.get(resource, []) for resource in resources]
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return dict(zip(resources, pool.map(prepare, resources, items)))
+        return dict(zip(resources, map(prepare, resources, items)))
+
+    def write_lookups(self, data):
+        """Name -> id of every static value, creating the missing ones"""
+        resolver = LookupResolver()
+        for lookup, count in resolver.ensure(lookup_names(data)).items():
+            if count:
+                print(f"Created {count} {LOOKUPS[lookup][0]._meta.verbose_name_plural.lower()}")
+        return {lookup: resolver.ids(lookup) for lookup in LOOKUPS}
+
+    def write_entities(self, batches, lookups):
+        """Insert the new entities in dependency order; returns the new ids per resource"""
+        created = {}
+        for resource, model in ENTITIES.items():
+            rows = batches[resource][0]
+            existing = set(model.objects.filter(id__in=rows).values_list('id', flat=True))
+            foreign_keys = FOREIGN_KEYS.get(resource, {})
+
+            objects = []
+            for pk, row in rows.items():
+                if pk in existing:
+                    continue
+                row = dict(row)
+                for field, target in foreign_keys.items():
+                    value = row.pop(field)
+                    if target in LOOKUPS:
+                        row[f'{field}_id'] = lookups[target].get(value)
+                    else:
+                        row[f'{field}_id'] = value if value in batches[target][0] else None
+                objects.append(model(id=pk, **row))
+
+            model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+            created[resource] = {obj.id for obj in objects}
+            print(f"Created {len(objects)} {resource}")
+        return created
+
+    def write_relations(self, batches, lookups, created):
+        """Sync the relations between entities; static values are only added to new entities"""
+        for relation, (model_name, source_field, source, target_field, target) in RELATIONS.items():
+            model = apps.get_model('api', model_name)
+            pairs = batches[source][1].get(relation, [])
+            if relation in ENTITY_RELATIONS:
+                sources, targets = batches[source][0], batches[target][0]
+                links = [(pk, target_pk) for pk, target_pk in pairs if pk in sources and target_pk in targets]
+                inserted, deleted = sync_relation(model, source_field, target_field, links, sources, targets)
+                if inserted or deleted:
+                    print(f"Synced {relation}: {inserted} added, {deleted} removed")
+                continue
+
+            sources, targets = created[source], lookups[target]
+            links = {(pk, targets[name]) for pk, name in pairs if pk in sources}
+            model.objects.bulk_create(
+                [model(**{f'{source_field}_id': pk, f'{target_field}_id': target_pk}) for pk, target_pk in sorted(links)],
+                batch_size=BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+        print("All relationships created successfully!")
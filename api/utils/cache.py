@@ -0,0 +1,219 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.utils.lru import LRUCache
+
+DATA_VERSION_KEY = 'swapi:data-version'
+# Entries hold every encoding of a page (see api.utils.compression)
+RESPONSE_KEY = 'swapi:response-bodies:{digest}'
+
+# How long a request recomputing an entry blocks others from doing the same
+LOCK_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+
+# =============================================================================
+# DATA VERSION
+# =============================================================================
+
+# Last data version read by this process: (version, monotonic time)
+_version = None
+
+
+def get_data_version():
+    """
+    Version of the imported dataset.
+
+    Every cache key derived from API data includes it, so bumping the
+    version after an import invalidates all of them at once, in the shared
+    cache and in every process's local cache. A process trusts its last
+    read for SWAPI_DATA_VERSION_TTL seconds.
+    """
+    global _version
+
+    if _version is not None and time.monotonic() - _version[1] < settings.SWAPI_DATA_VERSION_TTL:
+        return _version[0]
+
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        # Racing processes agree on whichever version was added first.
+        cache.add(DATA_VERSION_KEY, _new_version(), None)
+        version = cache.get(DATA_VERSION_KEY)
+    _version = (version, time.monotonic())
+    return version
+
+
+def bump_data_version():
+    """Start a new data version after an import"""
+    global _version
+
+    version = _new_version()
+    cache.set(DATA_VERSION_KEY, version, None)
+    _version = (version, time.monotonic())
+    return version
+
+
+def _new_version():
+    return f"{time.time_ns():x}"
+
+
+# =============================================================================
+# LOCAL CACHE - Per-process tier in front of the shared cache
+# =============================================================================
+
+_local_lock = threading.Lock()
+_local_cache = None
+
+
+def get_local_cache():
+    """LRU of this process, or None when SWAPI_LOCAL_CACHE_SIZE is 0"""
+    global _local_cache
+
+    max_size = settings.SWAPI_LOCAL_CACHE_SIZE
+    if not max_size:
+        return None
+    if _local_cache is None or _local_cache.max_size != max_size:
+        with _local_lock:
+            if _local_cache is None or _local_cache.max_size != max_size:
+                _local_cache = LRUCache(max_size)
+    return _local_cache
+
+
+def get_cached(key):
+    """
+    Value of `key` from the local cache, else from the shared cache.
+
+    For keys that embed the data version, whose values never change.
+    """
+    local = get_local_cache()
+    if local is not None:
+        value = local.get(key)
+        if value is not None:
+            return value
+    value = cache.get(key)
+    if value is not None and local is not None:
+        local.set(key, value)
+    return value
+
+
+def set_cached(key, value, timeout=None):
+    """Store `value` in both tiers"""
+    cache.set(key, value, timeout)
+    local = get_local_cache()
+    if local is not None:
+        local.set(key, value)
+
+
+def get_many_cached(keys):
+    """Key -> value of the `keys` found in either tier, with one shared cache round trip"""
+    local = get_local_cache()
+    found = {}
+    if local is not None:
+        for key in keys:
+            value = local.get(key)
+            if value is not None:
+                found[key] = value
+    missing = [key for key in keys if key not in found]
+    if missing:
+        shared = cache.get_many(missing)
+        if local is not None:
+            for key, value in shared.items():
+                local.set(key, value)
+        found.update(shared)
+    return found
+
+
+def set_many_cached(values, timeout=None):
+    """Store every key -> value of `values` in both tiers"""
+    cache.set_many(values, timeout)
+    local = get_local_cache()
+    if local is not None:
+        for key, value in values.items():
+            local.set(key, value)
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+def response_cache_key(request):
+    """
+    Cache key of a rendered API response.
+
+    Built from the absolute URL with the query parameters sorted, so
+    `?page=2&name=a` and `?name=a&page=2` share an entry, and from the
+    negotiated media type. The key is the same across data versions so
+    the previous version's entry can be served while it is recomputed.
+    """
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    url = f"{request.build_absolute_uri(request.path)}?{query}"
+    digest = hashlib.sha1(f"{url} {request.accepted_media_type}".encode()).hexdigest()
+    return RESPONSE_KEY.format(digest=digest)
+
+
+def single_flight(key, compute, timeout=None):
+    """
+    Cached value of `key` for the current data version, computed once.
+
+    Entries are stored as (data version, expiry, value). When the entry is
+    missing, expired or from an older version, the first caller takes a
+    lock in the shared cache and recomputes it. Concurrent callers get the
+    stale value if there is one (stale-while-revalidate), otherwise they
+    wait for the first caller's result instead of recomputing it as well.
+
+    `timeout` is the number of seconds an entry stays fresh, or None to
+    keep it until the next import. Fresh entries are also kept in the
+    local cache, which is checked first; stale ones only in the shared
+    cache, so a process sees the recomputed entry as soon as it is there.
+    """
+    version = get_data_version()
+    local = get_local_cache()
+    if local is not None:
+        entry = local.get(key)
+        if _is_fresh(entry, version):
+            return entry[2]
+
+    entry = cache.get(key)
+    if _is_fresh(entry, version):
+        if local is not None:
+            local.set(key, entry)
+        return entry[2]
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, version, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            expires = time.time() + timeout if timeout is not None else None
+            set_cached(key, (version, expires, value))
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return entry[2]
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if _is_fresh(entry, version):
+            return entry[2]
+        if cache.get(lock_key) is None:
+            # The computing request failed; try for ourselves.
+            break
+    return compute()
+
+
+def cached_value(key):
+    """Value of `key` whatever its version or expiry, or None"""
+    entry = cache.get(key)
+    return entry[2] if entry is not None else None
+
+
+def _is_fresh(entry, version):
+    return entry is not None and entry[0] == version and (entry[1] is None or entry[1] > time.time())
@@ -0,0 +1,75 @@
+"""
+Precompressed response bodies.
+
+A cached page is compressed once per data version into every encoding
+available here; each request then only picks the variant its
+Accept-Encoding allows. gzip is always available, brotli and zstd when
+the `brotli` and `zstandard` packages are installed.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+IDENTITY = 'identity'
+
+# Bodies smaller than this are not worth a Content-Encoding (same as GZipMiddleware)
+MIN_SIZE = 200
+
+# Encoding -> compressor, best ratio first. A body is compressed once per
+# import, so the levels are high, but not the top ones (brotli 11, zstd 19)
+# which cost 20-60x the CPU for a 5-10% smaller body (benchmark_compression).
+COMPRESSORS = {}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda body: brotli.compress(body, quality=9, mode=brotli.MODE_TEXT)
+if zstandard is not None:
+    COMPRESSORS['zstd'] = lambda body: zstandard.ZstdCompressor(level=9).compress(body)
+COMPRESSORS['gzip'] = lambda body: gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def compress(body):
+    """Encoding -> body for the identity body and each available encoding"""
+    bodies = {IDENTITY: body}
+    if len(body) >= MIN_SIZE:
+        for encoding, compressor in COMPRESSORS.items():
+            bodies[encoding] = compressor(body)
+    return bodies
+
+
+def accepted_encodings(header):
+    """Encodings an Accept-Encoding header allows, with their q-values"""
+    accepted = {}
+    for part in header.split(','):
+        encoding, _, params = part.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if encoding:
+            accepted[encoding.lower()] = quality
+    return accepted
+
+
+def negotiate(header, bodies):
+    """The (encoding, body) to send: the most preferred one the client accepts"""
+    accepted = accepted_encodings(header or '')
+    candidates = [encoding for encoding in bodies if encoding != IDENTITY]
+    best = max(
+        candidates,
+        key=lambda encoding: (accepted.get(encoding, accepted.get('*', 0)), -candidates.index(encoding)),
+        default=None,
+    )
+    if best is not None and accepted.get(best, accepted.get('*', 0)) > 0:
+        return best, bodies[best]
+    return IDENTITY, bodies[IDENTITY]
@@ -0,0 +1,15 @@
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def relation_count(model, field):
+    """
+    Count the `model` rows that point at the outer row through `field`.
+
+    Compiles to one correlated GROUP BY subquery, answered from the
+    (field, ...) index of the relation table.
+    """
+    counts = model.objects.filter(
+        **{field: OuterRef('pk')}
+    ).order_by().values(field).annotate(count=Count('*')).values('count')
+    return Coalesce(Subquery(counts), 0)
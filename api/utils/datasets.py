@@ -0,0 +1,201 @@
+"""
+Blue/green datasets.
+
+With SWAPI_DATASET_DIR set, the primary and the read pool serve the
+SQLite file named in the `current` pointer file of that directory. An
+import is built in a new file next to it, validated, and then activated
+by replacing the pointer in one rename. Every thread reconnects to the
+new file at the start of its next request; until then it keeps reading
+the previous file, so readers never wait on the import or see part of it.
+The path is pinned on each thread's own connections, never in the
+process-wide DATABASES settings.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+
+from api.utils.graph import NODE_MODELS
+
+POINTER_NAME = 'current'
+DATASET_PREFIX = 'swapi-'
+DATASET_SUFFIX = '.sqlite3'
+
+# Path of the dataset each thread's connections are open on
+_state = threading.local()
+
+# Pointer file identity -> dataset path, so a request only costs a stat()
+_pointer = (None, None)
+
+
+class DatasetError(Exception):
+    """A staged dataset failed validation"""
+
+
+def pointer_path():
+    return os.path.join(settings.SWAPI_DATASET_DIR, POINTER_NAME)
+
+
+def dataset_aliases():
+    """The aliases serving the active dataset: the primary and the read pool"""
+    return list(dict.fromkeys([settings.SWAPI_PRIMARY_DATABASE, *settings.SWAPI_READ_DATABASES]))
+
+
+def list_datasets():
+    """Paths of the dataset files, oldest first"""
+    directory = settings.SWAPI_DATASET_DIR
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(DATASET_PREFIX) and name.endswith(DATASET_SUFFIX)
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+def get_active_dataset():
+    """Path of the active dataset, or None before the first import"""
+    global _pointer
+
+    try:
+        stat = os.stat(pointer_path())
+    except FileNotFoundError:
+        return None
+
+    identity = (stat.st_ino, stat.st_mtime_ns)
+    if _pointer[0] != identity:
+        with open(pointer_path()) as file:
+            _pointer = (identity, os.path.join(settings.SWAPI_DATASET_DIR, file.read().strip()))
+    return _pointer[1]
+
+
+def _pin(connection, path):
+    """Reopen this thread's `connection` on `path`; the other threads keep their file"""
+    connection.close()
+    # A copy: connections.settings[alias] is shared by the connections of every thread.
+    connection.settings_dict = {**connection.settings_dict, 'NAME': path}
+
+
+def use_dataset(path):
+    """Point this thread's connections of the dataset aliases at `path`"""
+    for alias in dataset_aliases():
+        _pin(connections[alias], path)
+    _state.path = path
+
+
+def follow_active_dataset(**kwargs):
+    """request_started receiver: move this thread to the active dataset if the pointer moved"""
+    path = get_active_dataset()
+    if path is not None and getattr(_state, 'path', None) != path:
+        use_dataset(path)
+
+
+# =============================================================================
+# IMPORT - Stage, validate, activate
+# =============================================================================
+
+@contextmanager
+def staged_dataset():
+    """
+    A new dataset file that the primary points at for the duration of the block.
+
+    It starts as a copy of the active dataset, so the import upserts into
+    the current data as it would in place, and is migrated first. The file
+    is removed if the block raises; otherwise pass it to activate_dataset().
+    """
+    os.makedirs(settings.SWAPI_DATASET_DIR, exist_ok=True)
+    path = os.path.join(settings.SWAPI_DATASET_DIR, f"{DATASET_PREFIX}{time.time_ns():x}{DATASET_SUFFIX}")
+
+    active = get_active_dataset()
+    if active is not None:
+        # A consistent copy read through its own connection: the pool keeps reading meanwhile.
+        source = sqlite3.connect(f'file:{active}?mode=ro', uri=True)
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+    primary = connections[settings.SWAPI_PRIMARY_DATABASE]
+    previous = primary.settings_dict['NAME']
+    _pin(primary, path)
+    try:
+        call_command('migrate', database=settings.SWAPI_PRIMARY_DATABASE, interactive=False, verbosity=0)
+        yield path
+    except BaseException:
+        _pin(primary, previous)
+        _remove(path)
+        raise
+    # Closing the last connection checkpoints the WAL into the file.
+    _pin(primary, previous)
+
+
+def validate_dataset(data):
+    """
+    Raise DatasetError unless the staged dataset is intact and complete.
+
+    Checked on the primary: SQLite's integrity check, no dangling foreign
+    key, and at least as many rows per resource as `data` has entries.
+    """
+    alias = settings.SWAPI_PRIMARY_DATABASE
+    with connections[alias].cursor() as cursor:
+        cursor.execute('PRAGMA integrity_check')
+        result = cursor.fetchone()[0]
+        if result != 'ok':
+            raise DatasetError(f"Integrity check failed: {result}")
+
+        cursor.execute('PRAGMA foreign_key_check')
+        violations = cursor.fetchall()
+        if violations:
+            table, rowid, parent, _ = violations[0]
+            raise DatasetError(
+                f"{len(violations)} row(s) reference missing rows, e.g. {table} row {rowid} -> {parent}"
+            )
+
+    for resource, (model, _) in NODE_MODELS.items():
+        count = model.objects.using(alias).count()
+        expected = len(data.get(resource) or [])
+        if count < expected:
+            raise DatasetError(f"{resource}: {count} rows for {expected} entries")
+
+
+def activate_dataset(path):
+    """
+    Make `path` the active dataset by renaming a new pointer over the old one.
+
+    Keeps the SWAPI_DATASETS_KEPT most recent files, the active one always
+    among them, and removes the others.
+    """
+    pointer = pointer_path()
+    with open(f'{pointer}.tmp', 'w') as file:
+        file.write(os.path.basename(path))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f'{pointer}.tmp', pointer)
+    directory = os.open(settings.SWAPI_DATASET_DIR, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+    use_dataset(path)
+
+    datasets = list_datasets()
+    kept = set(datasets[-settings.SWAPI_DATASETS_KEPT:]) | {path}
+    for dataset in datasets:
+        if dataset not in kept:
+            _remove(dataset)
+
+
+def _remove(path):
+    for name in (path, f'{path}-wal', f'{path}-shm', f'{path}-journal'):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,85 @@
+"""
+Committed table fixture for the tests.
+
+A gzipped JSON file with the rows of every api table, as the database
+stores them: `{table: {'columns': [...], 'rows': [[...], ...]}}`. Loading
+it is one executemany per table, so a test class gets a full SWAPI-sized
+database in milliseconds, offline. `manage.py build_fixture` regenerates
+it from the synthetic payload after a migration changes the tables.
+"""
+import gzip
+import json
+import os
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'testdata', 'swapi.json.gz')
+
+
+class FixtureError(Exception):
+    """The fixture does not match the tables of the current migrations"""
+
+
+def fixture_models():
+    """Every concrete api model, static tables and entities before the junctions"""
+    return [model for model in apps.get_app_config('api').get_models() if not model._meta.proxy]
+
+
+def _columns(model):
+    return [field.column for field in model._meta.concrete_fields]
+
+
+def dump_fixture(path=FIXTURE_PATH, using='default'):
+    """Write the api tables of `using` to `path`; returns the number of rows"""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    tables, count = {}, 0
+    with connection.cursor() as cursor:
+        for model in fixture_models():
+            columns = _columns(model)
+            cursor.execute(
+                f"SELECT {', '.join(map(quote, columns))} FROM {quote(model._meta.db_table)} "
+                f"ORDER BY {quote(model._meta.pk.column)}"
+            )
+            rows = [list(row) for row in cursor.fetchall()]
+            tables[model._meta.db_table] = {'columns': columns, 'rows': rows}
+            count += len(rows)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # mtime=0 keeps the file identical when the rows are.
+    with open(f'{path}.tmp', 'wb') as file, gzip.GzipFile(fileobj=file, mode='wb', mtime=0) as archive:
+        archive.write(json.dumps(tables, separators=(',', ':'), default=str).encode())
+    os.replace(f'{path}.tmp', path)
+    return count
+
+
+def load_fixture(path=FIXTURE_PATH, using='default'):
+    """Insert the fixture rows into the (empty) api tables of `using`; returns the number of rows"""
+    with gzip.open(path, 'rb') as file:
+        tables = json.loads(file.read())
+
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    models, count = fixture_models(), 0
+    with connection.cursor() as cursor:
+        for model in models:
+            table = tables.get(model._meta.db_table)
+            if table is None or table['columns'] != _columns(model):
+                raise FixtureError(
+                    f"{model._meta.db_table} changed since the fixture was built, run `manage.py build_fixture`"
+                )
+            if not table['rows']:
+                continue
+            cursor.executemany(
+                f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(map(quote, table['columns']))}) "
+                f"VALUES ({', '.join(['%s'] * len(table['columns']))})",
+                table['rows'],
+            )
+            count += len(table['rows'])
+
+        # Ids were inserted explicitly; new rows must not reuse them.
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    return count
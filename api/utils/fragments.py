@@ -0,0 +1,49 @@
+"""
+Per-entity fragments of the nested list representations.
+
+A person is rendered by PersonListSerializer the same way inside a film,
+a planet, a species, a vehicle or a starship. Each such representation
+is cached once per data version and reused by every parent that lists it.
+"""
+from django.conf import settings
+
+from api.utils.cache import get_data_version, get_many_cached, set_many_cached
+
+FRAGMENT_KEY = 'swapi:fragment:{serializer}:{version}:{pk}'
+
+# Fragments of an older version are never read again; let them expire
+# instead of filling the shared cache until it culls.
+FRAGMENT_TIMEOUT = 24 * 60 * 60
+
+
+def serialize_many(serializer_class, queryset):
+    """
+    `serializer_class(queryset, many=True).data`, assembled from cached fragments.
+
+    Only the primary keys are queried up front; the full queryset, with its
+    joins and prefetches, runs for the entities without a fragment.
+    """
+    if not settings.SWAPI_FRAGMENT_CACHE:
+        return serializer_class(queryset, many=True).data
+
+    pks = list(queryset.values_list('pk', flat=True))
+    if not pks:
+        return []
+
+    version = get_data_version()
+    keys = {
+        pk: FRAGMENT_KEY.format(serializer=serializer_class.__name__, version=version, pk=pk)
+        for pk in pks
+    }
+    fragments = get_many_cached(list(keys.values()))
+
+    missing = [pk for pk in pks if keys[pk] not in fragments]
+    if missing:
+        built = {
+            keys[item['id']]: item
+            for item in serializer_class(queryset.filter(pk__in=missing), many=True).data
+        }
+        set_many_cached(built, FRAGMENT_TIMEOUT)
+        fragments.update(built)
+    return [fragments[keys[pk]] for pk in pks]
+
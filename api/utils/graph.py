@@ -0,0 +1,159 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from api.models import (
+    Films, Planets, People, Species, Vehicles, Starships,
+    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, VehicleFilms, VehiclePilots,
+    StarshipFilms, StarshipPilots,
+)
+from api.utils.cache import get_data_version
+
+# Node types in the order their nodes are numbered.
+NODE_MODELS = {
+    'people': (People, 'name'),
+    'films': (Films, 'title'),
+    'planets': (Planets, 'name'),
+    'species': (Species, 'name'),
+    'starships': (Starships, 'name'),
+    'vehicles': (Vehicles, 'name'),
+}
+
+# Junction tables that become (undirected) edges: model, (field, node type) x 2
+EDGE_MODELS = [
+    (PeopleFilms, ('person', 'people'), ('film', 'films')),
+    (PeopleSpecies, ('person', 'people'), ('species', 'species')),
+    (StarshipPilots, ('pilot', 'people'), ('starship', 'starships')),
+    (VehiclePilots, ('pilot', 'people'), ('vehicle', 'vehicles')),
+    (PlanetFilms, ('planet', 'planets'), ('film', 'films')),
+    (SpeciesFilms, ('species', 'species'), ('film', 'films')),
+    (StarshipFilms, ('starship', 'starships'), ('film', 'films')),
+    (VehicleFilms, ('vehicle', 'vehicles'), ('film', 'films')),
+]
+
+
+class RelationGraph:
+    """
+    Undirected graph of every entity and its junction-table relations.
+
+    Nodes are numbered per type in contiguous ranges, ordered by primary
+    key within a type. The adjacency is kept in compressed sparse row form:
+    the neighbours of node `n` are `neighbours[offsets[n]:offsets[n + 1]]`,
+    sorted, so the neighbours of one type are a contiguous slice as well.
+    """
+
+    def __init__(self, types, ids, names, offsets, neighbours):
+        self.types = types  # node type -> (first node, last node + 1)
+        self.ids = ids
+        self.names = names
+        self.offsets = offsets
+        self.neighbours = neighbours
+
+    @classmethod
+    def build(cls):
+        """Load the graph with one query per entity and junction table"""
+        types, ids, names = {}, array('q'), []
+        for node_type, (model, name_field) in NODE_MODELS.items():
+            start = len(ids)
+            for pk, name in model.objects.order_by('pk').values_list('pk', name_field).iterator():
+                ids.append(pk)
+                names.append(name)
+            types[node_type] = (start, len(ids))
+
+        graph = cls(types, ids, names, array('I', [0]) * (len(ids) + 1), array('I'))
+        edges = []
+        for model, (a_field, a_type), (b_field, b_type) in EDGE_MODELS:
+            for a_id, b_id in model.objects.order_by().values_list(f'{a_field}_id', f'{b_field}_id').iterator():
+                a, b = graph.node(a_type, a_id), graph.node(b_type, b_id)
+                if a is not None and b is not None:
+                    edges.append((a, b))
+                    edges.append((b, a))
+        edges.sort()
+
+        for a, b in edges:
+            graph.offsets[a + 1] += 1
+            graph.neighbours.append(b)
+        for node in range(len(ids)):
+            graph.offsets[node + 1] += graph.offsets[node]
+        return graph
+
+    def __len__(self):
+        return len(self.ids)
+
+    def node(self, node_type, pk):
+        """Node number of an entity, or None when it does not exist"""
+        start, end = self.types[node_type]
+        node = bisect_left(self.ids, pk, start, end)
+        if node < end and self.ids[node] == pk:
+            return node
+        return None
+
+    def node_type(self, node):
+        """Type of a node number"""
+        for node_type, (start, end) in self.types.items():
+            if start <= node < end:
+                return node_type
+
+    def describe(self, node):
+        """JSON representation of a node"""
+        return {'type': self.node_type(node), 'id': self.ids[node], 'name': self.names[node]}
+
+    def adjacent(self, node, node_type=None):
+        """Neighbours of `node`, optionally only those of one type"""
+        start, end = self.offsets[node], self.offsets[node + 1]
+        if node_type is None:
+            return self.neighbours[start:end]
+        low, high = self.types[node_type]
+        return self.neighbours[
+            bisect_left(self.neighbours, low, start, end):bisect_right(self.neighbours, high - 1, start, end)
+        ]
+
+    def co_appearances(self, node, via='films', node_type=None):
+        """
+        Nodes sharing at least one `via` neighbour with `node`, with the
+        number of shared neighbours, most shared first.
+        """
+        node_type = node_type or self.node_type(node)
+        counts = {}
+        for shared in self.adjacent(node, via):
+            for other in self.adjacent(shared, node_type):
+                if other != node:
+                    counts[other] = counts.get(other, 0) + 1
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def shortest_path(self, source, target):
+        """Nodes on a shortest path from `source` to `target`, or None"""
+        parents = {source: source}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                path = [node]
+                while node != source:
+                    node = parents[node]
+                    path.append(node)
+                return path[::-1]
+            for neighbour in self.adjacent(node):
+                if neighbour not in parents:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+        return None
+
+
+_lock = threading.Lock()
+_graph = None
+_graph_version = None
+
+
+def get_graph():
+    """Per-process graph of the current data version, rebuilt after an import"""
+    global _graph, _graph_version
+
+    version = get_data_version()
+    if _graph is None or _graph_version != version:
+        with _lock:
+            if _graph is None or _graph_version != version:
+                _graph = RelationGraph.build()
+                _graph_version = version
+    return _graph
@@ -0,0 +1,75 @@
+"""
+Keyset pagination helpers.
+
+An ordering is a list of (field, descending) keys ending with the primary
+key. NULLs sort first ascending and last descending, which is SQLite's
+native order, so an index on (field, id) answers both directions.
+"""
+import base64
+import binascii
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
+
+def order_by(keys):
+    """ORDER BY expressions with the NULL placement spelled out"""
+    return [
+        F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_first=True)
+        for field, descending in keys
+    ]
+
+
+def _equal(field, value):
+    return Q(**{f'{field}__isnull': True}) if value is None else Q(**{field: value})
+
+
+def _after(field, descending, value):
+    """Rows past `value` on one key, or None when nothing sorts after it"""
+    if descending:
+        return None if value is None else Q(**{f'{field}__lt': value}) | Q(**{f'{field}__isnull': True})
+    return Q(**{f'{field}__isnull': False}) if value is None else Q(**{f'{field}__gt': value})
+
+
+def _bound(field, descending, value):
+    """Redundant range on the leading key, so the planner seeks the index instead of scanning it"""
+    if value is None:
+        return Q(**{f'{field}__isnull': True}) if descending else Q()
+    return Q(**{f'{field}__lte': value}) | Q(**{f'{field}__isnull': True}) if descending else Q(**{f'{field}__gte': value})
+
+
+def after(keys, values):
+    """Filter for the rows that sort after the row with these key `values`"""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for (field, descending), value in zip(keys, values):
+        step = _after(field, descending, value)
+        if step is not None:
+            condition |= equal & step
+        equal &= _equal(field, value)
+    return _bound(keys[0][0], keys[0][1], values[0]) & condition
+
+
+def row_values(keys, row):
+    return [getattr(row, field) for field, _ in keys]
+
+
+def encode_cursor(ordering, values):
+    payload = json.dumps({'o': ordering, 'v': values}, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(ordering, values) of a cursor; raises ValueError when malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        ordering, values = payload['o'], payload['v']
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as error:
+        raise ValueError('Invalid cursor') from error
+    # Anything else came from a hand-edited cursor, not from encode_cursor().
+    if not isinstance(ordering, str) or not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values):
+        raise ValueError('Invalid cursor')
+    return ordering, values
@@ -0,0 +1,74 @@
+from api.models import (
+    Climates, Terrains, EyeColors, HairColors, SkinColors,
+    StarshipClasses, StarshipManufacturers, VehicleClasses, VehicleManufacturers,
+)
+
+BATCH_SIZE = 500
+
+# Static tables: model, field the name is stored in, whether `name` mirrors it
+LOOKUPS = {
+    'climates': (Climates, 'description', True),
+    'terrains': (Terrains, 'description', True),
+    'eye_colors': (EyeColors, 'color', False),
+    'hair_colors': (HairColors, 'color', False),
+    'skin_colors': (SkinColors, 'color', False),
+    'starship_classes': (StarshipClasses, 'name', False),
+    'starship_manufacturers': (StarshipManufacturers, 'name', False),
+    'vehicle_classes': (VehicleClasses, 'name', False),
+    'vehicle_manufacturers': (VehicleManufacturers, 'name', False),
+}
+
+LOOKUP_FOR_MODEL = {model: lookup for lookup, (model, _, _) in LOOKUPS.items()}
+
+
+class LookupResolver:
+    """
+    Import-scoped cache of the static tables (colors, classes, manufacturers,
+    climates and terrains).
+
+    Each table is loaded into a dict on first use, `ensure` creates every
+    name the payload needs with one bulk insert per table, and lookups are
+    then answered from memory. The queries per table stay constant no
+    matter how often a value is mentioned.
+    """
+
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, lookup):
+        """Name -> row of a static table, loaded with one query"""
+        if lookup not in self.tables:
+            model, field, _ = LOOKUPS[lookup]
+            self.tables[lookup] = {getattr(obj, field): obj for obj in model.objects.all()}
+        return self.tables[lookup]
+
+    def ensure(self, names):
+        """Create the missing names ({lookup: names}); returns the number created per lookup"""
+        created = {}
+        for lookup, wanted in names.items():
+            model, field, mirror_name = LOOKUPS[lookup]
+            table = self.table(lookup)
+            missing = sorted(set(wanted) - table.keys())
+            if missing:
+                model.objects.bulk_create(
+                    [model(**{field: name, **({'name': name} if mirror_name else {})}) for name in missing],
+                    batch_size=BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+                table.update((getattr(obj, field), obj) for obj in model.objects.filter(**{f'{field}__in': missing}))
+            created[lookup] = len(missing)
+        return created
+
+    def get(self, lookup, name):
+        """Row of `name`, created on the spot if `ensure` did not see it"""
+        table = self.table(lookup)
+        if name not in table:
+            model, field, mirror_name = LOOKUPS[lookup]
+            table[name], _ = model.objects.get_or_create(
+                **{field: name}, defaults={'name': name} if mirror_name else {}
+            )
+        return table[name]
+
+    def ids(self, lookup):
+        """Name -> id of a static table"""
+        return {name: obj.pk for name, obj in self.table(lookup).items()}
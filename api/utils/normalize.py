@@ -0,0 +1,172 @@
+"""
+Columnar normalization of the SWAPI string fields.
+
+SWAPI serves numbers as display strings: "1,000,000", "unknown", "n/a",
+"30-165", "1000km", "19BBY". Each field of a resource is parsed as one
+column: the distinct values are parsed once and the results spread back
+over the rows, which is cheap because these columns repeat a handful of
+values. The result is a typed column with a null mask: NumPy arrays when
+NumPy is installed, `array` module arrays otherwise.
+"""
+import re
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+NUMBER = re.compile(r'^([-+]?\d+(?:\.\d+)?)\s*[a-z]*$')
+RANGE = re.compile(r'^(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)$')
+BIRTH_YEAR = re.compile(r'^(\d+(?:\.\d+)?)\s*(bby|aby)$')
+
+
+def _clean(value):
+    return value.strip().lower().replace(',', '') if isinstance(value, str) else ''
+
+
+def _integral(number):
+    return int(number) if number is not None and float(number).is_integer() else None
+
+
+def parse_float(value):
+    """'1,358' -> 1358.0, '1000km' -> 1000.0, 'unknown' -> None"""
+    match = NUMBER.match(_clean(value))
+    return float(match.group(1)) if match else None
+
+
+def parse_int(value):
+    """'1,000,000,000,000' -> 1000000000000, '80.5' -> None"""
+    match = NUMBER.match(_clean(value))
+    if not match:
+        return None
+    number = match.group(1)
+    return int(number) if number.lstrip('+-').isdigit() else _integral(float(number))
+
+
+def parse_range(value):
+    """'30-165' -> (30, 165), '342,953' -> (342953, 342953), 'unknown' -> None"""
+    value = _clean(value)
+    match = RANGE.match(value)
+    if match:
+        return _integral(float(match.group(1))), _integral(float(match.group(2)))
+    number = parse_int(value)
+    return None if number is None else (number, number)
+
+
+def parse_range_min(value):
+    bounds = parse_range(value)
+    return bounds[0] if bounds else None
+
+
+def parse_range_max(value):
+    bounds = parse_range(value)
+    return bounds[1] if bounds else None
+
+
+def parse_birth_year(value):
+    """Years before the Battle of Yavin: '19BBY' -> 19.0, '22ABY' -> -22.0"""
+    match = BIRTH_YEAR.match(_clean(value))
+    if not match:
+        return None
+    years = float(match.group(1))
+    return years if match.group(2) == 'bby' else -years
+
+
+# Kind -> (parser, NumPy dtype, array typecode)
+KINDS = {
+    'float': (parse_float, 'float64', 'd'),
+    'int': (parse_int, 'int64', 'q'),
+    'range_min': (parse_range_min, 'int64', 'q'),
+    'range_max': (parse_range_max, 'int64', 'q'),
+    'birth_year': (parse_birth_year, 'float64', 'd'),
+}
+
+# Resource -> {typed model field: (SWAPI field, kind)}
+TYPED_FIELDS = {
+    'planets': {
+        'rotation_period_num': ('rotation_period', 'float'),
+        'orbital_period_num': ('orbital_period', 'float'),
+        'diameter_num': ('diameter', 'float'),
+        'surface_water_num': ('surface_water', 'float'),
+        'population_num': ('population', 'int'),
+    },
+    'species': {
+        'average_height_num': ('average_height', 'float'),
+        'average_lifespan_num': ('average_lifespan', 'float'),
+    },
+    'people': {
+        'height_num': ('height', 'float'),
+        'mass_num': ('mass', 'float'),
+        'birth_year_num': ('birth_year', 'birth_year'),
+    },
+    'vehicles': {
+        'cost_in_credits_num': ('cost_in_credits', 'int'),
+        'length_num': ('length', 'float'),
+        'crew_min': ('crew', 'range_min'),
+        'crew_max': ('crew', 'range_max'),
+        'passengers_num': ('passengers', 'int'),
+        'max_atmosphering_speed_num': ('max_atmosphering_speed', 'float'),
+        'cargo_capacity_num': ('cargo_capacity', 'int'),
+    },
+    'starships': {
+        'cost_in_credits_num': ('cost_in_credits', 'int'),
+        'length_num': ('length', 'float'),
+        'crew_min': ('crew', 'range_min'),
+        'crew_max': ('crew', 'range_max'),
+        'passengers_num': ('passengers', 'int'),
+        'max_atmosphering_speed_num': ('max_atmosphering_speed', 'float'),
+        'cargo_capacity_num': ('cargo_capacity', 'int'),
+        'hyperdrive_rating_num': ('hyperdrive_rating', 'float'),
+        'MGLT_num': ('MGLT', 'float'),
+    },
+}
+
+
+class Column:
+    """Typed values with a null mask (True where the value is missing)"""
+    __slots__ = ('data', 'mask')
+
+    def __init__(self, data, mask):
+        self.data = data
+        self.mask = mask
+
+    def __len__(self):
+        return len(self.data)
+
+    def tolist(self):
+        """Python values with None for nulls, ready for the ORM"""
+        return [None if null else value for value, null in zip(self.data.tolist(), self.mask.tolist())]
+
+
+def normalize_column(values, kind):
+    """Parse a whole column of SWAPI strings in one pass"""
+    parse, dtype, typecode = KINDS[kind]
+    values = [value if isinstance(value, str) else '' for value in values]
+
+    if np is not None and values:
+        uniques, inverse = np.unique(np.array(values, dtype=str), return_inverse=True)
+        parsed = [parse(value) for value in uniques.tolist()]
+        mask = np.array([number is None for number in parsed], dtype=bool)
+        data = np.array([0 if number is None else number for number in parsed], dtype=dtype)
+        return Column(data[inverse], mask[inverse])
+
+    parsed = {value: parse(value) for value in set(values)}
+    numbers = [parsed[value] for value in values]
+    return Column(
+        array(typecode, [0 if number is None else number for number in numbers]),
+        array('b', [number is None for number in numbers]),
+    )
+
+
+def typed_columns(resource, items):
+    """Typed model field -> list of values, aligned with the SWAPI `items`"""
+    return {
+        field: normalize_column([item.get(source) for item in items], kind).tolist()
+        for field, (source, kind) in TYPED_FIELDS.get(resource, {}).items()
+    }
+
+
+def typed_row(columns, index):
+    """Typed field values of the row at `index`"""
+    return {field: values[index] for field, values in columns.items()}
@@ -1,17 +1,21 @@
 # star_wars_parser.py
 import json
-import re
-from datetime import datetime
+from django.apps import apps
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import transaction
+
+from api.routers import use_primary
+from api.utils.lookups import LOOKUP_FOR_MODEL, LookupResolver
+from api.utils.normalize import typed_columns, typed_row
+from api.utils.relations import sync_relation
+from api.utils.rows import ENTITY_RELATIONS, UrlIndex, lookup_names, parse_date, split_comma_separated
 from api.models import (  # Replace 'your_app' with your actual app name
     Films, Planets, People, Species, Vehicles, Starships,
     Climates, Terrains, EyeColors, HairColors, SkinColors,
     StarshipClasses, StarshipManufacturers, VehicleClasses, VehicleManufacturers,
-    # Junction models
-    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, SpeciesEyeColors,
-    SpeciesHairColors, SpeciesSkinColors, VehicleFilms, VehiclePilots,
-    VehicleManufacturerRelations, StarshipFilms, StarshipPilots,
+    # Junction models of the static values; the others are synced from ENTITY_RELATIONS
+    SpeciesEyeColors, SpeciesHairColors, SpeciesSkinColors, VehicleManufacturerRelations,
     StarshipManufacturerRelations, PeopleEyeColors, PeopleHairColors, PeopleSkinColors
 )
 
@@ -20,24 +24,21 @@ class StarWarsParser:
     """Parser for Star Wars API JSON data compatible with Django models"""
 
     def __init__(self):
-        self.url_to_id_cache = {}
-        self.created_objects = {
-            'films': {},
-            'planets': {},
-            'people': {},
-            'species': {},
-            'vehicles': {},
-            'starships': {},
-        }
+        self.lookups = LookupResolver()
+        # Ids of the imported entities, which the relations are built from
+        self.urls = UrlIndex()
 
     def parse_json_file(self, file_path):
         """Parse JSON file and populate database"""
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        with transaction.atomic():
+        with use_primary(), transaction.atomic(using=settings.SWAPI_PRIMARY_DATABASE):
             print("Starting Star Wars data import...")
 
+            # Create every color, class, manufacturer, climate and terrain up front
+            self.lookups.ensure(lookup_names(data))
+
             # Parse in order of dependencies
             self.parse_films(data.get('films', []))
             self.parse_planets(data.get('planets', []))
@@ -58,9 +59,12 @@ class StarWarsParser:
 
     def parse_json_data(self, data):
         """Parse JSON data dict and populate database"""
-        with transaction.atomic():
+        with use_primary(), transaction.atomic(using=settings.SWAPI_PRIMARY_DATABASE):
             print("Starting Star Wars data import...")
 
+            # Create every color, class, manufacturer, climate and terrain up front
+            self.lookups.ensure(lookup_names(data))
+
             # Parse in order of dependencies
             self.parse_films(data.get('films', []))
             self.parse_planets(data.get('planets', []))
@@ -77,62 +81,30 @@ class StarWarsParser:
     # Utility Methods
     def extract_id_from_url(self, url):
         """Extract ID from SWAPI URL"""
-        if not url:
-            return None
-        match = re.search(r'/(\d+)/?$', url)
-        return int(match.group(1)) if match else None
+        return self.urls.id(url)
 
     def split_comma_separated(self, value):
         """Split comma-separated string into list"""
-        if not value or value.lower() in ['unknown', 'n/a', 'none']:
-            return []
-
-        # Clean the value first
-        value = value.strip()
-
-        # Split by comma and clean each item
-        items = [item.strip() for item in value.split(',') if item.strip()]
-
-        # If no comma found, return the single value as list
-        if len(items) == 1 and ',' not in value:
-            return items
-
-        # Filter out empty items after cleaning
-        return [item for item in items if item and item.lower() not in ['unknown', 'n/a', 'none']]
+        return split_comma_separated(value)
 
     def get_or_create_simple_model(self, model_class, name, field_name='name'):
         """Get or create simple models like Colors, Classes etc."""
         if not name or name.lower() in ['unknown', 'n/a', 'none']:
             return None
 
-        kwargs = {field_name: name.strip()}
-        obj, created = model_class.objects.get_or_create(**kwargs)
-        return obj
+        return self.lookups.get(LOOKUP_FOR_MODEL[model_class], name.strip())
 
     def get_or_create_climate_terrain(self, model_class, description):
         """Get or create Climate or Terrain with description field"""
         if not description or description.lower() in ['unknown', 'n/a', 'none']:
             # Create default "unknown" entry instead of returning None
-            obj, created = model_class.objects.get_or_create(
-                description='unknown',
-                defaults={'name': 'unknown'}
-            )
-            return obj
+            return self.lookups.get(LOOKUP_FOR_MODEL[model_class], 'unknown')
 
-        obj, created = model_class.objects.get_or_create(
-            description=description.strip(),
-            defaults={'name': description.strip()}  # NamedModel requires name
-        )
-        return obj
+        return self.lookups.get(LOOKUP_FOR_MODEL[model_class], description.strip())
 
     def safe_date_parse(self, date_string):
         """Safely parse date string"""
-        if not date_string:
-            return None
-        try:
-            return datetime.strptime(date_string, '%Y-%m-%d').date()
-        except ValueError:
-            return None
+        return parse_date(date_string)
 
     def safe_int_parse(self, value):
         """Safely parse integer"""
@@ -148,7 +120,7 @@ class StarWarsParser:
         """Parse films data"""
         print("Parsing films...")
         for film_data in films_data:
-            film_id = self.extract_id_from_url(film_data['url'])
+            film_id = self.urls.add('films', film_data['url'])
 
             film, created = Films.objects.get_or_create(
                 id=film_id,
@@ -162,15 +134,15 @@ class StarWarsParser:
                 }
             )
 
-            self.created_objects['films'][film_data['url']] = film
             if created:
                 print(f"Created film: {film.title}")
 
     def parse_planets(self, planets_data):
         """Parse planets data"""
         print("Parsing planets...")
-        for planet_data in planets_data:
-            planet_id = self.extract_id_from_url(planet_data['url'])
+        columns = typed_columns('planets', planets_data)
+        for index, planet_data in enumerate(planets_data):
+            planet_id = self.urls.add('planets', planet_data['url'])
 
             # Get or create climate and terrain
             climate = self.get_or_create_climate_terrain(Climates, planet_data['climate'])
@@ -188,23 +160,20 @@ class StarWarsParser:
                     'population': planet_data.get('population', '0'),
                     'climate': climate,
                     'terrain': terrain,
+                    **typed_row(columns, index),
                 }
             )
 
-            self.created_objects['planets'][planet_data['url']] = planet
             if created:
                 print(f"Created planet: {planet.name}")
 
     def parse_species(self, species_data_list):
         """Parse species data"""
         print("Parsing species...")
-        for species_data in species_data_list:
-            species_id = self.extract_id_from_url(species_data['url'])
+        columns = typed_columns('species', species_data_list)
+        for index, species_data in enumerate(species_data_list):
+            species_id = self.urls.add('species', species_data['url'])
 
-            # Get homeworld if exists
-            homeworld = None
-            if species_data.get('homeworld'):
-                homeworld = self.created_objects['planets'].get(species_data['homeworld'])
 
             species, created = Species.objects.get_or_create(
                 id=species_id,
@@ -215,7 +184,8 @@ class StarWarsParser:
                     'average_height': species_data.get('average_height', ''),
                     'average_lifespan': species_data.get('average_lifespan', ''),
                     'language': species_data.get('language', ''),
-                    'homeworld': homeworld,
+                    'homeworld_id': self.urls.resolve('planets', species_data.get('homeworld')),
+                    **typed_row(columns, index),
                 }
             )
 
@@ -223,7 +193,6 @@ class StarWarsParser:
             if created:
                 self._create_species_colors(species, species_data)
 
-            self.created_objects['species'][species_data['url']] = species
             if created:
                 print(f"Created species: {species.name}")
 
@@ -262,13 +231,10 @@ class StarWarsParser:
     def parse_people(self, people_data):
         """Parse people data"""
         print("Parsing people...")
-        for person_data in people_data:
-            person_id = self.extract_id_from_url(person_data['url'])
+        columns = typed_columns('people', people_data)
+        for index, person_data in enumerate(people_data):
+            person_id = self.urls.add('people', person_data['url'])
 
-            # Get related objects
-            homeworld = None
-            if person_data.get('homeworld'):
-                homeworld = self.created_objects['planets'].get(person_data['homeworld'])
 
             person, created = People.objects.get_or_create(
                 id=person_id,
@@ -278,7 +244,8 @@ class StarWarsParser:
                     'gender': person_data.get('gender', ''),
                     'height': person_data.get('height', ''),
                     'mass': person_data.get('mass', ''),
-                    'homeworld': homeworld,
+                    'homeworld_id': self.urls.resolve('planets', person_data.get('homeworld')),
+                    **typed_row(columns, index),
                 }
             )
 
@@ -286,7 +253,6 @@ class StarWarsParser:
             if created:
                 self._create_people_colors(person, person_data)
 
-            self.created_objects['people'][person_data['url']] = person
             if created:
                 print(f"Created person: {person.name}")
 
@@ -328,8 +294,9 @@ class StarWarsParser:
     def parse_vehicles(self, vehicles_data):
         """Parse vehicles data"""
         print("Parsing vehicles...")
-        for vehicle_data in vehicles_data:
-            vehicle_id = self.extract_id_from_url(vehicle_data['url'])
+        columns = typed_columns('vehicles', vehicles_data)
+        for index, vehicle_data in enumerate(vehicles_data):
+            vehicle_id = self.urls.add('vehicles', vehicle_data['url'])
 
             # Get vehicle class
             vehicle_class = self.get_or_create_simple_model(
@@ -350,6 +317,7 @@ class StarWarsParser:
                     'max_atmosphering_speed': vehicle_data.get('max_atmosphering_speed', ''),
                     'cargo_capacity': vehicle_data.get('cargo_capacity', ''),
                     'consumables': vehicle_data.get('consumables', ''),
+                    **typed_row(columns, index),
                 }
             )
 
@@ -357,7 +325,6 @@ class StarWarsParser:
             if created:
                 self._create_vehicle_manufacturers(vehicle, vehicle_data)
 
-            self.created_objects['vehicles'][vehicle_data['url']] = vehicle
             if created:
                 print(f"Created vehicle: {vehicle.name}")
 
@@ -375,8 +342,9 @@ class StarWarsParser:
     def parse_starships(self, starships_data):
         """Parse starships data"""
         print("Parsing starships...")
-        for starship_data in starships_data:
-            starship_id = self.extract_id_from_url(starship_data['url'])
+        columns = typed_columns('starships', starships_data)
+        for index, starship_data in enumerate(starships_data):
+            starship_id = self.urls.add('starships', starship_data['url'])
 
             # Get starship class
             starship_class = self.get_or_create_simple_model(
@@ -399,6 +367,7 @@ class StarWarsParser:
                     'MGLT': starship_data.get('MGLT', ''),
                     'cargo_capacity': starship_data.get('cargo_capacity', ''),
                     'consumables': starship_data.get('consumables', ''),
+                    **typed_row(columns, index),
                 }
             )
 
@@ -406,7 +375,6 @@ class StarWarsParser:
             if created:
                 self._create_starship_manufacturers(starship, starship_data)
 
-            self.created_objects['starships'][starship_data['url']] = starship
             if created:
                 print(f"Created starship: {starship.name}")
 
@@ -422,71 +390,23 @@ class StarWarsParser:
                 )
 
     def create_relationships(self, data):
-        """Create all many-to-many relationships after objects are created"""
+        """Sync the relationships between entities with the payload, one junction table at a time"""
         print("Creating relationships...")
-
-        # Planet-Film relationships
-        for planet_data in data.get('planets', []):
-            planet = self.created_objects['planets'].get(planet_data['url'])
-            if planet:
-                for film_url in planet_data.get('films', []):
-                    film = self.created_objects['films'].get(film_url)
-                    if film:
-                        PlanetFilms.objects.get_or_create(planet=planet, film=film)
-
-        # People relationships
-        for person_data in data.get('people', []):
-            person = self.created_objects['people'].get(person_data['url'])
-            if person:
-                # People-Films
-                for film_url in person_data.get('films', []):
-                    film = self.created_objects['films'].get(film_url)
-                    if film:
-                        PeopleFilms.objects.get_or_create(person=person, film=film)
-
-                # People-Species
-                for species_url in person_data.get('species', []):
-                    species = self.created_objects['species'].get(species_url)
-                    if species:
-                        PeopleSpecies.objects.get_or_create(person=person, species=species)
-
-                # Vehicle Pilots
-                for vehicle_url in person_data.get('vehicles', []):
-                    vehicle = self.created_objects['vehicles'].get(vehicle_url)
-                    if vehicle:
-                        VehiclePilots.objects.get_or_create(vehicle=vehicle, pilot=person)
-
-                # Starship Pilots
-                for starship_url in person_data.get('starships', []):
-                    starship = self.created_objects['starships'].get(starship_url)
-                    if starship:
-                        StarshipPilots.objects.get_or_create(starship=starship, pilot=person)
-
-        # Species-Films relationships
-        for species_data in data.get('species', []):
-            species = self.created_objects['species'].get(species_data['url'])
-            if species:
-                for film_url in species_data.get('films', []):
-                    film = self.created_objects['films'].get(film_url)
-                    if film:
-                        SpeciesFilms.objects.get_or_create(species=species, film=film)
-
-        # Vehicle-Films relationships
-        for vehicle_data in data.get('vehicles', []):
-            vehicle = self.created_objects['vehicles'].get(vehicle_data['url'])
-            if vehicle:
-                for film_url in vehicle_data.get('films', []):
-                    film = self.created_objects['films'].get(film_url)
-                    if film:
-                        VehicleFilms.objects.get_or_create(vehicle=vehicle, film=film)
-
-        # Starship-Films relationships
-        for starship_data in data.get('starships', []):
-            starship = self.created_objects['starships'].get(starship_data['url'])
-            if starship:
-                for film_url in starship_data.get('films', []):
-                    film = self.created_objects['films'].get(film_url)
-                    if film:
-                        StarshipFilms.objects.get_or_create(starship=starship, film=film)
+        urls = self.urls
+
+        for relation, (model_name, source_field, source, target_field, target) in ENTITY_RELATIONS.items():
+            model = apps.get_model('api', model_name)
+            pairs = [
+                (source_id, target_id)
+                for item in data.get(source, [])
+                if (source_id := urls.resolve(source, item['url'])) is not None
+                # The payload lists the targets under their resource name.
+                for target_id in urls.resolve_all(target, item.get(target))
+            ]
+            inserted, deleted = sync_relation(
+                model, source_field, target_field, pairs, urls.ids(source), urls.ids(target)
+            )
+            if inserted or deleted:
+                print(f"Synced {relation}: {inserted} added, {deleted} removed")
 
         print("All relationships created successfully!")
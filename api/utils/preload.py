@@ -0,0 +1,29 @@
+import gc
+
+from django.conf import settings
+from django.db import connections
+
+from api.utils.graph import get_graph
+from api.utils.snapshot import get_snapshot_reader
+from api.utils.store import get_entity_store
+
+
+def preload():
+    """
+    Build the per-process data once in the master process before it forks.
+
+    With a preforking server (e.g. `gunicorn --preload`) the workers inherit
+    the graph, the entity store and the snapshot mapping copy-on-write
+    instead of rebuilding them on their first request. The objects are
+    moved out of the garbage collector's reach so its passes do not write
+    to, and thereby copy, the shared pages.
+    """
+    get_graph()
+    get_entity_store()
+    if settings.SWAPI_SNAPSHOT_PATH:
+        get_snapshot_reader(settings.SWAPI_SNAPSHOT_PATH)
+
+    # Database connections must not be shared across the fork.
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
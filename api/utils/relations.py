@@ -0,0 +1,43 @@
+"""
+Junction table sync.
+
+Brings a junction table in line with the pairs of a payload: the existing
+pairs are loaded with one query, the rows to insert and to delete are set
+differences, and they are written with one bulk insert and one bulk
+delete. Re-importing unchanged data writes nothing.
+"""
+BATCH_SIZE = 500
+
+
+def sync_relation(model, source_field, target_field, pairs, sources, targets):
+    """
+    Make the `model` rows between `sources` and `targets` exactly `pairs`.
+
+    `pairs` are (source id, target id) tuples. Only rows with both ends
+    among `sources` and `targets` can be deleted, so links to entities the
+    payload does not contain are kept. Returns (inserted, deleted).
+    """
+    source_column, target_column = f'{source_field}_id', f'{target_field}_id'
+    sources, targets = set(sources), set(targets)
+    # The whole table in one query: it is narrow, and an IN list of every
+    # source would run into SQLite's variable limit.
+    existing = {
+        (source, target): pk
+        for pk, source, target in model.objects.values_list('pk', source_column, target_column).iterator()
+        if source in sources
+    }
+
+    pairs = set(pairs)
+    inserts = sorted(pairs - existing.keys())
+    deletes = sorted(
+        pk for (source, target), pk in existing.items() if target in targets and (source, target) not in pairs
+    )
+
+    if inserts:
+        model.objects.bulk_create(
+            [model(**{source_column: source, target_column: target}) for source, target in inserts],
+            batch_size=BATCH_SIZE,
+        )
+    for start in range(0, len(deletes), BATCH_SIZE):
+        model.objects.filter(pk__in=deletes[start:start + BATCH_SIZE]).delete()
+    return len(inserts), len(deletes)
@@ -0,0 +1,33 @@
+import os
+import sqlite3
+
+from django.conf import settings
+from django.db import connections
+
+
+def sync_replicas():
+    """
+    Copy the primary SQLite database into every replica file of the read pool.
+
+    Read databases that point at the primary file itself are skipped. Returns
+    the aliases that were synced.
+    """
+    primary = connections[settings.SWAPI_PRIMARY_DATABASE]
+    if primary.vendor != 'sqlite':
+        return []
+
+    primary_path = os.path.abspath(primary.settings_dict['NAME'])
+    synced = []
+    for alias in settings.SWAPI_READ_DATABASES:
+        replica = connections[alias]
+        if replica.vendor != 'sqlite' or os.path.abspath(replica.settings_dict['NAME']) == primary_path:
+            continue
+
+        primary.ensure_connection()
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+        synced.append(alias)
+    return synced
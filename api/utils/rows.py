@@ -0,0 +1,322 @@
+"""
+Row preparation for the bulk importer.
+
+Turns the SWAPI payload of one resource into plain rows and relation
+pairs, and maps each relation to its junction table. Nothing here touches
+Django or the database, so the resources can be prepared in parallel
+worker processes; junction models are named, not imported.
+"""
+import re
+from datetime import datetime
+
+from api.utils.normalize import typed_columns
+
+UNKNOWN = ('unknown', 'n/a', 'none')
+URL_ID = re.compile(r'/(\d+)/?$')
+
+
+def extract_id(url):
+    """Extract ID from SWAPI URL"""
+    if not url:
+        return None
+    match = URL_ID.search(url)
+    return int(match.group(1)) if match else None
+
+
+class UrlIndex:
+    """
+    URL -> id of the entities of one import, per resource.
+
+    Each distinct URL is parsed once, however often relations mention it.
+    Only integers are kept per resource, so relations resolve to id pairs
+    without holding model instances.
+    """
+
+    def __init__(self):
+        self._parsed = {}
+        self._ids = {}
+
+    def id(self, url):
+        """Id in `url`, or None"""
+        try:
+            return self._parsed[url]
+        except KeyError:
+            pk = self._parsed[url] = extract_id(url)
+            return pk
+
+    def add(self, resource, url):
+        """Record the entity at `url` as imported; returns its id"""
+        pk = self.id(url)
+        self._ids.setdefault(resource, set()).add(pk)
+        return pk
+
+    def resolve(self, resource, url):
+        """Id of an imported `resource` entity at `url`, or None"""
+        pk = self.id(url) if url else None
+        return pk if pk in self._ids.get(resource, ()) else None
+
+    def ids(self, resource):
+        """Ids of the imported `resource` entities"""
+        return self._ids.get(resource, set())
+
+    def resolve_all(self, resource, urls):
+        """Ids of the imported `resource` entities among `urls`"""
+        ids = self._ids.get(resource, ())
+        return [pk for pk in map(self.id, urls or []) if pk in ids]
+
+
+def split_comma_separated(value):
+    """Split comma-separated string into list"""
+    if not value or value.lower() in UNKNOWN:
+        return []
+
+    value = value.strip()
+    items = [item.strip() for item in value.split(',') if item.strip()]
+
+    # A single value is kept as is
+    if len(items) == 1 and ',' not in value:
+        return items
+
+    return [item for item in items if item and item.lower() not in UNKNOWN]
+
+
+def parse_date(value):
+    """Safely parse date string"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def lookup_name(value):
+    """Name of a class or manufacturer, None when unknown"""
+    if not value or value.lower() in UNKNOWN:
+        return None
+    return value.strip()
+
+
+def description(value):
+    """Climate or terrain description, 'unknown' when missing"""
+    if not value or value.lower() in UNKNOWN:
+        return 'unknown'
+    return value.strip()
+
+
+def _names(value):
+    """Known names of a comma-separated value"""
+    return [name for name in split_comma_separated(value) if name.lower() not in UNKNOWN]
+
+
+def _ids(urls, values):
+    """Ids in the URLs of `values`, through the index `urls`"""
+    return list(map(urls.id, values or []))
+
+
+# =============================================================================
+# RESOURCES - Each returns {id: fields} and {relation: [(id, target), ...]}
+# =============================================================================
+
+def prepare_films(items, urls):
+    rows = {}
+    for item in items:
+        rows[urls.id(item['url'])] = {
+            'title': item['title'],
+            'episode_id': item['episode_id'],
+            'opening_crawl': item['opening_crawl'],
+            'director': item['director'],
+            'producer': item['producer'],
+            'release_date': parse_date(item['release_date']),
+        }
+    return rows, {}
+
+
+def prepare_planets(items, urls):
+    rows, films = {}, []
+    for item in items:
+        planet_id = urls.id(item['url'])
+        rows[planet_id] = {
+            'name': item['name'],
+            'rotation_period': item.get('rotation_period', '0'),
+            'orbital_period': item.get('orbital_period', '0'),
+            'diameter': item.get('diameter', '0'),
+            'gravity': item.get('gravity', '1'),
+            'surface_water': item.get('surface_water', '0'),
+            'population': item.get('population', '0'),
+            'climate': description(item['climate']),
+            'terrain': description(item['terrain']),
+        }
+        films.extend((planet_id, film_id) for film_id in _ids(urls, item.get('films')))
+    return rows, {'planet_films': films}
+
+
+def prepare_species(items, urls):
+    rows = {}
+    relations = {'species_eye_colors': [], 'species_hair_colors': [], 'species_skin_colors': [], 'species_films': []}
+    for item in items:
+        species_id = urls.id(item['url'])
+        rows[species_id] = {
+            'name': item['name'],
+            'classification': item.get('classification', ''),
+            'designation': item.get('designation', ''),
+            'average_height': item.get('average_height', ''),
+            'average_lifespan': item.get('average_lifespan', ''),
+            'language': item.get('language', ''),
+            'homeworld': urls.id(item.get('homeworld')),
+        }
+        for color in ('eye', 'hair', 'skin'):
+            relations[f'species_{color}_colors'].extend(
+                (species_id, name) for name in _names(item.get(f'{color}_colors', ''))
+            )
+        relations['species_films'].extend((species_id, film_id) for film_id in _ids(urls, item.get('films')))
+    return rows, relations
+
+
+def prepare_people(items, urls):
+    rows = {}
+    relations = {
+        'people_eye_colors': [], 'people_hair_colors': [], 'people_skin_colors': [],
+        'people_films': [], 'people_species': [], 'vehicle_pilots': [], 'starship_pilots': [],
+    }
+    for item in items:
+        person_id = urls.id(item['url'])
+        rows[person_id] = {
+            'name': item['name'],
+            'birth_year': item.get('birth_year', ''),
+            'gender': item.get('gender', ''),
+            'height': item.get('height', ''),
+            'mass': item.get('mass', ''),
+            'homeworld': urls.id(item.get('homeworld')),
+        }
+        for color in ('eye', 'hair', 'skin'):
+            relations[f'people_{color}_colors'].extend(
+                (person_id, name) for name in _names(item.get(f'{color}_color', ''))
+            )
+        relations['people_films'].extend((person_id, film_id) for film_id in _ids(urls, item.get('films')))
+        relations['people_species'].extend((person_id, species_id) for species_id in _ids(urls, item.get('species')))
+        relations['vehicle_pilots'].extend((person_id, vehicle_id) for vehicle_id in _ids(urls, item.get('vehicles')))
+        relations['starship_pilots'].extend(
+            (person_id, starship_id) for starship_id in _ids(urls, item.get('starships'))
+        )
+    return rows, relations
+
+
+def prepare_vehicles(items, urls):
+    rows, relations = {}, {'vehicle_manufacturers': [], 'vehicle_films': []}
+    for item in items:
+        vehicle_id = urls.id(item['url'])
+        rows[vehicle_id] = {
+            'name': item['name'],
+            'model': item.get('model', ''),
+            'vehicle_class': lookup_name(item.get('vehicle_class')),
+            'length': item.get('length', ''),
+            'cost_in_credits': item.get('cost_in_credits', ''),
+            'crew': item.get('crew', ''),
+            'passengers': item.get('passengers', ''),
+            'max_atmosphering_speed': item.get('max_atmosphering_speed', ''),
+            'cargo_capacity': item.get('cargo_capacity', ''),
+            'consumables': item.get('consumables', ''),
+        }
+        relations['vehicle_manufacturers'].extend(
+            (vehicle_id, name) for name in _names(item.get('manufacturer', ''))
+        )
+        relations['vehicle_films'].extend((vehicle_id, film_id) for film_id in _ids(urls, item.get('films')))
+    return rows, relations
+
+
+def prepare_starships(items, urls):
+    rows, relations = {}, {'starship_manufacturers': [], 'starship_films': []}
+    for item in items:
+        starship_id = urls.id(item['url'])
+        rows[starship_id] = {
+            'name': item['name'],
+            'model': item.get('model', ''),
+            'starship_class': lookup_name(item.get('starship_class')),
+            'cost_in_credits': item.get('cost_in_credits', ''),
+            'length': item.get('length', ''),
+            'crew': item.get('crew', ''),
+            'passengers': item.get('passengers', ''),
+            'max_atmosphering_speed': item.get('max_atmosphering_speed', ''),
+            'hyperdrive_rating': item.get('hyperdrive_rating', ''),
+            'MGLT': item.get('MGLT', ''),
+            'cargo_capacity': item.get('cargo_capacity', ''),
+            'consumables': item.get('consumables', ''),
+        }
+        relations['starship_manufacturers'].extend(
+            (starship_id, name) for name in _names(item.get('manufacturer', ''))
+        )
+        relations['starship_films'].extend((starship_id, film_id) for film_id in _ids(urls, item.get('films')))
+    return rows, relations
+
+
+PREPARERS = {
+    'films': prepare_films,
+    'planets': prepare_planets,
+    'species': prepare_species,
+    'people': prepare_people,
+    'vehicles': prepare_vehicles,
+    'starships': prepare_starships,
+}
+
+
+# Relation -> (junction model name, source field, source resource, target field, target lookup or resource)
+RELATIONS = {
+    'species_eye_colors': ('SpeciesEyeColors', 'species', 'species', 'eye_color', 'eye_colors'),
+    'species_hair_colors': ('SpeciesHairColors', 'species', 'species', 'hair_color', 'hair_colors'),
+    'species_skin_colors': ('SpeciesSkinColors', 'species', 'species', 'skin_color', 'skin_colors'),
+    'people_eye_colors': ('PeopleEyeColors', 'person', 'people', 'eye_color', 'eye_colors'),
+    'people_hair_colors': ('PeopleHairColors', 'person', 'people', 'hair_color', 'hair_colors'),
+    'people_skin_colors': ('PeopleSkinColors', 'person', 'people', 'skin_color', 'skin_colors'),
+    'vehicle_manufacturers': ('VehicleManufacturerRelations', 'vehicle', 'vehicles', 'manufacturer',
+                              'vehicle_manufacturers'),
+    'starship_manufacturers': ('StarshipManufacturerRelations', 'starship', 'starships', 'manufacturer',
+                               'starship_manufacturers'),
+    'planet_films': ('PlanetFilms', 'planet', 'planets', 'film', 'films'),
+    'species_films': ('SpeciesFilms', 'species', 'species', 'film', 'films'),
+    'people_films': ('PeopleFilms', 'person', 'people', 'film', 'films'),
+    'people_species': ('PeopleSpecies', 'person', 'people', 'species', 'species'),
+    'vehicle_pilots': ('VehiclePilots', 'pilot', 'people', 'vehicle', 'vehicles'),
+    'starship_pilots': ('StarshipPilots', 'pilot', 'people', 'starship', 'starships'),
+    'vehicle_films': ('VehicleFilms', 'vehicle', 'vehicles', 'film', 'films'),
+    'starship_films': ('StarshipFilms', 'starship', 'starships', 'film', 'films'),
+}
+
+# The relations between two entities, as opposed to an entity and a static value
+ENTITY_RELATIONS = {relation: spec for relation, spec in RELATIONS.items() if spec[4] in PREPARERS}
+
+
+def prepare(resource, items):
+    """Rows and relations of one resource; runs in a worker"""
+    urls = UrlIndex()
+    rows, relations = PREPARERS[resource](items, urls)
+    ids = [urls.id(item['url']) for item in items]
+    for field, values in typed_columns(resource, items).items():
+        for pk, value in zip(ids, values):
+            rows[pk][field] = value
+    return rows, relations
+
+
+def lookup_names(data):
+    """Every static value the payload mentions, per lookup table"""
+    names = {
+        'climates': set(), 'terrains': set(), 'eye_colors': set(), 'hair_colors': set(), 'skin_colors': set(),
+        'starship_classes': set(), 'starship_manufacturers': set(), 'vehicle_classes': set(),
+        'vehicle_manufacturers': set(),
+    }
+    for item in data.get('planets', []):
+        names['climates'].add(description(item['climate']))
+        names['terrains'].add(description(item['terrain']))
+    for item in data.get('species', []):
+        for color in ('eye', 'hair', 'skin'):
+            names[f'{color}_colors'].update(_names(item.get(f'{color}_colors', '')))
+    for item in data.get('people', []):
+        for color in ('eye', 'hair', 'skin'):
+            names[f'{color}_colors'].update(_names(item.get(f'{color}_color', '')))
+    for resource in ('vehicles', 'starships'):
+        kind = resource[:-1]
+        for item in data.get(resource, []):
+            names[f'{kind}_classes'].add(lookup_name(item.get(f'{kind}_class')))
+            names[f'{kind}_manufacturers'].update(_names(item.get('manufacturer', '')))
+        names[f'{kind}_classes'].discard(None)
+    return names
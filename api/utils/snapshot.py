@@ -0,0 +1,186 @@
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+
+from rest_framework.renderers import JSONRenderer
+
+# File layout:
+#   header | documents, offsets table and names per resource | index (JSON)
+# Each document is stored followed by a comma, so a contiguous page of
+# documents is a single slice of the mapped file.
+MAGIC = b'SWAPISNP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIQQ')
+OFFSET = struct.Struct('<Q')
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing or malformed"""
+
+
+def build_snapshot(path, resources):
+    """
+    Write an immutable snapshot of the API list documents to `path`.
+
+    `resources` maps a resource name to a (queryset, serializer_class,
+    search_field) tuple. The file is written next to `path` and moved into
+    place atomically, so readers never see a partial snapshot.
+    """
+    renderer = JSONRenderer()
+    index = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'resources': {},
+    }
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+
+        for name, (queryset, serializer_class, search_field) in resources.items():
+            offsets = []
+            names = []
+            # The pk breaks ties the way the list views do, so pages hold the same documents.
+            for obj in queryset.order_by(*queryset.model._meta.ordering, 'pk').iterator():
+                offsets.append(f.tell())
+                f.write(renderer.render(serializer_class(obj).data))
+                f.write(b',')
+                names.append(str(getattr(obj, search_field)).lower().replace('\n', ' '))
+            offsets.append(f.tell())
+
+            offsets_at = f.tell()
+            for offset in offsets:
+                f.write(OFFSET.pack(offset))
+
+            names_at = f.tell()
+            names_blob = '\n'.join(names).encode('utf-8')
+            f.write(names_blob)
+
+            index['resources'][name] = {
+                'count': len(names),
+                'search_field': search_field,
+                'offsets_at': offsets_at,
+                'names_at': names_at,
+                'names_length': len(names_blob),
+            }
+
+        index_blob = json.dumps(index).encode('utf-8')
+        index_at = f.tell()
+        f.write(index_blob)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, index_at, len(index_blob)))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return index
+
+
+class DocumentSequence:
+    """Lazy sequence of snapshot documents, sliceable by the paginator"""
+
+    def __init__(self, reader, resource, positions):
+        self.reader = reader
+        self.resource = resource
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.reader.document(self.resource, p) for p in self.positions[item]]
+        return self.reader.document(self.resource, self.positions[item])
+
+
+class SnapshotReader:
+    """Read-only, memory-mapped view over a snapshot file"""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {e}") from e
+
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+        self._view = memoryview(self._mmap)
+        try:
+            magic, version, index_at, index_length = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != FORMAT_VERSION or not index_at:
+                raise ValueError('bad header')
+            self.index = json.loads(self._mmap[index_at:index_at + index_length])
+            if not isinstance(self.index.get('resources'), dict):
+                raise ValueError('bad index')
+        except (struct.error, ValueError, AttributeError) as e:
+            raise SnapshotError(f"{path} is not a valid snapshot file") from e
+        self._names = {}
+
+    def resource(self, resource):
+        try:
+            return self.index['resources'][resource]
+        except KeyError:
+            raise SnapshotError(f"Snapshot {self.path} has no '{resource}' resource")
+
+    def _offset(self, meta, position):
+        try:
+            return OFFSET.unpack_from(self._mmap, meta['offsets_at'] + position * OFFSET.size)[0]
+        except struct.error as e:
+            raise SnapshotError(f"Snapshot {self.path} is truncated") from e
+
+    def document(self, resource, position):
+        """Return the JSON document at `position` without copying it"""
+        meta = self.resource(resource)
+        start = self._offset(meta, position)
+        end = self._offset(meta, position + 1) - 1  # drop the separator
+        return self._view[start:end]
+
+    def names(self, resource):
+        """Lower-cased search values of a resource, decoded once per process"""
+        if resource not in self._names:
+            meta = self.resource(resource)
+            start = meta['names_at']
+            blob = self._mmap[start:start + meta['names_length']].decode('utf-8')
+            self._names[resource] = blob.split('\n') if meta['count'] else []
+        return self._names[resource]
+
+    def search(self, resource, value):
+        """Positions whose search field contains `value`, case-insensitively"""
+        value = value.lower()
+        return [i for i, name in enumerate(self.names(resource)) if value in name]
+
+    def documents(self, resource, search=None):
+        positions = range(self.resource(resource)['count'])
+        if search:
+            positions = self.search(resource, search)
+        return DocumentSequence(self, resource, positions)
+
+
+_readers = {}
+
+
+def get_snapshot_reader(path):
+    """Return a per-process reader for `path`, reopening it after a rebuild"""
+    path = os.fspath(path)
+    reader = _readers.get(path)
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise SnapshotError(f"Cannot open snapshot {path}: {e}") from e
+
+    if reader is None or reader.identity != (stat.st_ino, stat.st_mtime_ns):
+        reader = _readers[path] = SnapshotReader(path)
+    return reader
+
+
+def render_page(count, next_link, previous_link, documents):
+    """Assemble a paginated response body from raw JSON documents"""
+    return b''.join((
+        b'{"count":', str(count).encode(),
+        b',"next":', json.dumps(next_link).encode(),
+        b',"previous":', json.dumps(previous_link).encode(),
+        b',"results":[', b','.join(documents), b']}',
+    ))
@@ -0,0 +1,97 @@
+from django.db.models import Count
+
+from api.models import (
+    Films, Planets, People, Species, Vehicles, Starships,
+    PlanetFilms, PeopleFilms, SpeciesFilms, VehicleFilms, VehiclePilots,
+    VehicleManufacturerRelations, StarshipFilms, StarshipPilots, StarshipManufacturerRelations,
+)
+from api.utils.cache import get_cached, get_data_version, set_cached
+from api.utils.counts import relation_count
+
+STATS_KEY = 'swapi:stats:{version}'
+TOP_LIMIT = 10
+
+
+def _group_counts(queryset, field):
+    """Row counts per value of `field`, most frequent first; rows without one are left out"""
+    rows = queryset.order_by().exclude(**{f'{field}__isnull': True}).values(field).annotate(
+        count=Count('*')
+    ).order_by('-count', field)
+    return {str(row[field]): row['count'] for row in rows}
+
+
+def _unassigned_count(queryset, field):
+    """Rows whose nullable foreign key `field` is not set"""
+    return queryset.filter(**{f'{field}__isnull': True}).count()
+
+
+def _top_by_pilots(queryset, pilots_model, field):
+    """The entries with the most pilots"""
+    rows = queryset.annotate(
+        pilot_count=relation_count(pilots_model, field)
+    ).filter(pilot_count__gt=0).order_by('-pilot_count', 'name').values('id', 'name', 'pilot_count')[:TOP_LIMIT]
+    return [{'id': row['id'], 'name': row['name'], 'pilots': row['pilot_count']} for row in rows]
+
+
+def compute_stats():
+    """Aggregate counts for every resource, each computed with GROUP BY in SQL"""
+    films = Films.objects.annotate(
+        characters=relation_count(PeopleFilms, 'film'),
+        planets=relation_count(PlanetFilms, 'film'),
+        starships=relation_count(StarshipFilms, 'film'),
+        vehicles=relation_count(VehicleFilms, 'film'),
+        species=relation_count(SpeciesFilms, 'film'),
+    ).values('id', 'title', 'episode_id', 'characters', 'planets', 'starships', 'vehicles', 'species')
+
+    return {
+        'people': {
+            'count': People.objects.count(),
+            'by_gender': _group_counts(People.objects.all(), 'gender'),
+            'by_homeworld': _group_counts(People.objects.all(), 'homeworld__name'),
+            # Counted apart: a real planet is named "unknown".
+            'without_homeworld': _unassigned_count(People.objects.all(), 'homeworld'),
+        },
+        'planets': {
+            'count': Planets.objects.count(),
+            'by_climate': _group_counts(Planets.objects.all(), 'climate__description'),
+            'by_terrain': _group_counts(Planets.objects.all(), 'terrain__description'),
+            'without_climate': _unassigned_count(Planets.objects.all(), 'climate'),
+            'without_terrain': _unassigned_count(Planets.objects.all(), 'terrain'),
+        },
+        'species': {
+            'count': Species.objects.count(),
+            'by_classification': _group_counts(Species.objects.all(), 'classification'),
+            'by_designation': _group_counts(Species.objects.all(), 'designation'),
+        },
+        'starships': {
+            'count': Starships.objects.count(),
+            'by_class': _group_counts(Starships.objects.all(), 'starship_class__name'),
+            'by_manufacturer': _group_counts(StarshipManufacturerRelations.objects.all(), 'manufacturer__name'),
+            'top_by_pilots': _top_by_pilots(Starships.objects.all(), StarshipPilots, 'starship'),
+        },
+        'vehicles': {
+            'count': Vehicles.objects.count(),
+            'by_class': _group_counts(Vehicles.objects.all(), 'vehicle_class__name'),
+            'by_manufacturer': _group_counts(VehicleManufacturerRelations.objects.all(), 'manufacturer__name'),
+            'top_by_pilots': _top_by_pilots(Vehicles.objects.all(), VehiclePilots, 'vehicle'),
+        },
+        'films': {
+            'count': len(films),
+            'by_film': list(films),
+        },
+    }
+
+
+def refresh_stats():
+    """Compute the stats for the current data version and cache them"""
+    stats = compute_stats()
+    set_cached(STATS_KEY.format(version=get_data_version()), stats)
+    return stats
+
+
+def get_stats():
+    """Cached stats of the current data version, computed on a miss"""
+    stats = get_cached(STATS_KEY.format(version=get_data_version()))
+    if stats is None:
+        stats = refresh_stats()
+    return stats
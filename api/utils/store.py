@@ -0,0 +1,246 @@
+import sys
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+from api.models import (
+    Films, Planets, People, Species, Vehicles, Starships,
+    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, SpeciesEyeColors,
+    SpeciesHairColors, SpeciesSkinColors, VehicleFilms, VehiclePilots,
+    VehicleManufacturerRelations, StarshipFilms, StarshipPilots,
+    StarshipManufacturerRelations, PeopleEyeColors, PeopleHairColors, PeopleSkinColors
+)
+from api.utils.cache import get_data_version
+
+
+def _intern(value):
+    """Share one copy of repeated strings such as genders, climates and class names"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# =============================================================================
+# RECORDS - One per entity, same fields and order as the list serializers
+# =============================================================================
+
+class Record:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def as_dict(self):
+        data = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            data[field] = list(value) if type(value) is tuple else value
+        return data
+
+
+class FilmRecord(Record):
+    __slots__ = ('id', 'title', 'episode_id', 'director', 'producer', 'release_date')
+
+
+class PlanetRecord(Record):
+    __slots__ = (
+        'id', 'name', 'rotation_period', 'orbital_period', 'diameter',
+        'climate', 'gravity', 'terrain', 'surface_water', 'population'
+    )
+
+
+class PersonRecord(Record):
+    __slots__ = (
+        'id', 'name', 'height', 'mass', 'hair_colors', 'skin_colors',
+        'eye_colors', 'birth_year', 'gender', 'homeworld'
+    )
+
+
+class SpeciesRecord(Record):
+    __slots__ = (
+        'id', 'name', 'classification', 'designation',
+        'average_height', 'average_lifespan', 'homeworld', 'language',
+        'skin_colors', 'hair_colors', 'eye_colors'
+    )
+
+
+class VehicleRecord(Record):
+    __slots__ = (
+        'id', 'name', 'model', 'vehicle_class', 'length',
+        'cost_in_credits', 'crew', 'passengers', 'manufacturers',
+        'max_atmosphering_speed', 'cargo_capacity', 'consumables'
+    )
+
+
+class StarshipRecord(Record):
+    __slots__ = (
+        'id', 'name', 'model', 'starship_class', 'length',
+        'cost_in_credits', 'crew', 'passengers', 'hyperdrive_rating',
+        'manufacturers', 'max_atmosphering_speed', 'cargo_capacity',
+        'consumables', 'MGLT'
+    )
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+# Relation name -> (junction model, source field, target field, target resource)
+RELATIONS = {
+    'film_characters': (PeopleFilms, 'film', 'person', 'people'),
+    'film_planets': (PlanetFilms, 'film', 'planet', 'planets'),
+    'film_starships': (StarshipFilms, 'film', 'starship', 'starships'),
+    'film_vehicles': (VehicleFilms, 'film', 'vehicle', 'vehicles'),
+    'film_species': (SpeciesFilms, 'film', 'species', 'species'),
+    'planet_residents': (People, 'homeworld', 'id', 'people'),
+    'planet_films': (PlanetFilms, 'planet', 'film', 'films'),
+    'person_films': (PeopleFilms, 'person', 'film', 'films'),
+    'person_species': (PeopleSpecies, 'person', 'species', 'species'),
+    'person_vehicles': (VehiclePilots, 'pilot', 'vehicle', 'vehicles'),
+    'person_starships': (StarshipPilots, 'pilot', 'starship', 'starships'),
+    'species_people': (PeopleSpecies, 'species', 'person', 'people'),
+    'species_films': (SpeciesFilms, 'species', 'film', 'films'),
+    'vehicle_pilots': (VehiclePilots, 'vehicle', 'pilot', 'people'),
+    'vehicle_films': (VehicleFilms, 'vehicle', 'film', 'films'),
+    'starship_pilots': (StarshipPilots, 'starship', 'pilot', 'people'),
+    'starship_films': (StarshipFilms, 'starship', 'film', 'films'),
+}
+
+
+class EntityStore:
+    """
+    Read-only copy of everything the nested list serializers render.
+
+    Each entity is a `__slots__` record with interned strings, and each
+    relation maps a primary key to a tuple of related keys in the order the
+    ORM returns them (the related model's default ordering).
+    """
+
+    def __init__(self):
+        self.resources = {}  # resource -> {pk: record}
+        self.relations = {}  # relation -> {pk: (related pk, ...)}
+
+    @classmethod
+    def build(cls):
+        """Load the store with one query per table"""
+        store = cls()
+        people_colors = [
+            _names(PeopleHairColors, 'person', 'hair_color__color'),
+            _names(PeopleSkinColors, 'person', 'skin_color__color'),
+            _names(PeopleEyeColors, 'person', 'eye_color__color'),
+        ]
+        species_colors = [
+            _names(SpeciesSkinColors, 'species', 'skin_color__color'),
+            _names(SpeciesHairColors, 'species', 'hair_color__color'),
+            _names(SpeciesEyeColors, 'species', 'eye_color__color'),
+        ]
+        vehicle_manufacturers = _names(VehicleManufacturerRelations, 'vehicle', 'manufacturer__name')
+        starship_manufacturers = _names(StarshipManufacturerRelations, 'starship', 'manufacturer__name')
+
+        store.resources['films'] = _records(
+            FilmRecord, Films.objects.values_list(
+                'id', 'title', 'episode_id', 'director', 'producer', 'release_date'
+            ),
+            lambda row: row[:5] + (row[5].isoformat(),),
+        )
+        store.resources['planets'] = _records(
+            PlanetRecord, Planets.objects.values_list(
+                'id', 'name', 'rotation_period', 'orbital_period', 'diameter',
+                'climate__description', 'gravity', 'terrain__description', 'surface_water', 'population'
+            ),
+        )
+        hair, skin, eye = people_colors
+        store.resources['people'] = _records(
+            PersonRecord, People.objects.values_list(
+                'id', 'name', 'height', 'mass', 'birth_year', 'gender', 'homeworld__name'
+            ),
+            lambda row: row[:4] + (hair[row[0]], skin[row[0]], eye[row[0]]) + row[4:],
+        )
+        skin, hair, eye = species_colors
+        store.resources['species'] = _records(
+            SpeciesRecord, Species.objects.values_list(
+                'id', 'name', 'classification', 'designation',
+                'average_height', 'average_lifespan', 'homeworld__name', 'language'
+            ),
+            lambda row: row + (skin[row[0]], hair[row[0]], eye[row[0]]),
+        )
+        store.resources['vehicles'] = _records(
+            VehicleRecord, Vehicles.objects.values_list(
+                'id', 'name', 'model', 'vehicle_class__name', 'length',
+                'cost_in_credits', 'crew', 'passengers',
+                'max_atmosphering_speed', 'cargo_capacity', 'consumables'
+            ),
+            lambda row: row[:8] + (vehicle_manufacturers[row[0]],) + row[8:],
+        )
+        store.resources['starships'] = _records(
+            StarshipRecord, Starships.objects.values_list(
+                'id', 'name', 'model', 'starship_class__name', 'length',
+                'cost_in_credits', 'crew', 'passengers', 'hyperdrive_rating',
+                'max_atmosphering_speed', 'cargo_capacity', 'consumables', 'MGLT'
+            ),
+            lambda row: row[:9] + (starship_manufacturers[row[0]],) + row[9:],
+        )
+
+        # Records are inserted in default model ordering, so their position
+        # orders the related keys the same way the ORM would.
+        positions = {
+            resource: {pk: position for position, pk in enumerate(records)}
+            for resource, records in store.resources.items()
+        }
+        for relation, (model, source, target, resource) in RELATIONS.items():
+            related = defaultdict(list)
+            rows = model.objects.order_by().filter(**{f'{source}__isnull': False})
+            for source_id, target_id in rows.values_list(f'{source}_id', target if target == 'id' else f'{target}_id'):
+                related[source_id].append(target_id)
+            position = positions[resource]
+            store.relations[relation] = {
+                pk: tuple(sorted(pks, key=position.__getitem__)) for pk, pks in related.items()
+            }
+        return store
+
+    def related(self, relation, pk):
+        """List representations of the entities related to `pk`"""
+        records = self.resources[RELATIONS[relation][3]]
+        return [records[related].as_dict() for related in self.relations[relation].get(pk, ())]
+
+    def record(self, resource, pk):
+        return self.resources[resource].get(pk)
+
+
+def _names(model, source, name_field):
+    """Sorted, interned names per source key, e.g. the eye colors of each person"""
+    names = defaultdict(list)
+    for source_id, name in model.objects.order_by(name_field).values_list(f'{source}_id', name_field):
+        names[source_id].append(_intern(name))
+    return defaultdict(tuple, {pk: tuple(values) for pk, values in names.items()})
+
+
+def _records(record_class, rows, arrange=None):
+    """Records keyed by primary key, in the queryset order"""
+    records = {}
+    for row in rows:
+        if arrange is not None:
+            row = arrange(row)
+        records[row[0]] = record_class(*map(_intern, row))
+    return records
+
+
+_lock = threading.Lock()
+_store = None
+_store_version = None
+
+
+def get_entity_store():
+    """Per-process store of the current data version, or None when disabled"""
+    global _store, _store_version
+
+    if not settings.SWAPI_ENTITY_STORE:
+        return None
+
+    version = get_data_version()
+    if _store is None or _store_version != version:
+        with _lock:
+            if _store is None or _store_version != version:
+                _store = EntityStore.build()
+                _store_version = version
+    return _store
@@ -0,0 +1,109 @@
+import random
+
+BASE_URL = 'https://swapi.dev/api/'
+
+COLORS = ['blue', 'brown', 'green', 'red', 'yellow', 'black', 'white', 'grey', 'n/a', 'unknown']
+CLIMATES = ['arid', 'temperate', 'tropical', 'frozen', 'murky', 'unknown', 'temperate, tropical']
+TERRAINS = ['desert', 'grasslands, mountains', 'jungle, rainforests', 'ocean', 'unknown']
+GENDERS = ['male', 'female', 'n/a', 'hermaphrodite']
+MANUFACTURERS = ['Corellia Mining Corporation', 'Incom Corporation, Subpro Corporation', 'Kuat Drive Yards', 'unknown']
+CLASSES = ['wheeled', 'repulsorcraft', 'starfighter', 'corvette', 'Star Destroyer']
+
+# Entities per resource at scale 1, roughly the size of the real SWAPI dataset
+COUNTS = {'films': 6, 'planets': 60, 'species': 37, 'people': 82, 'vehicles': 39, 'starships': 36}
+
+
+def _url(resource, pk):
+    return f"{BASE_URL}{resource}/{pk}/"
+
+
+def _sample(rng, resource, counts, low, high):
+    return [_url(resource, pk) for pk in sorted(rng.sample(range(1, counts[resource] + 1), rng.randint(low, high)))]
+
+
+def generate_swapi_data(scale=1, seed=0):
+    """
+    Deterministic SWAPI-shaped payload with `scale` times the entities.
+
+    Used to benchmark the importer on datasets larger than the real one.
+    """
+    rng = random.Random(seed)
+    counts = {resource: count * scale for resource, count in COUNTS.items()}
+    data = {}
+
+    data['films'] = [{
+        'title': f"Film {pk}",
+        'episode_id': pk,
+        'opening_crawl': "It is a period of civil war. " * 10,
+        'director': 'George Lucas',
+        'producer': 'Gary Kurtz, Rick McCallum',
+        'release_date': f"{1977 + pk % 40}-05-25",
+        'url': _url('films', pk),
+    } for pk in range(1, counts['films'] + 1)]
+
+    data['planets'] = [{
+        'name': f"Planet {pk}",
+        'rotation_period': str(rng.randint(10, 40)),
+        'orbital_period': str(rng.randint(200, 600)),
+        'diameter': rng.choice(['10465', '0', 'unknown', '118000']),
+        'climate': rng.choice(CLIMATES),
+        'gravity': '1 standard',
+        'terrain': rng.choice(TERRAINS),
+        'surface_water': rng.choice(['1', '40', 'unknown']),
+        'population': rng.choice(['200000', '1000000000000', 'unknown']),
+        'films': _sample(rng, 'films', counts, 1, 3),
+        'url': _url('planets', pk),
+    } for pk in range(1, counts['planets'] + 1)]
+
+    data['species'] = [{
+        'name': f"Species {pk}",
+        'classification': rng.choice(['mammal', 'reptile', 'artificial']),
+        'designation': 'sentient',
+        'average_height': rng.choice(['180', 'n/a', 'unknown']),
+        'skin_colors': ', '.join(rng.sample(COLORS, 2)),
+        'hair_colors': rng.choice(COLORS),
+        'eye_colors': ', '.join(rng.sample(COLORS, 3)),
+        'average_lifespan': rng.choice(['120', 'indefinite', 'unknown']),
+        'homeworld': rng.choice([None, _url('planets', rng.randint(1, counts['planets']))]),
+        'language': 'Galactic Basic',
+        'films': _sample(rng, 'films', counts, 1, 3),
+        'url': _url('species', pk),
+    } for pk in range(1, counts['species'] + 1)]
+
+    data['people'] = [{
+        'name': f"Person {pk}",
+        'height': rng.choice(['172', 'unknown', '96']),
+        'mass': rng.choice(['77', '1,358', 'unknown', '80.5']),
+        'hair_color': rng.choice(COLORS),
+        'skin_color': ', '.join(rng.sample(COLORS, 2)),
+        'eye_color': rng.choice(COLORS),
+        'birth_year': rng.choice(['19BBY', '41.9BBY', 'unknown', '22ABY']),
+        'gender': rng.choice(GENDERS),
+        'homeworld': _url('planets', rng.randint(1, counts['planets'])),
+        'films': _sample(rng, 'films', counts, 1, 4),
+        'species': _sample(rng, 'species', counts, 0, 1),
+        'vehicles': _sample(rng, 'vehicles', counts, 0, 2),
+        'starships': _sample(rng, 'starships', counts, 0, 2),
+        'url': _url('people', pk),
+    } for pk in range(1, counts['people'] + 1)]
+
+    for resource, class_field in (('vehicles', 'vehicle_class'), ('starships', 'starship_class')):
+        data[resource] = [{
+            'name': f"{resource[:-1].title()} {pk}",
+            'model': 'CR90 corvette',
+            'manufacturer': rng.choice(MANUFACTURERS),
+            'cost_in_credits': rng.choice(['150000', '1,000,000,000,000', 'unknown']),
+            'length': rng.choice(['36.8', '1,600']),
+            'max_atmosphering_speed': rng.choice(['950', '1000km', 'n/a']),
+            'crew': rng.choice(['46', '30-165', '342,953']),
+            'passengers': '30',
+            'cargo_capacity': '50000',
+            'consumables': '2 months',
+            'hyperdrive_rating': '2.0',
+            'MGLT': '60',
+            class_field: rng.choice(CLASSES),
+            'films': _sample(rng, 'films', counts, 1, 2),
+            'url': _url(resource, pk),
+        } for pk in range(1, counts[resource] + 1)]
+
+    return data
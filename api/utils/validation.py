@@ -0,0 +1,232 @@
+"""
+Validation of the SWAPI payload before it is imported.
+
+Every record is checked against the schema of its resource in one pass:
+the fields the importers read must be present and of the right type (null
+only where the column allows it, dates in the format the importers parse),
+the URL must carry an id that no earlier record of the resource took, and the
+classes of vehicles and starships must be known, as their foreign keys
+are not nullable. Failing records are left out of the import; relation
+URLs pointing at no valid record are dropped from theirs. Both end up as
+dead letters, one JSON object per line, with the reason.
+"""
+import json
+import os
+import time
+
+from api.utils.rows import extract_id, lookup_name, parse_date
+
+# Stored in a NOT NULL column: a string, or absent for the importer's default
+TEXT = (str,)
+# Split into names (colors, manufacturers): null means none
+OPTIONAL_TEXT = (str, type(None))
+
+# Resource -> {field: (allowed types, required)}, besides the url
+SCHEMAS = {
+    'films': {
+        'title': (TEXT, True),
+        'episode_id': ((int,), True),
+        'opening_crawl': (TEXT, True),
+        'director': (TEXT, True),
+        'producer': (TEXT, True),
+        'release_date': (TEXT, True),
+    },
+    'planets': {
+        'name': (TEXT, True),
+        'climate': (TEXT, True),
+        'terrain': (TEXT, True),
+        **{field: (TEXT, False) for field in (
+            'rotation_period', 'orbital_period', 'diameter', 'gravity', 'surface_water', 'population',
+        )},
+    },
+    'species': {
+        'name': (TEXT, True),
+        **{field: (TEXT, False) for field in (
+            'classification', 'designation', 'average_height', 'average_lifespan', 'language',
+        )},
+        **{field: (OPTIONAL_TEXT, False) for field in ('eye_colors', 'hair_colors', 'skin_colors')},
+    },
+    'people': {
+        'name': (TEXT, True),
+        **{field: (TEXT, False) for field in ('birth_year', 'gender', 'height', 'mass')},
+        **{field: (OPTIONAL_TEXT, False) for field in ('eye_color', 'hair_color', 'skin_color')},
+    },
+    'vehicles': {
+        'name': (TEXT, True),
+        'vehicle_class': (OPTIONAL_TEXT, True),
+        'manufacturer': (OPTIONAL_TEXT, False),
+        **{field: (TEXT, False) for field in (
+            'model', 'length', 'cost_in_credits', 'crew', 'passengers',
+            'max_atmosphering_speed', 'cargo_capacity', 'consumables',
+        )},
+    },
+    'starships': {
+        'name': (TEXT, True),
+        'starship_class': (OPTIONAL_TEXT, True),
+        'manufacturer': (OPTIONAL_TEXT, False),
+        **{field: (TEXT, False) for field in (
+            'model', 'cost_in_credits', 'length', 'crew', 'passengers',
+            'max_atmosphering_speed', 'hyperdrive_rating', 'MGLT', 'cargo_capacity', 'consumables',
+        )},
+    },
+}
+
+# Date fields, NOT NULL: they must parse the way the importers parse them
+DATE_FIELDS = {
+    'films': ('release_date',),
+}
+
+# Class fields backed by a non-nullable foreign key
+REQUIRED_LOOKUPS = {
+    'vehicles': 'vehicle_class',
+    'starships': 'starship_class',
+}
+
+# Relation URLs the importers follow: resource -> {field: target resource}.
+# A list of URLs, except for the homeworld.
+REFERENCES = {
+    'planets': {'films': 'films'},
+    'species': {'homeworld': 'planets', 'films': 'films'},
+    'people': {
+        'homeworld': 'planets', 'films': 'films', 'species': 'species',
+        'vehicles': 'vehicles', 'starships': 'starships',
+    },
+    'vehicles': {'films': 'films'},
+    'starships': {'films': 'films'},
+}
+
+
+class ValidationReport:
+    """Outcome of validate_payload(): counts per resource and the dead letters"""
+
+    def __init__(self):
+        self.records = 0
+        self.rejected = {}
+        self.dangling = {}
+        self.dead_letters = []
+        self.elapsed = 0.0
+
+    def reject(self, resource, item, reason):
+        self.rejected[resource] = self.rejected.get(resource, 0) + 1
+        url = item.get('url') if isinstance(item, dict) else None
+        self.dead_letters.append({'resource': resource, 'url': url, 'reason': reason, 'record': item})
+
+    def drop_reference(self, resource, item, field, target_url):
+        self.dangling[resource] = self.dangling.get(resource, 0) + 1
+        self.dead_letters.append({
+            'resource': resource,
+            'url': item['url'],
+            'reason': f"{field} references no valid {REFERENCES[resource][field]} record",
+            'field': field,
+            'target': target_url,
+        })
+
+    @property
+    def rejected_count(self):
+        return sum(self.rejected.values())
+
+    @property
+    def dangling_count(self):
+        return sum(self.dangling.values())
+
+    @property
+    def error_rate(self):
+        return self.rejected_count / self.records if self.records else 0.0
+
+    def summary(self):
+        rate = self.records / self.elapsed if self.elapsed else 0.0
+        return (
+            f"Validated {self.records} records in {self.elapsed * 1000:.1f} ms ({rate:,.0f} records/s): "
+            f"{self.rejected_count} rejected ({self.error_rate:.1%}), "
+            f"{self.dangling_count} dangling relation(s) dropped"
+        )
+
+
+def check_record(resource, item):
+    """Reason `item` cannot be imported, or None"""
+    if not isinstance(item, dict):
+        return f"record is a {type(item).__name__}, not an object"
+    if not isinstance(item.get('url'), str) or extract_id(item['url']) is None:
+        return "url is missing or has no id"
+
+    for field, (types, required) in SCHEMAS[resource].items():
+        if field not in item:
+            if required:
+                return f"{field} is missing"
+        elif not isinstance(item[field], types) or isinstance(item[field], bool):
+            return f"{field} is a {type(item[field]).__name__}, expected {' or '.join(t.__name__ for t in types)}"
+
+    for field in REFERENCES.get(resource, {}):
+        value = item.get(field)
+        if field == 'homeworld':
+            if not isinstance(value, OPTIONAL_TEXT):
+                return f"homeworld is a {type(value).__name__}, expected a URL"
+        elif value is not None and not (isinstance(value, list) and all(isinstance(url, str) for url in value)):
+            return f"{field} is not a list of URLs"
+
+    for field in DATE_FIELDS.get(resource, ()):
+        if parse_date(item[field]) is None:
+            return f"{field} is not a YYYY-MM-DD date"
+
+    field = REQUIRED_LOOKUPS.get(resource)
+    if field and lookup_name(item[field]) is None:
+        return f"{field} is unknown"
+    return None
+
+
+def validate_payload(data):
+    """
+    Split `data` into the records to import and the dead letters.
+
+    Returns the payload without the rejected records and the dangling
+    relation URLs (the records are copied, not modified), and the report.
+    """
+    started = time.perf_counter()
+    report = ValidationReport()
+    valid = {}
+    for resource in SCHEMAS:
+        valid[resource], ids = [], set()
+        for item in data.get(resource) or []:
+            report.records += 1
+            reason = check_record(resource, item)
+            if reason is None and extract_id(item['url']) in ids:
+                reason = "duplicate id"
+            if reason is not None:
+                report.reject(resource, item, reason)
+                continue
+            ids.add(extract_id(item['url']))
+            valid[resource].append(item)
+
+    # Checked against the ids that survived, as the importers only link those.
+    ids = {resource: {extract_id(item['url']) for item in items} for resource, items in valid.items()}
+    for resource, references in REFERENCES.items():
+        for index, item in enumerate(valid[resource]):
+            cleaned = None
+            for field, target in references.items():
+                value = item.get(field)
+                urls = [value] if field == 'homeworld' and value else value or []
+                kept = [url for url in urls if extract_id(url) in ids[target]]
+                if len(kept) == len(urls):
+                    continue
+                for url in urls:
+                    if extract_id(url) not in ids[target]:
+                        report.drop_reference(resource, item, field, url)
+                cleaned = cleaned or dict(item)
+                cleaned[field] = (kept[0] if kept else None) if field == 'homeworld' else kept
+            if cleaned is not None:
+                valid[resource][index] = cleaned
+
+    report.elapsed = time.perf_counter() - started
+    return valid, report
+
+
+def write_dead_letters(path, dead_letters):
+    """Write the dead letters to `path` as JSON lines, replacing the previous run's"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as file:
+        for letter in dead_letters:
+            file.write(json.dumps(letter, ensure_ascii=False, default=str))
+            file.write('\n')
+    os.replace(f'{path}.tmp', path)
@@ -1,77 +1,394 @@
+import logging
+import math
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import ListModelMixin
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from api.filters import PersonFilter, PlanetsFilter, StarshipsFilter, SpeciesFilter, VehiclesFilter, FilmsFilter
-from api.models import People, Planets, Starships, Species, Vehicles, Films
+from api.filters import OrderingFilter, PersonFilter, PlanetsFilter, StarshipsFilter, SpeciesFilter, VehiclesFilter, \
+    FilmsFilter
+from api.models import (
+    People, Planets, Starships, Species, Vehicles, Films,
+    PlanetFilms, PeopleFilms, PeopleSpecies, SpeciesFilms, VehicleFilms, VehiclePilots,
+    StarshipFilms, StarshipPilots,
+)
 from api.paginators import GenericPagination
 from api.serializers import PersonDetailSerializer, PlanetDetailSerializer, StarshipDetailSerializer, \
     SpeciesDetailSerializer, VehicleDetailSerializer, FilmDetailSerializer
-from api.swagger.request_parameters import NAME_PARAMETER, TITLE_PARAMETER
+from api.throttling import DEFAULT_COST, Overloaded, admission
+from api.utils.cache import cached_value, response_cache_key, single_flight
+from api.utils.compression import IDENTITY, compress, negotiate
+from api.utils.counts import relation_count
+from api.utils.graph import NODE_MODELS, get_graph
+from api.utils.snapshot import SnapshotError, get_snapshot_reader, render_page
+from api.utils.stats import get_stats
+from api.utils.store import get_entity_store
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = ('1', 'true', 'yes')
 
 
 class BaseStarWarsAPIView(ListModelMixin, GenericAPIView):
     """Generic base class for all Star Wars API views"""
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     pagination_class = GenericPagination
+    resource_name = None
+    search_field = 'name'
+    # Counts added by ?with_counts=1: name -> (related model, field pointing back here)
+    relation_counts = {}
+    # Keys accepted by ?ordering=: name -> model field, each backed by a (field, id) index
+    ordering_fields = {}
+    # Tokens a default-size page costs per query shape, from `manage.py measure_request_costs`
+    request_costs = {}
+
+    @property
+    def is_schema_view(self):
+        """Instantiated by drf_yasg to introspect the view, without a request"""
+        return getattr(self, 'swagger_fake_view', False) or self.request is None
+
+    @property
+    def with_counts(self):
+        if self.is_schema_view:
+            return False
+        return self.request.query_params.get('with_counts', '').lower() in TRUE_VALUES
+
+    def get_ordering_fields(self):
+        """The ordering whitelist, relation counts included"""
+        return {**self.ordering_fields, **{f'{name}_count': f'{name}_count' for name in self.relation_counts}}
+
+    def get_count_ordering(self, request):
+        """The relation counts ?ordering= sorts by"""
+        if request is None:
+            return []
+        ordering = {term.strip().lstrip('-') for term in request.query_params.get('ordering', '').split(',')}
+        return [name for name in self.relation_counts if f'{name}_count' in ordering]
+
+    def get_query_shape(self, request):
+        """'count_ordering', 'counts' (?with_counts) or 'page', whichever costs the most"""
+        if self.get_count_ordering(request):
+            return 'count_ordering'
+        return 'counts' if self.with_counts else 'page'
+
+    def get_request_cost(self, request):
+        """Tokens of the request: the cost of its shape, scaled by the page size"""
+        cost = self.request_costs.get(self.get_query_shape(request), DEFAULT_COST)
+        return math.ceil(cost * self.paginator.get_page_size(request) / self.paginator.page_size)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        count_ordering = self.get_count_ordering(self.request)
+        counts = {
+            name: relation
+            for name, relation in self.relation_counts.items()
+            if self.with_counts or name in count_ordering
+        }
+        if counts:
+            queryset = queryset.annotate(**{
+                f'{name}_count': relation_count(model, field)
+                for name, (model, field) in counts.items()
+            })
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['entity_store'] = get_entity_store()
+        if self.with_counts:
+            context['relation_counts'] = list(self.relation_counts)
+        return context
+
+    def list(self, request, *args, **kwargs):
+        if settings.SWAPI_RESPONSE_CACHE and request.accepted_renderer.format == 'json':
+            key = response_cache_key(request)
+            try:
+                bodies = single_flight(
+                    key,
+                    lambda: self.admitted(request, lambda: compress(self.render_list(request, *args, **kwargs))),
+                    timeout=settings.SWAPI_RESPONSE_CACHE_TIMEOUT,
+                )
+            except Overloaded:
+                # Shed: a page of an older version is better than none.
+                bodies = cached_value(key)
+                if bodies is None:
+                    raise
+            encoding, content = negotiate(request.META.get('HTTP_ACCEPT_ENCODING'), bodies)
+            response = HttpResponse(content, content_type='application/json')
+            if encoding != IDENTITY:
+                response['Content-Encoding'] = encoding
+            patch_vary_headers(response, ['Accept-Encoding'])
+            return response
+        return self.admitted(request, lambda: self.list_response(request, *args, **kwargs))
+
+    def admitted(self, request, render):
+        """Render uncached work only when admission control lets it in"""
+        with admission.admit(self.get_request_cost(request)):
+            return render()
+
+    def list_response(self, request, *args, **kwargs):
+        if settings.SWAPI_SNAPSHOT_PATH and self.snapshot_supports(request):
+            try:
+                return self.snapshot_list(request)
+            except SnapshotError as error:
+                # A missing or corrupt snapshot costs the database queries, not the response.
+                logger.warning("Serving %s from the database: %s", self.resource_name, error)
+        return super().list(request, *args, **kwargs)
+
+    def render_list(self, request, *args, **kwargs):
+        """The list page as the JSON bytes that are compressed into the response cache"""
+        response = self.list_response(request, *args, **kwargs)
+        if isinstance(response, Response):
+            return request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+        return response.content
+
+    def snapshot_supports(self, request):
+        """The snapshot only holds the plain list pages and the name search"""
+        supported = {self.paginator.page_query_param, self.paginator.page_size_query_param, self.search_field}
+        return supported.issuperset(request.query_params)
+
+    def snapshot_list(self, request):
+        """Serve the list page straight from the memory-mapped snapshot"""
+        reader = get_snapshot_reader(settings.SWAPI_SNAPSHOT_PATH)
+        documents = reader.documents(
+            self.resource_name,
+            search=request.query_params.get(self.search_field),
+        )
+        page = self.paginator.paginate_queryset(documents, request, view=self)
+        body = render_page(
+            self.paginator.page.paginator.count,
+            self.paginator.get_next_link(),
+            self.paginator.get_previous_link(),
+            page,
+        )
+        return HttpResponse(body, content_type='application/json')
 
 
 class PeopleAPIView(BaseStarWarsAPIView):
+    resource_name = 'people'
     queryset = People.objects.all()
     serializer_class = PersonDetailSerializer
     filterset_class = PersonFilter
+    ordering_fields = {
+        'name': 'name',
+        'height': 'height_num',
+        'mass': 'mass_num',
+        'birth_year': 'birth_year_num',
+    }
+    relation_counts = {
+        'films': (PeopleFilms, 'person'),
+        'species': (PeopleSpecies, 'person'),
+        'starships': (StarshipPilots, 'pilot'),
+        'vehicles': (VehiclePilots, 'pilot'),
+    }
+    request_costs = {'page': 20, 'counts': 20, 'count_ordering': 22}
 
-    @swagger_auto_schema(manual_parameters=[NAME_PARAMETER])
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
 class PlanetsAPIView(BaseStarWarsAPIView):
+    resource_name = 'planets'
     queryset = Planets.objects.all()
     serializer_class = PlanetDetailSerializer
     filterset_class = PlanetsFilter
+    ordering_fields = {
+        'name': 'name',
+        'rotation_period': 'rotation_period_num',
+        'orbital_period': 'orbital_period_num',
+        'diameter': 'diameter_num',
+        'surface_water': 'surface_water_num',
+        'population': 'population_num',
+    }
+    relation_counts = {
+        'residents': (People, 'homeworld'),
+        'films': (PlanetFilms, 'planet'),
+    }
+    request_costs = {'page': 9, 'counts': 10, 'count_ordering': 16}
 
-    @swagger_auto_schema(manual_parameters=[NAME_PARAMETER])
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
 class StarshipsAPIView(BaseStarWarsAPIView):
+    resource_name = 'starships'
     queryset = Starships.objects.all()
     serializer_class = StarshipDetailSerializer
     filterset_class = StarshipsFilter
+    ordering_fields = {
+        'name': 'name',
+        'cost_in_credits': 'cost_in_credits_num',
+        'length': 'length_num',
+        'crew': 'crew_max',
+        'passengers': 'passengers_num',
+        'max_atmosphering_speed': 'max_atmosphering_speed_num',
+        'cargo_capacity': 'cargo_capacity_num',
+        'hyperdrive_rating': 'hyperdrive_rating_num',
+        'MGLT': 'MGLT_num',
+    }
+    relation_counts = {
+        'pilots': (StarshipPilots, 'starship'),
+        'films': (StarshipFilms, 'starship'),
+    }
+    request_costs = {'page': 8, 'counts': 8, 'count_ordering': 13}
 
-    @swagger_auto_schema(manual_parameters=[NAME_PARAMETER])
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
 class SpeciesAPIView(BaseStarWarsAPIView):
+    resource_name = 'species'
     queryset = Species.objects.all()
     serializer_class = SpeciesDetailSerializer
     filterset_class = SpeciesFilter
+    ordering_fields = {
+        'name': 'name',
+        'average_height': 'average_height_num',
+        'average_lifespan': 'average_lifespan_num',
+    }
+    relation_counts = {
+        'people': (PeopleSpecies, 'species'),
+        'films': (SpeciesFilms, 'species'),
+    }
+    request_costs = {'page': 9, 'counts': 9, 'count_ordering': 13}
 
-    @swagger_auto_schema(manual_parameters=[NAME_PARAMETER])
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
 class VehiclesAPIView(BaseStarWarsAPIView):
+    resource_name = 'vehicles'
     queryset = Vehicles.objects.all()
     serializer_class = VehicleDetailSerializer
     filterset_class = VehiclesFilter
+    ordering_fields = {
+        'name': 'name',
+        'cost_in_credits': 'cost_in_credits_num',
+        'length': 'length_num',
+        'crew': 'crew_max',
+        'passengers': 'passengers_num',
+        'max_atmosphering_speed': 'max_atmosphering_speed_num',
+        'cargo_capacity': 'cargo_capacity_num',
+    }
+    relation_counts = {
+        'pilots': (VehiclePilots, 'vehicle'),
+        'films': (VehicleFilms, 'vehicle'),
+    }
+    request_costs = {'page': 9, 'counts': 10, 'count_ordering': 16}
 
-    @swagger_auto_schema(manual_parameters=[NAME_PARAMETER])
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
 class FilmsAPIView(BaseStarWarsAPIView):
+    resource_name = 'films'
     queryset = Films.objects.all()
     serializer_class = FilmDetailSerializer
     filterset_class = FilmsFilter
+    ordering_fields = {
+        'title': 'title',
+        'episode_id': 'episode_id',
+        'release_date': 'release_date',
+    }
+    search_field = 'title'
+    relation_counts = {
+        'characters': (PeopleFilms, 'film'),
+        'planets': (PlanetFilms, 'film'),
+        'starships': (StarshipFilms, 'film'),
+        'vehicles': (VehicleFilms, 'film'),
+        'species': (SpeciesFilms, 'film'),
+    }
+    request_costs = {'page': 55, 'counts': 60, 'count_ordering': 75}
 
-    @swagger_auto_schema(manual_parameters=[TITLE_PARAMETER])
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
+
+
+class StatsAPIView(APIView):
+    """Aggregate counts per resource, precomputed at import time"""
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_stats())
+
+
+class BaseGraphAPIView(APIView):
+    """Generic base class for the relation graph views"""
+
+    def get_node(self, graph, param):
+        """Resolve a `<type>:<id>` query parameter, e.g. `people:1`, to a node"""
+        value = self.request.query_params.get(param, '')
+        node_type, _, pk = value.partition(':')
+        if node_type not in NODE_MODELS:
+            raise ValidationError({param: f"Expected <type>:<id> with type one of {', '.join(NODE_MODELS)}."})
+
+        # str.isdigit() accepts digits int() rejects, such as '²'.
+        node = graph.node(node_type, int(pk)) if pk.isascii() and pk.isdigit() else None
+        if node is None:
+            raise NotFound(f"{value} does not exist.")
+        return node
+
+    def get_node_type(self, param, default=None):
+        node_type = self.request.query_params.get(param) or default
+        if node_type is not None and node_type not in NODE_MODELS:
+            raise ValidationError({param: f"Expected one of {', '.join(NODE_MODELS)}."})
+        return node_type
+
+
+class GraphNeighboursAPIView(BaseGraphAPIView):
+    """Entities directly related to a node"""
+
+    def get(self, request, *args, **kwargs):
+        graph = get_graph()
+        node = self.get_node(graph, 'node')
+        neighbours = graph.adjacent(node, self.get_node_type('type'))
+        return Response({
+            'node': graph.describe(node),
+            'count': len(neighbours),
+            'results': [graph.describe(neighbour) for neighbour in neighbours],
+        })
+
+
+class GraphCoAppearancesAPIView(BaseGraphAPIView):
+    """Entities sharing films (or another node type) with a node"""
+
+    def get(self, request, *args, **kwargs):
+        graph = get_graph()
+        node = self.get_node(graph, 'node')
+        via = self.get_node_type('via', 'films')
+        co_appearances = graph.co_appearances(node, via, self.get_node_type('type'))
+        return Response({
+            'node': graph.describe(node),
+            'via': via,
+            'count': len(co_appearances),
+            'results': [dict(graph.describe(other), shared=shared) for other, shared in co_appearances],
+        })
+
+
+class GraphPathAPIView(BaseGraphAPIView):
+    """Shortest connection between two nodes"""
+
+    def get(self, request, *args, **kwargs):
+        graph = get_graph()
+        path = graph.shortest_path(self.get_node(graph, 'from'), self.get_node(graph, 'to'))
+        if path is None:
+            raise NotFound("The nodes are not connected.")
+        return Response({
+            'length': len(path) - 1,
+            'path': [graph.describe(node) for node in path],
+        })
+
+
+RESOURCE_VIEWS = [
+    PeopleAPIView,
+    PlanetsAPIView,
+    StarshipsAPIView,
+    SpeciesAPIView,
+    VehiclesAPIView,
+    FilmsAPIView,
+]
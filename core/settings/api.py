@@ -0,0 +1,56 @@
+"""
+Settings for API-only worker processes.
+
+The public API is anonymous, read-only JSON, so these workers skip the
+admin, auth, sessions, messages and templates, and keep only the
+middleware that touches every response. drf_yasg is loaded only when
+SWAPI_ENABLE_SWAGGER is set; serve the docs from one such worker or from
+the regular production settings.
+
+    DJANGO_SETTINGS_MODULE=core.settings.api gunicorn --preload core.wsgi
+"""
+import os
+
+from core.settings.production import *  # noqa: F401, F403
+
+# =================================
+#   APPLICATION SETTINGS
+# =================================
+
+ENABLE_SWAGGER = os.environ.get('SWAPI_ENABLE_SWAGGER', '').lower() in ('1', 'true', 'yes')
+
+INSTALLED_APPS = [
+    'api',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'core.urls_api'
+
+TEMPLATES = []
+
+if ENABLE_SWAGGER:
+    # The Swagger and ReDoc pages are templates with static assets.
+    INSTALLED_APPS += ['django.contrib.staticfiles', 'drf_yasg']
+    TEMPLATES = [
+        {
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'APP_DIRS': True,
+            'OPTIONS': {
+                'context_processors': ['django.template.context_processors.request'],
+            },
+        },
+    ]
+
+# No users: skip authentication and the lazy AnonymousUser it would
+# import from django.contrib.auth.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'UNAUTHENTICATED_USER': None,
+    'DEFAULT_THROTTLE_CLASSES': ['api.throttling.CostThrottle'],
+}
@@ -44,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # No GZipMiddleware: compressing the HTML pages with their CSRF token
+    # would open them to BREACH. The cached API pages are precompressed.
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +84,42 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ['api.routers.PrimaryReplicaRouter']
+
+# Alias that receives every write (the importer).
+SWAPI_PRIMARY_DATABASE = 'default'
+
+# Aliases the API reads from, round-robin per request. Empty means the
+# primary serves reads as well.
+SWAPI_READ_DATABASES = []
+
+# Directory of blue/green dataset files. When set, the primary and the read
+# pool serve the SQLite file named in its `current` pointer file, and
+# `download_and_import` builds each import in a new file that it switches
+# the pointer to once validated. None imports into the live database.
+SWAPI_DATASET_DIR = None
+
+# Dataset files kept in SWAPI_DATASET_DIR, the active one included, for
+# `switch_dataset` to roll back to.
+SWAPI_DATASETS_KEPT = 2
+
+# JSON lines file `download_and_import` writes the records it rejected and
+# the relation URLs it dropped to, with the reason. Replaced on every import.
+SWAPI_DEAD_LETTER_PATH = BASE_DIR / 'dead_letters.jsonl'
+
+# Share of rejected records above which the import is aborted: past that
+# the payload is more likely broken than a few of its records.
+SWAPI_MAX_REJECTED_RATE = 0.05
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -121,6 +159,39 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# =================================
+#   REST FRAMEWORK SETTINGS
+# =================================
+
+REST_FRAMEWORK = {
+    # Off until SWAPI_THROTTLE_RATE is set
+    'DEFAULT_THROTTLE_CLASSES': ['api.throttling.CostThrottle'],
+}
+
+# =================================
+#   THROTTLING SETTINGS
+# =================================
+
+# Tokens a client IP gets back per second, or None to disable throttling.
+# Requests cost what their view and query shape cost to render: 1 for a
+# graph lookup, 55 for a page of films (see `measure_request_costs`).
+# Behind a proxy, set REST_FRAMEWORK['NUM_PROXIES'] so clients are told
+# apart by X-Forwarded-For.
+SWAPI_THROTTLE_RATE = None
+
+# Tokens a client can spend at once.
+SWAPI_THROTTLE_BURST = 300
+
+# Cost of the uncached requests a process works on at once before it
+# answers 503, or None to admit everything. Cached pages are always served,
+# and a shed page falls back to its previous version when there is one.
+SWAPI_ADMISSION_CAPACITY = None
+
+# Requests costing more than this may only fill the given share of the
+# capacity, so expensive requests are shed before cheap ones.
+SWAPI_ADMISSION_CHEAP_COST = 10
+SWAPI_ADMISSION_EXPENSIVE_SHARE = 0.5
+
 # =================================
 #   DRF-YASG SETTINGS
 # =================================
@@ -147,5 +218,74 @@ SWAGGER_SETTINGS = {
     },
     'JSON_EDITOR': False,
     'TAGS_SORTER': 'alpha',
-    'OPERATIONS_SORTER': 'alpha'
+    'OPERATIONS_SORTER': 'alpha',
+    # The docs pages load the pregenerated schema instead of regenerating it
+    'SPEC_URL': ('api:schema-json', {'format': '.json'}),
+}
+
+REDOC_SETTINGS = {
+    'SPEC_URL': ('api:schema-json', {'format': '.json'}),
 }
+
+# Directory `manage.py generate_schema` writes swagger.json and swagger.yaml
+# to. When the files are missing, each process generates the schema on its
+# first docs request and keeps it until restarted.
+SWAPI_SCHEMA_DIR = None
+
+# =================================
+#   RESPONSE CACHE SETTINGS
+# =================================
+
+# Cache the rendered JSON list pages per data version. Only safe when the
+# data changes through `download_and_import`, which bumps the version;
+# edits made elsewhere (e.g. the admin) are not seen until the next import.
+SWAPI_RESPONSE_CACHE = False
+
+# Seconds a cached page stays fresh, or None to keep it until the next
+# import. Expired pages keep being served while one request recomputes them.
+SWAPI_RESPONSE_CACHE_TIMEOUT = None
+
+# Bytes of cached pages and lookup data (e.g. /stats/) each process keeps
+# in an LRU in front of the shared cache, or 0 to always go to the shared
+# cache. Entries are tied to the data version like the shared ones.
+SWAPI_LOCAL_CACHE_SIZE = 0
+
+# Seconds a process reuses the data version it last read from the shared
+# cache. Local cache hits skip the shared cache entirely, but a new import
+# may take this long to show up in each process.
+SWAPI_DATA_VERSION_TTL = 0
+
+# Cache the nested list representation of each entity (e.g. a person in a
+# film's characters) per data version, so the pages that embed it reuse it.
+# Like the response cache, only safe when imports bump the data version.
+SWAPI_FRAGMENT_CACHE = False
+
+# Scheme and host `warm_cache` renders the pages for. Must match what
+# clients use, since the pagination links are absolute URLs.
+SWAPI_PUBLIC_ORIGIN = 'http://localhost'
+
+# Query strings `warm_cache` requests every page of, per resource. Add the
+# filters and orderings clients use most, e.g. 'ordering=-films_count'.
+SWAPI_WARM_QUERIES = ['', 'with_counts=1']
+
+# =================================
+#   SNAPSHOT SETTINGS
+# =================================
+
+# Path of an immutable snapshot built with `manage.py build_snapshot`.
+# When set, the list endpoints are served from the memory-mapped snapshot
+# and never touch the database.
+SWAPI_SNAPSHOT_PATH = None
+
+# =================================
+#   ENTITY STORE SETTINGS
+# =================================
+
+# Keep an interned in-process copy of the nested list representations,
+# loaded at worker startup and rebuilt after each import. Trades a few
+# MiB per worker for fewer queries and model instances per page.
+SWAPI_ENTITY_STORE = False
+
+# Build the graph, entity store and snapshot mapping when the WSGI module
+# is imported, so a preforking server shares them with its workers.
+SWAPI_PRELOAD = False
@@ -1 +1,133 @@
-from core.settings.base import *  # noqa: F401, F403
\ No newline at end of file
+import os
+from urllib.parse import urlsplit
+
+from core.settings.base import *  # noqa: F401, F403
+
+# =================================
+#   DATABASE SETTINGS
+# =================================
+
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -65536',  # 64 MiB page cache per connection
+    'PRAGMA mmap_size = 268435456',  # 256 MiB of memory-mapped I/O
+    'PRAGMA temp_store = MEMORY',
+]
+
+SQLITE_READER_PRAGMAS = SQLITE_PRAGMAS + ['PRAGMA query_only = ON']
+
+SQLITE_WRITER_PRAGMAS = SQLITE_PRAGMAS + ['PRAGMA wal_autocheckpoint = 10000']
+
+# Persistent connections are the connection pool: each worker thread keeps
+# one open connection per alias, so the pragmas above run once per
+# connection instead of once per request. Seconds, or empty for no limit.
+SWAPI_CONN_MAX_AGE = os.environ.get('SWAPI_CONN_MAX_AGE', '')
+CONN_MAX_AGE = int(SWAPI_CONN_MAX_AGE) if SWAPI_CONN_MAX_AGE else None
+
+DATABASE_PATH = os.environ.get('SWAPI_DB_PATH', BASE_DIR / 'db.sqlite3')  # noqa: F405
+
+# Read pool: comma-separated replica files, kept in sync by
+# `download_and_import`. Without replicas the API reads the primary file
+# through read-only connections.
+REPLICA_PATHS = [path for path in os.environ.get('SWAPI_REPLICA_PATHS', '').split(',') if path]
+
+DATABASES = {
+    # Primary: only the importer writes here. WAL lets the read pool keep
+    # reading during an import.
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': DATABASE_PATH,
+        'OPTIONS': {
+            'init_command': ';'.join(SQLITE_WRITER_PRAGMAS),
+            # Take the write lock up front instead of failing on lock upgrade.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 30,
+        },
+        'CONN_MAX_AGE': 0,
+    },
+}
+
+for index, path in enumerate(REPLICA_PATHS or [DATABASE_PATH]):
+    DATABASES[f'replica_{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'OPTIONS': {
+            'init_command': ';'.join(SQLITE_READER_PRAGMAS),
+            'timeout': 5,
+        },
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+SWAPI_READ_DATABASES = [alias for alias in DATABASES if alias.startswith('replica_')]
+
+# Blue/green imports: every alias serves the active dataset of this
+# directory instead of SWAPI_DB_PATH and SWAPI_REPLICA_PATHS.
+SWAPI_DATASET_DIR = os.environ.get('SWAPI_DATASET_DIR') or None
+
+SWAPI_DEAD_LETTER_PATH = os.environ.get('SWAPI_DEAD_LETTER_PATH', SWAPI_DEAD_LETTER_PATH)  # noqa: F405
+
+# =================================
+#   CACHE SETTINGS
+# =================================
+
+# Shared by the importer and every worker process, so a new import
+# invalidates cached data everywhere.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('SWAPI_CACHE_DIR', '/var/tmp/swapi-cache'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+SWAPI_RESPONSE_CACHE = True
+
+SWAPI_FRAGMENT_CACHE = True
+
+SWAPI_LOCAL_CACHE_SIZE = int(os.environ.get('SWAPI_LOCAL_CACHE_SIZE', 32 * 1024 * 1024))
+
+SWAPI_DATA_VERSION_TTL = float(os.environ.get('SWAPI_DATA_VERSION_TTL', 1))
+
+SWAPI_PUBLIC_ORIGIN = os.environ.get('SWAPI_PUBLIC_ORIGIN', SWAPI_PUBLIC_ORIGIN)  # noqa: F405
+
+# =================================
+#   THROTTLING SETTINGS
+# =================================
+
+SWAPI_THROTTLE_RATE = float(os.environ['SWAPI_THROTTLE_RATE']) if os.environ.get('SWAPI_THROTTLE_RATE') else None
+
+SWAPI_THROTTLE_BURST = int(os.environ.get('SWAPI_THROTTLE_BURST', SWAPI_THROTTLE_BURST))  # noqa: F405
+
+SWAPI_ADMISSION_CAPACITY = int(os.environ['SWAPI_ADMISSION_CAPACITY']) if os.environ.get('SWAPI_ADMISSION_CAPACITY') else None
+
+# =================================
+#   ENTITY STORE SETTINGS
+# =================================
+
+SWAPI_ENTITY_STORE = os.environ.get('SWAPI_ENTITY_STORE', '').lower() in ('1', 'true', 'yes')
+
+SWAPI_PRELOAD = os.environ.get('SWAPI_PRELOAD', '').lower() in ('1', 'true', 'yes')
+
+# =================================
+#   DRF-YASG SETTINGS
+# =================================
+
+SWAPI_SCHEMA_DIR = os.environ.get('SWAPI_SCHEMA_DIR') or None
+
+# =================================
+#   SECURITY SETTINGS
+# =================================
+
+DEBUG = False
+
+# Comma-separated host names the API is served on. Defaults to the host of
+# SWAPI_PUBLIC_ORIGIN, which `warm_cache` sends its requests to.
+ALLOWED_HOSTS = [
+    host.strip() for host in os.environ.get('SWAPI_ALLOWED_HOSTS', '').split(',') if host.strip()
+] or [urlsplit(SWAPI_PUBLIC_ORIGIN).hostname]
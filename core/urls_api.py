@@ -0,0 +1,12 @@
+"""
+URL configuration of the API-only workers (core.settings.api): the API
+without the admin.
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path(
+        'api/v1/',
+        include('api.urls', namespace='api', )
+    ),
+]